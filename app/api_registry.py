@@ -21,6 +21,7 @@ from app.routers.v1.health.api_health import opsdb_check
 from .routers.v1.attribute_templates import api_attribute_templates
 from .routers.v1.collections import api_collections
 from .routers.v1.items import api_items
+from .routers.v1.metrics import api_metrics
 
 
 def api_registry(app: FastAPI):
@@ -29,3 +30,4 @@ def api_registry(app: FastAPI):
     app.include_router(api_items.router_bulk, prefix='/v1/items', tags=['Items'])
     app.include_router(api_attribute_templates.router, prefix='/v1/template', tags=['Attribute templates'])
     app.include_router(api_collections.router, prefix='/v1/collection', tags=['Collections'])
+    app.include_router(api_metrics.router, prefix='/v1/metrics', tags=['Metrics'])
@@ -14,38 +14,45 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import base64
-import math
-import re
+from functools import lru_cache
+from typing import Iterable
+from typing import Optional
+from typing import Union
 
 from sqlalchemy_utils import Ltree
 
+LTREE_LABEL_CACHE_SIZE = 65536
+LTREE_PATH_CACHE_SIZE = 16384
 
+
+@lru_cache(maxsize=LTREE_LABEL_CACHE_SIZE)
 def encode_label_for_ltree(raw_string: str) -> str:
-    base32_string = str(base64.b32encode(raw_string.encode('utf-8')), 'utf-8')
-    return re.sub('=', '', base32_string)
+    return base64.b32encode(raw_string.encode('utf-8')).decode('ascii').rstrip('=')
 
 
+@lru_cache(maxsize=LTREE_PATH_CACHE_SIZE)
 def encode_path_for_ltree(raw_path: str) -> str:
-    labels = raw_path.split('.')
-    path = ''
-    for label in labels:
-        path += f'{encode_label_for_ltree(label)}.'
-    return path[:-1]
+    return '.'.join([encode_label_for_ltree(label) for label in raw_path.split('.')])
+
+
+def encode_paths_for_ltree(raw_paths: Iterable[str]) -> list[str]:
+    return [encode_path_for_ltree(raw_path) for raw_path in raw_paths]
 
 
+@lru_cache(maxsize=LTREE_LABEL_CACHE_SIZE)
 def decode_label_from_ltree(encoded_string: str) -> str:
-    missing_padding = math.ceil(len(encoded_string) / 8) * 8 - len(encoded_string)
-    if missing_padding:
-        encoded_string += '=' * missing_padding
-    utf8_string = base64.b32decode(encoded_string.encode('utf-8')).decode('utf-8')
-    return utf8_string
-
-
-def decode_path_from_ltree(encoded_path: str) -> str:
-    if type(encoded_path) == Ltree:
-        encoded_path = str(encoded_path)
-    labels = encoded_path.split('.')
-    path = ''
-    for label in labels:
-        path += f'{decode_label_from_ltree(label)}.'
-    return path[:-1]
+    padded_string = encoded_string + '=' * (-len(encoded_string) % 8)
+    return base64.b32decode(padded_string.encode('utf-8')).decode('utf-8')
+
+
+@lru_cache(maxsize=LTREE_PATH_CACHE_SIZE)
+def _decode_path_from_ltree(encoded_path: str) -> str:
+    return '.'.join([decode_label_from_ltree(label) for label in encoded_path.split('.')])
+
+
+def decode_path_from_ltree(encoded_path: Union[str, Ltree]) -> str:
+    return _decode_path_from_ltree(str(encoded_path))
+
+
+def decode_paths_from_ltree(encoded_paths: Iterable[Optional[Union[str, Ltree]]]) -> list[Optional[str]]:
+    return [_decode_path_from_ltree(str(path)) if path else None for path in encoded_paths]
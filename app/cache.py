@@ -0,0 +1,150 @@
+# Copyright (C) 2022 Indoc Research
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any
+from typing import Hashable
+from typing import Iterable
+
+import orjson
+from common import LoggerFactory
+
+_logger = LoggerFactory('cache').get_logger()
+
+
+class TTLCache:
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key: Hashable):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def pop_many(self, keys: Iterable[Hashable]):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'backend': 'memory',
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisCache:
+    DELETE_CHUNK_SIZE = 1000
+
+    def __init__(self, client, ttl: int, key_prefix: str):
+        self.client = client
+        self.ttl = ttl
+        self.key_prefix = key_prefix
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self._lock = Lock()
+
+    def _count(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        try:
+            value = self.client.get(f'{self.key_prefix}{key}')
+        except Exception:
+            _logger.exception(f'Failed to get {key} from cache')
+            self._count('errors')
+            return default
+        if value is None:
+            self._count('misses')
+            return default
+        self._count('hits')
+        return orjson.loads(value)
+
+    def set(self, key: Hashable, value: Any):
+        try:
+            self.client.set(f'{self.key_prefix}{key}', orjson.dumps(value), ex=self.ttl)
+        except Exception:
+            _logger.exception(f'Failed to set {key} in cache')
+            self._count('errors')
+
+    def pop(self, key: Hashable):
+        self.pop_many([key])
+
+    def pop_many(self, keys: Iterable[Hashable]):
+        cache_keys = [f'{self.key_prefix}{key}' for key in keys]
+        try:
+            for i in range(0, len(cache_keys), self.DELETE_CHUNK_SIZE):
+                self.client.delete(*cache_keys[i:i + self.DELETE_CHUNK_SIZE])
+        except Exception:
+            _logger.exception('Failed to invalidate cache keys')
+            self._count('errors')
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'backend': 'redis',
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'errors': self.errors,
+            }
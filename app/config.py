@@ -52,6 +52,23 @@ class Settings(BaseSettings):
     OPSDB_UTILITY_PORT: str = '5432'
     OPSDB_UTILITY_NAME: str = 'metadata'
 
+    OPSDB_POOL_SIZE: int = 10
+    OPSDB_MAX_OVERFLOW: int = 20
+    OPSDB_POOL_TIMEOUT: int = 30
+    OPSDB_POOL_RECYCLE: int = 1800
+    OPSDB_POOL_PRE_PING: bool = True
+    OPSDB_STATEMENT_TIMEOUT: int = 0
+    OPSDB_APPLICATION_NAME: str = 'metadata_service'
+
+    ITEM_CACHE_ENABLED: bool = False
+    # The memory backend only invalidates entries in the process that made the change, so other workers
+    # can serve stale items for up to ITEM_CACHE_TTL seconds. Use the redis backend with more than one worker.
+    ITEM_CACHE_BACKEND: str = 'memory'
+    ITEM_CACHE_SIZE: int = 10000
+    ITEM_CACHE_TTL: int = 30
+    ITEM_CACHE_REDIS_URL: str = 'redis://localhost:6379/0'
+    ITEM_INLINE_READS: bool = False
+
     METADATA_SCHEMA = str = 'metadata'
 
     MAX_TAGS = 10
@@ -60,6 +77,18 @@ class Settings(BaseSettings):
 
     MAX_COLLECTIONS = 10
 
+    MAX_JOBS = 1000
+    DELETE_JOB_CHUNK_SIZE = 10000
+    CREATE_ITEMS_CHUNK_SIZE = 1000
+    ESTIMATE_TOTAL_COUNT_LIMIT = 10000
+    EXPORT_ITEMS_BATCH_SIZE = 1000
+    MAX_LOOKUP_IDS = 100000
+    LOOKUP_ITEMS_CHUNK_SIZE = 1000
+    ATTRIBUTE_TEMPLATE_CACHE_SIZE = 1000
+    ATTRIBUTE_TEMPLATE_CACHE_TTL = 60
+    ITEM_NAME_MAX_SUFFIX = 1000
+    ITEM_NAME_CONFLICT_RETRIES = 10
+
     def __init__(self):
         super().__init__()
         self.SQLALCHEMY_DATABASE_URI = f'postgresql://{self.OPSDB_UTILITY_USERNAME}:{self.OPSDB_UTILITY_PASSWORD}@{self.OPSDB_UTILITY_HOST}:{self.OPSDB_UTILITY_PORT}/{self.OPSDB_UTILITY_NAME}'
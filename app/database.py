@@ -0,0 +1,101 @@
+# Copyright (C) 2022 Indoc Research
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import threading
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError
+from sqlalchemy.pool import QueuePool
+
+from app.config import ConfigClass
+
+WAIT_BUCKETS_MS = [1, 5, 10, 50, 100, 500, 1000, 5000]
+
+
+class PoolMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+        self.wait_buckets = [0] * (len(WAIT_BUCKETS_MS) + 1)
+
+    def record_checkout(self, wait_ms: float, timed_out: bool):
+        bucket = next((i for i, limit in enumerate(WAIT_BUCKETS_MS) if wait_ms <= limit), len(WAIT_BUCKETS_MS))
+        with self._lock:
+            self.checkouts += 1
+            self.timeouts += timed_out
+            self.total_wait_ms += wait_ms
+            self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+            self.wait_buckets[bucket] += 1
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                'checkouts': self.checkouts,
+                'timeouts': self.timeouts,
+                'average_wait_ms': self.total_wait_ms / self.checkouts if self.checkouts else 0.0,
+                'max_wait_ms': self.max_wait_ms,
+                'wait_buckets_ms': {
+                    f'<={limit}' if limit else f'>{WAIT_BUCKETS_MS[-1]}': count
+                    for limit, count in zip(WAIT_BUCKETS_MS + [None], self.wait_buckets)
+                },
+            }
+
+
+class TimedQueuePool(QueuePool):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            self.metrics.record_checkout((time.perf_counter() - start) * 1000, timed_out)
+
+    def status_dict(self) -> dict:
+        return {
+            'pool_size': self.size(),
+            'checked_in': self.checkedin(),
+            'checked_out': self.checkedout(),
+            'overflow': self.overflow(),
+            **self.metrics.to_dict(),
+        }
+
+
+def create_db_engine() -> Engine:
+    connect_args = {'application_name': ConfigClass.OPSDB_APPLICATION_NAME}
+    if ConfigClass.OPSDB_STATEMENT_TIMEOUT:
+        connect_args['options'] = f'-c statement_timeout={ConfigClass.OPSDB_STATEMENT_TIMEOUT}'
+    return create_engine(
+        ConfigClass.SQLALCHEMY_DATABASE_URI,
+        poolclass=TimedQueuePool,
+        pool_size=ConfigClass.OPSDB_POOL_SIZE,
+        max_overflow=ConfigClass.OPSDB_MAX_OVERFLOW,
+        pool_timeout=ConfigClass.OPSDB_POOL_TIMEOUT,
+        pool_recycle=ConfigClass.OPSDB_POOL_RECYCLE,
+        pool_pre_ping=ConfigClass.OPSDB_POOL_PRE_PING,
+        connect_args=connect_args,
+        executemany_mode='values_plus_batch',
+    )
@@ -19,6 +19,7 @@ from fastapi_sqlalchemy import DBSessionMiddleware
 
 from .api_registry import api_registry
 from .config import ConfigClass
+from .database import create_db_engine
 
 app = FastAPI(
     title='Metadata service',
@@ -26,7 +27,7 @@ app = FastAPI(
     docs_url='/v1/api-doc',
     version=ConfigClass.version,
 )
-app.add_middleware(DBSessionMiddleware, db_url=ConfigClass.SQLALCHEMY_DATABASE_URI)
+app.add_middleware(DBSessionMiddleware, custom_engine=create_db_engine())
 
 app.add_middleware(
     CORSMiddleware,
@@ -14,8 +14,10 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 from enum import Enum
+from typing import Optional
 
 from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 
 
@@ -30,19 +32,34 @@ class EAPIResponseCode(Enum):
     internal_error = 500
 
 
+class ETotalMode(str, Enum):
+    exact = 'exact'
+    estimate = 'estimate'
+    none = 'none'
+
+
 class APIResponse(BaseModel):
     code: EAPIResponseCode = EAPIResponseCode.success
     error_msg: str = ''
     page: int = 0
-    total: int = 1
-    num_of_pages: int = 1
+    total: Optional[int] = 1
+    num_of_pages: Optional[int] = 1
+    has_more: bool = False
+    next_cursor: Optional[str] = None
     result = []
 
-    def json_response(self) -> JSONResponse:
+    def json_response(self, fast: bool = False) -> JSONResponse:
+        if fast:
+            return self.fast_json_response()
         data = self.dict()
         data['code'] = self.code.value
         return JSONResponse(status_code=self.code.value, content=data)
 
+    def fast_json_response(self) -> ORJSONResponse:
+        data = {field_name: getattr(self, field_name) for field_name in self.__fields__}
+        data['code'] = self.code.value
+        return ORJSONResponse(status_code=self.code.value, content=data)
+
     def set_error_msg(self, error_msg):
         self.error_msg = error_msg
 
@@ -55,3 +72,5 @@ class PaginationRequest(BaseModel):
     page_size: int = 25
     order: str = 'asc'
     sorting: str = 'created_time'
+    cursor: Optional[str]
+    total_mode: ETotalMode = ETotalMode.exact
@@ -22,6 +22,7 @@ from pydantic import Field
 from pydantic import validator
 
 from .base_models import APIResponse
+from .base_models import ETotalMode
 
 
 class GETTemplate(BaseModel):
@@ -33,6 +34,7 @@ class GETTemplates(BaseModel):
     name: Optional[str]
     page_size: int = 10
     page: int = 0
+    total_mode: ETotalMode = ETotalMode.exact
 
 
 class GETTemplateResponse(APIResponse):
@@ -13,6 +13,7 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+from typing import ClassVar
 from typing import Optional
 from uuid import UUID
 
@@ -23,6 +24,7 @@ from pydantic import validator
 from app.config import ConfigClass
 
 from .base_models import APIResponse
+from .base_models import ETotalMode
 from .base_models import PaginationRequest
 
 
@@ -33,6 +35,7 @@ class GETItem(BaseModel):
 class GETItemsByIDs(BaseModel):
     page_size: int = 10
     page: int = 0
+    total_mode: ETotalMode = ETotalMode.exact
 
 
 class GETItemsByLocation(PaginationRequest):
@@ -45,6 +48,25 @@ class GETItemsByLocation(PaginationRequest):
     owner: Optional[str]
     type: Optional[str]
     container_type: Optional[str]
+    attribute_template_id: Optional[UUID]
+
+    class Config:
+        anystr_strip_whitespace = True
+
+
+class GETItemsExport(BaseModel):
+    container_code: str
+    zone: Optional[int]
+    recursive: bool = True
+    archived: bool = False
+    parent_path: Optional[str]
+    name: Optional[str]
+    owner: Optional[str]
+    type: Optional[str]
+    container_type: Optional[str]
+    resume_token: Optional[str]
+    sorting: ClassVar[str] = 'created_time'
+    order: ClassVar[str] = 'asc'
 
     class Config:
         anystr_strip_whitespace = True
@@ -167,9 +189,18 @@ class POSTItems(BaseModel):
     skip_duplicates: bool = False
 
 
+class POSTItemsLookup(BaseModel):
+    ids: list[UUID] = Field(..., min_items=1, max_items=ConfigClass.MAX_LOOKUP_IDS)
+
+
 class PATCHItem(BaseModel):
     id: UUID
     archived: bool
+    summary: bool = False
+
+
+class PATCHItems(BaseModel):
+    archived: bool
 
 
 class PATCHItemResponse(GETItemResponse):
@@ -180,6 +211,16 @@ class POSTItemResponse(GETItemResponse):
     pass
 
 
+class POSTItemsResponse(GETItemResponse):
+    outcomes: list[dict] = Field(
+        [],
+        example=[
+            {'index': 0, 'id': '85465212-168a-4f0c-a7aa-f3a19795d2ff', 'status': 'created'},
+            {'index': 1, 'id': 'e6bf3b4f-7b8e-4e3d-9fb0-2a5d3a1c9e0d', 'status': 'skipped'},
+        ],
+    )
+
+
 class PUTItem(POSTItem):
     parent: Optional[UUID] = Field(example='3fa85f64-5717-4562-b3fc-2c963f66afa6', default='')
     parent_path: Optional[str] = Field(example='path.to.file', default='')
@@ -203,20 +244,41 @@ class PUTItem(POSTItem):
 
 class PUTItems(BaseModel):
     items: list[PUTItem]
+    atomic: bool = False
 
 
 class PUTItemResponse(GETItemResponse):
     pass
 
 
+class PUTItemsResponse(POSTItemsResponse):
+    pass
+
+
 class DELETEItem(BaseModel):
     id: UUID
+    background: bool = False
 
 
 class DELETEItemResponse(APIResponse):
     pass
 
 
+class GETItemsDeleteJobResponse(APIResponse):
+    result: dict = Field(
+        {},
+        example={
+            'id': '0c5bbd4b-2b8a-4c1d-9c5c-ef0cfbd8d5e4',
+            'status': 'running',
+            'total': 250000,
+            'processed': 20000,
+            'error_msg': '',
+            'created_time': '2022-04-13 13:30:10.890347',
+            'last_updated_time': '2022-04-13 13:30:12.120547',
+        },
+    )
+
+
 class PUTItemsBequeath(BaseModel):
     attribute_template_id: Optional[UUID]
     attributes: Optional[dict]
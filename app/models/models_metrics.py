@@ -0,0 +1,62 @@
+# Copyright (C) 2022 Indoc Research
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from pydantic import Field
+
+from .base_models import APIResponse
+
+
+class GETPoolMetricsResponse(APIResponse):
+    result: dict = Field(
+        {},
+        example={
+            'pool_size': 10,
+            'checked_in': 3,
+            'checked_out': 2,
+            'overflow': -5,
+            'checkouts': 1520,
+            'timeouts': 0,
+            'average_wait_ms': 0.21,
+            'max_wait_ms': 48.7,
+            'wait_buckets_ms': {
+                '<=1': 1496,
+                '<=5': 12,
+                '<=10': 6,
+                '<=50': 6,
+                '<=100': 0,
+                '<=500': 0,
+                '<=1000': 0,
+                '<=5000': 0,
+                '>5000': 0,
+            },
+        },
+    )
+
+
+class GETItemCacheMetricsResponse(APIResponse):
+    result: dict = Field(
+        {},
+        example={
+            'enabled': True,
+            'backend': 'memory',
+            'size': 8512,
+            'maxsize': 10000,
+            'ttl': 30,
+            'hits': 120412,
+            'misses': 9120,
+            'evictions': 0,
+            'expirations': 608,
+        },
+    )
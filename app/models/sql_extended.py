@@ -15,9 +15,10 @@
 
 import uuid
 
-from sqlalchemy import JSON
 from sqlalchemy import Column
 from sqlalchemy import ForeignKey
+from sqlalchemy import Index
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.ext.declarative import declarative_base
 
@@ -32,12 +33,16 @@ class ExtendedModel(Base):
     __tablename__ = 'extended'
     id = Column(UUID(as_uuid=True), unique=True, primary_key=True)
     item_id = Column(UUID(as_uuid=True), ForeignKey(ItemModel.id), unique=True)
-    extra = Column(JSON())
+    extra = Column(JSONB())
 
-    __table_args__ = ({'schema': ConfigClass.METADATA_SCHEMA},)
+    __table_args__ = (
+        Index('extended_item_id', 'item_id'),
+        Index('extended_extra_gin', 'extra', postgresql_using='gin', postgresql_ops={'extra': 'jsonb_path_ops'}),
+        {'schema': ConfigClass.METADATA_SCHEMA},
+    )
 
-    def __init__(self, item_id, extra):
-        self.id = uuid.uuid4()
+    def __init__(self, item_id, extra, id=None):
+        self.id = id if id else uuid.uuid4()
         self.item_id = item_id
         self.extra = extra
 
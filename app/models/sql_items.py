@@ -23,8 +23,12 @@ from sqlalchemy import Enum
 from sqlalchemy import Index
 from sqlalchemy import Integer
 from sqlalchemy import String
+from sqlalchemy import and_
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy_utils import Ltree
 from sqlalchemy_utils import LtreeType
 
 from app.app_utils import decode_path_from_ltree
@@ -39,6 +43,9 @@ class ItemModel(Base):
     parent = Column(UUID(as_uuid=True))
     parent_path = Column(LtreeType())
     restore_path = Column(LtreeType())
+    restore_parent = Column(UUID(as_uuid=True))
+    display_path = Column(String())
+    display_restore_path = Column(String())
     archived = Column(Boolean(), nullable=False)
     type = Column(Enum('name_folder', 'folder', 'file', name='type_enum', create_type=False), nullable=False)
     zone = Column(Integer(), nullable=False)
@@ -49,6 +56,11 @@ class ItemModel(Base):
     container_type = Column(Enum('project', 'dataset', name='container_enum', create_type=False), nullable=False)
     created_time = Column(DateTime(), default=datetime.utcnow, nullable=False)
     last_updated_time = Column(DateTime(), default=datetime.utcnow, nullable=False)
+    storage_id = Column(UUID(as_uuid=True))
+    location_uri = Column(String())
+    version = Column(String())
+    extended_id = Column(UUID(as_uuid=True))
+    extra = Column(JSONB())
 
     __table_args__ = (
         Index(
@@ -60,15 +72,48 @@ class ItemModel(Base):
             unique=True,
             postgresql_where=Column('type') == 'name_folder',
         ),
+        Index(
+            'items_trash_root_unique',
+            'zone',
+            'name',
+            'container_code',
+            'container_type',
+            unique=True,
+            postgresql_where=and_(Column('parent_path') == None, Column('archived') == True),
+        ),
+        Index('items_parent_path_gist', 'parent_path', postgresql_using='gist'),
+        Index('items_restore_path_gist', 'restore_path', postgresql_using='gist'),
+        Index('items_location', 'container_code', 'zone', 'archived', 'parent_path'),
+        Index('items_listing', 'container_code', 'archived', 'type', 'created_time', 'id'),
+        Index('items_listing_desc', 'container_code', 'archived', 'type', text('created_time DESC'), text('id DESC')),
+        Index('items_extra_gin', 'extra', postgresql_using='gin', postgresql_ops={'extra': 'jsonb_path_ops'}),
         {'schema': ConfigClass.METADATA_SCHEMA},
     )
 
     def __init__(
-        self, id, parent, parent_path, archived, type, zone, name, size, owner, container_code, container_type
+        self,
+        id,
+        parent,
+        parent_path,
+        archived,
+        type,
+        zone,
+        name,
+        size,
+        owner,
+        container_code,
+        container_type,
+        display_path=None,
+        storage_id=None,
+        location_uri=None,
+        version=None,
+        extended_id=None,
+        extra=None,
     ):
         self.id = id
         self.parent = parent
         self.parent_path = parent_path
+        self.display_path = display_path
         self.archived = archived
         self.type = type
         self.zone = zone
@@ -77,21 +122,36 @@ class ItemModel(Base):
         self.owner = owner
         self.container_code = container_code
         self.container_type = container_type
+        self.storage_id = storage_id
+        self.location_uri = location_uri
+        self.version = version
+        self.extended_id = extended_id
+        self.extra = extra
 
-    def to_dict(self):
+    @staticmethod
+    def get_display_path(display_path: str, encoded_path: Ltree) -> str:
+        if display_path is not None or not encoded_path:
+            return display_path
+        return decode_path_from_ltree(encoded_path)
+
+    @classmethod
+    def row_to_dict(cls, row) -> dict:
         return {
-            'id': str(self.id),
-            'parent': str(self.parent) if self.parent else None,
-            'parent_path': decode_path_from_ltree(self.parent_path) if self.parent_path else None,
-            'restore_path': decode_path_from_ltree(self.restore_path) if self.restore_path else None,
-            'archived': self.archived,
-            'type': self.type,
-            'zone': self.zone,
-            'name': self.name,
-            'size': self.size,
-            'owner': self.owner,
-            'container_code': self.container_code,
-            'container_type': self.container_type,
-            'created_time': str(self.created_time),
-            'last_updated_time': str(self.last_updated_time),
+            'id': str(row.id),
+            'parent': str(row.parent) if row.parent else None,
+            'parent_path': cls.get_display_path(row.display_path, row.parent_path),
+            'restore_path': cls.get_display_path(row.display_restore_path, row.restore_path),
+            'archived': row.archived,
+            'type': row.type,
+            'zone': row.zone,
+            'name': row.name,
+            'size': row.size,
+            'owner': row.owner,
+            'container_code': row.container_code,
+            'container_type': row.container_type,
+            'created_time': str(row.created_time),
+            'last_updated_time': str(row.last_updated_time),
         }
+
+    def to_dict(self):
+        return self.row_to_dict(self)
@@ -17,6 +17,7 @@ import uuid
 
 from sqlalchemy import Column
 from sqlalchemy import ForeignKey
+from sqlalchemy import Index
 from sqlalchemy import String
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.ext.declarative import declarative_base
@@ -35,12 +36,15 @@ class StorageModel(Base):
     location_uri = Column(String())
     version = Column(String())
 
-    __table_args__ = ({'schema': ConfigClass.METADATA_SCHEMA},)
+    __table_args__ = (
+        Index('storage_item_id', 'item_id'),
+        {'schema': ConfigClass.METADATA_SCHEMA},
+    )
 
-    def __init__(self, item_id, location_uri, version):
-        self.id = (uuid.uuid4(),)
-        self.item_id = (item_id,)
-        self.location_uri = (location_uri,)
+    def __init__(self, item_id, location_uri, version, id=None):
+        self.id = id if id else uuid.uuid4()
+        self.item_id = item_id
+        self.location_uri = location_uri
         self.version = version
 
     def to_dict(self):
@@ -13,20 +13,142 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import base64
+import json
+import uuid
+from datetime import datetime
 from typing import Callable
+from typing import Optional
 
 from common import LoggerFactory
 from pydantic import BaseModel
+from sqlalchemy import Column
+from sqlalchemy import DateTime
+from sqlalchemy import and_
+from sqlalchemy import or_
+from sqlalchemy import tuple_
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql import ClauseElement
+from sqlalchemy.sql import Executable
+from sqlalchemy.sql import Select
+from sqlalchemy.sql import expression
+from sqlalchemy.sql.compiler import SQLCompiler
+from sqlalchemy_utils import Ltree
+from sqlalchemy_utils import LtreeType
 
+from app.config import ConfigClass
 from app.models.base_models import APIResponse
 from app.models.base_models import EAPIResponseCode
+from app.models.base_models import ETotalMode
 from app.models.sql_items import Base
+from app.routers.router_exceptions import BadRequestException
 
 
-def paginate(params: BaseModel, api_response: APIResponse, query: Base, expand_func: Callable) -> APIResponse:
-    total = query.count()
-    query = query.limit(params.page_size).offset(params.page * params.page_size)
+def get_keyset_order_by(keyset_columns: list[tuple[Column, bool]]) -> list:
+    return [column.desc() if descending else column.asc() for column, descending in keyset_columns]
+
+
+def encode_cursor(params: BaseModel, keyset_columns: list[tuple[Column, bool]], row: Row) -> str:
+    values = [getattr(row, column.key) for column, _ in keyset_columns]
+    cursor = {'sorting': params.sorting, 'order': params.order, 'values': values}
+    return base64.urlsafe_b64encode(json.dumps(cursor, default=str).encode()).decode()
+
+
+def parse_cursor_value(column: Column, value):
+    if not isinstance(value, str):
+        return value
+    if isinstance(column.type, LtreeType):
+        return Ltree(value)
+    if isinstance(column.type, UUID) and column.type.as_uuid:
+        return uuid.UUID(value)
+    if isinstance(column.type, DateTime):
+        return datetime.fromisoformat(value)
+    return value
+
+
+def decode_cursor(params: BaseModel, keyset_columns: list[tuple[Column, bool]], encoded_cursor: str) -> list:
+    try:
+        cursor = json.loads(base64.urlsafe_b64decode(encoded_cursor.encode()))
+        if cursor['sorting'] != params.sorting or cursor['order'] != params.order:
+            raise ValueError('Cursor does not match sorting')
+        if len(cursor['values']) != len(keyset_columns):
+            raise ValueError('Cursor does not match sorting')
+        return [parse_cursor_value(column, value) for (column, _), value in zip(keyset_columns, cursor['values'])]
+    except Exception:
+        raise BadRequestException('Invalid cursor')
+
+
+def get_keyset_filter(keyset_columns: list[tuple[Column, bool]], values: list) -> expression.ColumnElement:
+    descending = keyset_columns[0][1]
+    if all(
+        column_descending == descending and not column.nullable and value is not None
+        for (column, column_descending), value in zip(keyset_columns, values)
+    ):
+        keyset_row = tuple_(*[column for column, _ in keyset_columns])
+        values_row = tuple_(
+            *[expression.literal(value, column.type) for (column, _), value in zip(keyset_columns, values)]
+        )
+        return keyset_row < values_row if descending else keyset_row > values_row
+    column, value = keyset_columns[0][0], values[0]
+    if value is None:
+        # postgres sorts nulls last in ascending order and first in descending order
+        after_filter = column.isnot(None) if descending else expression.false()
+        equal_filter = column.is_(None)
+    else:
+        after_filter = column < value if descending else or_(column > value, column.is_(None))
+        equal_filter = column == value
+    if len(keyset_columns) == 1:
+        return after_filter
+    keyset_filter = or_(after_filter, and_(equal_filter, get_keyset_filter(keyset_columns[1:], values[1:])))
+    if column.nullable or value is None:
+        return keyset_filter
+    # bound the leading column as well, so an index on it can seek to the cursor's group
+    return and_(column <= value if descending else column >= value, keyset_filter)
+
+
+class Explain(Executable, ClauseElement):
+    inherit_cache = False
+
+    def __init__(self, statement: Select):
+        self.statement = statement
+
+
+@compiles(Explain, 'postgresql')
+def compile_explain(element: Explain, compiler: SQLCompiler, **kw) -> str:
+    return f'EXPLAIN (FORMAT JSON) {compiler.process(element.statement, **kw)}'
+
+
+def get_total(params: BaseModel, query: Base) -> Optional[int]:
+    count_query = query.order_by(None)
+    if params.total_mode == ETotalMode.none:
+        return None
+    if params.total_mode == ETotalMode.estimate:
+        total = count_query.limit(ConfigClass.ESTIMATE_TOTAL_COUNT_LIMIT + 1).count()
+        if total > ConfigClass.ESTIMATE_TOTAL_COUNT_LIMIT:
+            plan = query.session.execute(Explain(count_query.statement)).scalar()
+            total = max(total, int(plan[0]['Plan']['Plan Rows']))
+        return total
+    return count_query.count()
+
+
+def paginate(
+    params: BaseModel,
+    api_response: APIResponse,
+    query: Base,
+    expand_func: Callable,
+    keyset_columns: list[tuple[Column, bool]] = None,
+) -> APIResponse:
+    total = get_total(params, query)
+    if keyset_columns and params.cursor:
+        query = query.filter(get_keyset_filter(keyset_columns, decode_cursor(params, keyset_columns, params.cursor)))
+        query = query.limit(params.page_size + 1)
+    else:
+        query = query.limit(params.page_size + 1).offset(params.page * params.page_size)
     items = query.all()
+    has_more = len(items) > params.page_size
+    items = items[:params.page_size]
     results = []
     for item in items:
         if expand_func:
@@ -35,9 +157,12 @@ def paginate(params: BaseModel, api_response: APIResponse, query: Base, expand_f
         else:
             results.append(item.to_dict())
     api_response.page = params.page
-    api_response.num_of_pages = int(int(total) / int(params.page_size)) + 1
+    api_response.num_of_pages = int(int(total) / int(params.page_size)) + 1 if total is not None else None
     api_response.total = total
+    api_response.has_more = has_more
     api_response.result = results
+    if keyset_columns and has_more:
+        api_response.next_cursor = encode_cursor(params, keyset_columns, items[-1])
 
 
 def set_api_response_error(api_response: APIResponse, message: str, code: EAPIResponseCode, _logger: LoggerFactory = None):
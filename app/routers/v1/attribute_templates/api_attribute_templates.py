@@ -46,7 +46,7 @@ _logger = LoggerFactory('api_attribute_templates').get_logger()
 @cbv(router)
 class APIAttributeTemplates:
     @router.get('/{id}/', response_model=GETTemplateResponse, summary='Get an attribute template')
-    async def get_attribute_template(self, params: GETTemplate = Depends(GETTemplate)):
+    def get_attribute_template(self, params: GETTemplate = Depends(GETTemplate)):
         try:
             api_response = GETTemplateResponse()
             get_template_by_id(params, api_response)
@@ -58,7 +58,7 @@ class APIAttributeTemplates:
         return api_response.json_response()
 
     @router.get('/', summary='Get all attribute templates associated with a project')
-    async def get_attribute_templates(self, params: GETTemplates = Depends(GETTemplates)):
+    def get_attribute_templates(self, params: GETTemplates = Depends(GETTemplates)):
         try:
             api_response = GETTemplateResponse()
             get_templates_by_project_code(params, api_response)
@@ -70,7 +70,7 @@ class APIAttributeTemplates:
         return api_response.json_response()
 
     @router.post('/', response_model=POSTTemplateResponse, summary='Create a new attribute template')
-    async def create_attribute_template(self, data: POSTTemplate):
+    def create_attribute_template(self, data: POSTTemplate):
         try:
             api_response = POSTTemplateResponse()
             create_template(data, api_response)
@@ -80,7 +80,7 @@ class APIAttributeTemplates:
         return api_response.json_response()
 
     @router.put('/', response_model=PUTTemplateResponse, summary='Update an attribute template')
-    async def update_attribute_template(self, id: UUID, data: PUTTemplate):
+    def update_attribute_template(self, id: UUID, data: PUTTemplate):
         try:
             api_response = PUTTemplateResponse()
             update_template(id, data, api_response)
@@ -92,7 +92,7 @@ class APIAttributeTemplates:
         return api_response.json_response()
 
     @router.delete('/', response_model=DELETETemplateResponse, summary='Delete an attribute template')
-    async def delete_attribute_template(self, params: DELETETemplate = Depends(DELETETemplate)):
+    def delete_attribute_template(self, params: DELETETemplate = Depends(DELETETemplate)):
         try:
             api_response = DELETETemplateResponse()
             delete_template_by_id(params, api_response)
@@ -29,6 +29,8 @@ from app.models.sql_attribute_templates import AttributeTemplateModel
 from app.routers.router_exceptions import EntityNotFoundException
 from app.routers.router_utils import paginate
 
+from .utils import invalidate_template_validator
+
 
 def get_template_by_id(params: GETTemplate, api_response: APIResponse):
     template_query = db.session.query(AttributeTemplateModel).filter_by(id=params.id)
@@ -77,6 +79,7 @@ def update_template(template_id: UUID, data: PUTTemplate, api_response: APIRespo
     template.project_code = data.project_code
     template.attributes = format_attributes_for_json(data.attributes)
     db.session.commit()
+    invalidate_template_validator(template_id)
     db.session.refresh(template)
     api_response.result = template.to_dict()
 
@@ -87,5 +90,6 @@ def delete_template_by_id(params: DELETETemplate, api_response: APIResponse):
         raise EntityNotFoundException()
     db.session.delete(template)
     db.session.commit()
+    invalidate_template_validator(params.id)
     api_response.total = 0
     api_response.num_of_pages = 0
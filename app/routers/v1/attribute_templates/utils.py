@@ -0,0 +1,72 @@
+# Copyright (C) 2022 Indoc Research
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from typing import Iterable
+from typing import Optional
+from uuid import UUID
+
+from fastapi_sqlalchemy import db
+
+from app.cache import TTLCache
+from app.config import ConfigClass
+from app.models.sql_attribute_templates import AttributeTemplateModel
+
+template_validator_cache = TTLCache(ConfigClass.ATTRIBUTE_TEMPLATE_CACHE_SIZE, ConfigClass.ATTRIBUTE_TEMPLATE_CACHE_TTL)
+
+
+class AttributeTemplateValidator:
+    def __init__(self, template_attributes: list[dict]):
+        self.attributes_count = len(template_attributes)
+        self.required_attributes = [
+            (attribute['name'], frozenset(attribute['options']) if attribute.get('options') else None)
+            for attribute in template_attributes
+            if not attribute['optional']
+        ]
+
+    def validate(self, attributes: dict) -> bool:
+        if len(attributes) > self.attributes_count:
+            return False
+        for name, options in self.required_attributes:
+            if name not in attributes:
+                return False
+            if options is not None and attributes[name] not in options:
+                return False
+        return True
+
+
+def get_template_validators(template_ids: Iterable[UUID]) -> dict[UUID, AttributeTemplateValidator]:
+    validators = {}
+    missing_ids = []
+    for template_id in template_ids:
+        validator = template_validator_cache.get(template_id)
+        if validator:
+            validators[template_id] = validator
+        else:
+            missing_ids.append(template_id)
+    if missing_ids:
+        template_query = db.session.query(AttributeTemplateModel).filter(AttributeTemplateModel.id.in_(missing_ids))
+        for template in template_query.all():
+            validator = AttributeTemplateValidator(template.attributes)
+            template_validator_cache.set(template.id, validator)
+            validators[template.id] = validator
+    return validators
+
+
+def get_template_validator(template_id: UUID) -> Optional[AttributeTemplateValidator]:
+    return get_template_validators([template_id]).get(template_id)
+
+
+def invalidate_template_validator(template_id: UUID):
+    template_validator_cache.pop(template_id)
@@ -74,7 +74,7 @@ _logger = LoggerFactory('api_collections').get_logger()
 class APICollections:
     @router.get('/search/', response_model=GETCollectionResponse,
                 summary='Get collections that belong to a user per project')
-    async def get_collections(self, params: GETCollection = Depends(GETCollection)):
+    def get_collections(self, params: GETCollection = Depends(GETCollection)):
         try:
             api_response = GETCollectionResponse()
             get_user_collections(params, api_response)
@@ -89,7 +89,7 @@ class APICollections:
 
     @router.get('/items/', response_model=GETCollectionItemsResponse,
                 summary='Get items that belong to a collection')
-    async def get_collection_items(self, params: GETCollectionItems = Depends(GETCollectionItems)):
+    def get_collection_items(self, params: GETCollectionItems = Depends(GETCollectionItems)):
         try:
             api_response = GETCollectionItemsResponse()
             get_items_per_collection(params, api_response)
@@ -101,10 +101,10 @@ class APICollections:
             _logger.exception(e)
             set_api_response_error(api_response, 'Failed to get items from collection',
                                    EAPIResponseCode.internal_error)
-        return api_response.json_response()
+        return api_response.json_response(fast=True)
 
     @router.get('/{id}/', response_model=GETCollectionResponse, summary='Get collection by id')
-    async def get_collections_id(self, params: GETCollectionID = Depends(GETCollectionID)):
+    def get_collections_id(self, params: GETCollectionID = Depends(GETCollectionID)):
         try:
             api_response = GETCollectionResponse()
             get_collections_by_id(params, api_response)
@@ -119,7 +119,7 @@ class APICollections:
 
     @router.post('/', response_model=POSTCollectionResponse,
                  summary='Create a collection')
-    async def create_new_collection(self, data: POSTCollection):
+    def create_new_collection(self, data: POSTCollection):
         try:
             api_response = POSTCollectionResponse()
             create_collection(data, api_response)
@@ -135,7 +135,7 @@ class APICollections:
 
     @router.put('/', response_model=PUTCollectionResponse,
                 summary='Update a collection(s) name')
-    async def update_collection_name(self, data: PUTCollections):
+    def update_collection_name(self, data: PUTCollections):
         try:
             api_response = PUTCollectionResponse()
             update_collection(data, api_response)
@@ -151,7 +151,7 @@ class APICollections:
 
     @router.delete('/', response_model=DELETECollectionResponse,
                    summary='Delete a collection')
-    async def remove_collection(self, id: UUID):
+    def remove_collection(self, id: UUID):
         try:
             api_response = DELETECollectionResponse()
             remove_collection(id, api_response)
@@ -165,7 +165,7 @@ class APICollections:
 
     @router.post('/items/', response_model=POSTCollectionItemsResponse,
                  summary='Add items to a collection')
-    async def add_items_to_collection(self, data: POSTCollectionItems):
+    def add_items_to_collection(self, data: POSTCollectionItems):
         try:
             api_response = POSTCollectionItemsResponse()
             add_items(data, api_response)
@@ -179,7 +179,7 @@ class APICollections:
 
     @router.delete('/items/', response_model=DELETECollectionItemsResponse,
                    summary='Remove items from a collection')
-    async def remove_items_from_collection(self, data: DELETECollectionItems):
+    def remove_items_from_collection(self, data: DELETECollectionItems):
         try:
             api_response = DELETECollectionItemsResponse()
             remove_items(data)
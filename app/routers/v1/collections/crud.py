@@ -29,15 +29,16 @@ from app.models.models_collections import POSTCollection
 from app.models.models_collections import POSTCollectionItems
 from app.models.models_collections import PUTCollections
 from app.models.sql_collections import CollectionsModel
-from app.models.sql_extended import ExtendedModel
 from app.models.sql_items import ItemModel
 from app.models.sql_items_collections import ItemsCollectionsModel
-from app.models.sql_storage import StorageModel
 from app.routers.router_exceptions import BadRequestException
 from app.routers.router_exceptions import DuplicateRecordException
 from app.routers.router_exceptions import EntityNotFoundException
+from app.routers.router_utils import get_keyset_order_by
 from app.routers.router_utils import paginate
-from app.routers.v1.items.utils import combine_item_tables
+from app.routers.v1.items.utils import get_item_keyset_columns
+from app.routers.v1.items.utils import get_item_read_query
+from app.routers.v1.items.utils import item_row_to_dict
 
 from .utils import validate_collection
 
@@ -75,20 +76,18 @@ def get_items_per_collection(params: GETCollectionItems, api_response: APIRespon
     validate_collection(collection_id=params.id)
 
     try:
-        custom_sort = getattr(ItemModel, params.sorting).asc()
-        if params.order == 'desc':
-            custom_sort = getattr(ItemModel, params.sorting).desc()
+        keyset_columns = get_item_keyset_columns(params.sorting, params.order)
     except Exception:
         raise BadRequestException(f'Cannot sort by {params.sorting}')
 
     item_query = (
-        db.session.query(ItemModel, StorageModel, ExtendedModel).join(StorageModel, ExtendedModel,
-                                                                      ItemsCollectionsModel)
+        get_item_read_query()
+        .join(ItemsCollectionsModel, ItemsCollectionsModel.item_id == ItemModel.id)
         .filter(ItemsCollectionsModel.collection_id == params.id, ItemModel.archived == params.archived)
-        .order_by(ItemModel.type, custom_sort)
+        .order_by(*get_keyset_order_by(keyset_columns))
     )
 
-    paginate(params, api_response, item_query, combine_item_tables)
+    paginate(params, api_response, item_query, item_row_to_dict, keyset_columns)
 
 
 def create_collection(data: POSTCollection, api_response: APIResponse):
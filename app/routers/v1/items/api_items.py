@@ -18,10 +18,13 @@ from uuid import UUID
 
 from common import LoggerFactory
 from fastapi import APIRouter
+from fastapi import BackgroundTasks
 from fastapi import Depends
 from fastapi import Query
+from fastapi.responses import StreamingResponse
 from fastapi_utils.cbv import cbv
 
+from app.models.base_models import APIResponse
 from app.models.base_models import EAPIResponseCode
 from app.models.models_items import DELETEItem
 from app.models.models_items import DELETEItemResponse
@@ -29,32 +32,45 @@ from app.models.models_items import GETItem
 from app.models.models_items import GETItemResponse
 from app.models.models_items import GETItemsByIDs
 from app.models.models_items import GETItemsByLocation
+from app.models.models_items import GETItemsDeleteJobResponse
+from app.models.models_items import GETItemsExport
 from app.models.models_items import PATCHItem
 from app.models.models_items import PATCHItemResponse
+from app.models.models_items import PATCHItems
 from app.models.models_items import POSTItem
 from app.models.models_items import POSTItemResponse
 from app.models.models_items import POSTItems
+from app.models.models_items import POSTItemsLookup
+from app.models.models_items import POSTItemsResponse
 from app.models.models_items import PUTItem
 from app.models.models_items import PUTItemResponse
 from app.models.models_items import PUTItems
 from app.models.models_items import PUTItemsBequeath
 from app.models.models_items import PUTItemsBequeathResponse
+from app.models.models_items import PUTItemsResponse
 from app.routers.router_exceptions import BadRequestException
 from app.routers.router_exceptions import DuplicateRecordException
 from app.routers.router_exceptions import EntityNotFoundException
 from app.routers.router_utils import set_api_response_error
 
 from .crud import archive_item_by_id
+from .crud import archive_items_by_ids
 from .crud import bequeath_to_children
+from .crud import bequeath_to_children_in_bulk
+from .crud import create_delete_job
 from .crud import create_item
 from .crud import create_items
 from .crud import delete_item_by_id
 from .crud import delete_items_by_ids
+from .crud import export_items
 from .crud import get_item_by_id
 from .crud import get_items_by_ids
 from .crud import get_items_by_location
+from .crud import lookup_items
+from .crud import stream_items_by_ids
 from .crud import update_item
 from .crud import update_items
+from .jobs import get_job
 
 router = APIRouter()
 router_bulk = APIRouter()
@@ -64,16 +80,16 @@ _logger = LoggerFactory('api_items').get_logger()
 @cbv(router)
 class APIItems:
     @router.get('/{id}/', response_model=GETItemResponse, summary='Get an item by ID or check if an item exists')
-    async def get_item(self, params: GETItem = Depends(GETItem)):
+    def get_item(self, params: GETItem = Depends(GETItem)):
         try:
             api_response = GETItemResponse()
             get_item_by_id(params, api_response)
         except Exception:
             set_api_response_error(api_response, f'Failed to get item with id {params.id}', EAPIResponseCode.not_found, _logger)
-        return api_response.json_response()
+        return api_response.json_response(fast=True)
 
     @router.post('/', response_model=POSTItemResponse, summary='Create a new item')
-    async def create_item(self, data: POSTItem):
+    def create_item(self, data: POSTItem):
         try:
             api_response = POSTItemResponse()
             api_response.result = create_item(data)
@@ -86,7 +102,7 @@ class APIItems:
         return api_response.json_response()
 
     @router.put('/', response_model=PUTItemResponse, summary='Update an item')
-    async def update_item(self, id: UUID, data: PUTItem):
+    def update_item(self, id: UUID, data: PUTItem):
         try:
             api_response = PUTItemResponse()
             api_response.result = update_item(id, data)
@@ -99,7 +115,7 @@ class APIItems:
         return api_response.json_response()
 
     @router.patch('/', response_model=PATCHItemResponse, summary='Move an item to or out of the trash')
-    async def trash_item(self, params: PATCHItem = Depends(PATCHItem)):
+    def trash_item(self, params: PATCHItem = Depends(PATCHItem)):
         try:
             api_response = PATCHItemResponse()
             archive_item_by_id(params, api_response)
@@ -107,15 +123,20 @@ class APIItems:
             set_api_response_error(api_response, str(e), EAPIResponseCode.bad_request, _logger)
         except EntityNotFoundException:
             set_api_response_error(api_response, f'Failed to get item with id {params.id}', EAPIResponseCode.not_found, _logger)
+        except DuplicateRecordException:
+            set_api_response_error(api_response, 'Item conflict in database', EAPIResponseCode.conflict, _logger)
         except Exception:
             set_api_response_error(api_response, 'Failed to archive item', EAPIResponseCode.internal_error, _logger)
         return api_response.json_response()
 
     @router.delete('/', response_model=DELETEItemResponse, summary='Permanently delete an item')
-    async def delete_item(self, params: DELETEItem = Depends(DELETEItem)):
+    def delete_item(self, background_tasks: BackgroundTasks, params: DELETEItem = Depends(DELETEItem)):
         try:
             api_response = DELETEItemResponse()
-            delete_item_by_id(params.id, api_response)
+            if params.background:
+                create_delete_job([params.id], background_tasks, api_response)
+            else:
+                delete_item_by_id(params.id, api_response)
         except EntityNotFoundException:
             set_api_response_error(api_response, f'Failed to get item with id {params.id}', EAPIResponseCode.not_found, _logger)
         except Exception:
@@ -126,67 +147,145 @@ class APIItems:
 @cbv(router_bulk)
 class APIItemsBulk:
     @router_bulk.get('/batch/', response_model=GETItemResponse, summary='Get many items by IDs')
-    async def get_items_by_ids(self, ids: List[UUID] = Query(None), params: GETItemsByIDs = Depends(GETItemsByIDs)):
+    def get_items_by_ids(self, ids: List[UUID] = Query(None), params: GETItemsByIDs = Depends(GETItemsByIDs)):
         try:
             api_response = GETItemResponse()
             get_items_by_ids(params, ids, api_response)
         except Exception:
             set_api_response_error(api_response, 'Failed to get item', EAPIResponseCode.not_found, _logger)
-        return api_response.json_response()
+        return api_response.json_response(fast=True)
 
     @router_bulk.get('/search/', response_model=GETItemResponse, summary='Get all items by location')
-    async def get_items_by_location(self, params: GETItemsByLocation = Depends(GETItemsByLocation)):
+    def get_items_by_location(
+        self,
+        params: GETItemsByLocation = Depends(GETItemsByLocation),
+        tags: List[str] = Query(None),
+        system_tags: List[str] = Query(None),
+        attributes: List[str] = Query(None, description='name:value pairs, requires attribute_template_id'),
+    ):
         try:
             api_response = GETItemResponse()
-            get_items_by_location(params, api_response)
+            get_items_by_location(params, api_response, tags, system_tags, attributes)
         except BadRequestException as e:
             set_api_response_error(api_response, str(e), EAPIResponseCode.bad_request, _logger)
         except Exception:
             set_api_response_error(api_response, 'Failed to get item', EAPIResponseCode.not_found, _logger)
+        return api_response.json_response(fast=True)
+
+    @router_bulk.post('/batch/lookup/', summary='Stream many items by IDs in request order as NDJSON')
+    def lookup_items(self, data: POSTItemsLookup):
+        try:
+            api_response = APIResponse()
+            return StreamingResponse(lookup_items(data), media_type='application/x-ndjson')
+        except Exception:
+            set_api_response_error(api_response, 'Failed to get items', EAPIResponseCode.internal_error, _logger)
         return api_response.json_response()
 
-    @router_bulk.post('/batch/', response_model=POSTItemResponse, summary='Create many new items')
-    async def create_items(self, data: POSTItems):
+    @router_bulk.get('/export/', summary='Stream all items by location as NDJSON')
+    def export_items(self, params: GETItemsExport = Depends(GETItemsExport)):
         try:
-            api_response = POSTItemResponse()
+            api_response = APIResponse()
+            return StreamingResponse(export_items(params), media_type='application/x-ndjson')
+        except BadRequestException as e:
+            set_api_response_error(api_response, str(e), EAPIResponseCode.bad_request, _logger)
+        except Exception:
+            set_api_response_error(api_response, 'Failed to export items', EAPIResponseCode.internal_error, _logger)
+        return api_response.json_response()
+
+    @router_bulk.post('/batch/', response_model=POSTItemsResponse, summary='Create many new items')
+    def create_items(self, data: POSTItems):
+        try:
+            api_response = POSTItemsResponse()
             create_items(data, api_response)
         except BadRequestException as e:
             set_api_response_error(api_response, str(e), EAPIResponseCode.bad_request, _logger)
+        except DuplicateRecordException:
+            set_api_response_error(api_response, 'Item conflict in database', EAPIResponseCode.conflict, _logger)
         except Exception:
             set_api_response_error(api_response, 'Failed to create items', EAPIResponseCode.internal_error, _logger)
         return api_response.json_response()
 
-    @router_bulk.put('/batch/', response_model=PUTItemResponse, summary='Update many items')
-    async def update_items(self, data: PUTItems, ids: List[UUID] = Query(None)):
+    @router_bulk.put('/batch/', response_model=PUTItemsResponse, summary='Update many items')
+    def update_items(self, data: PUTItems, ids: List[UUID] = Query(None)):
         try:
-            api_response = PUTItemResponse()
+            api_response = PUTItemsResponse()
             if len(data.items) != len(ids):
                 raise BadRequestException('Number of IDs does not match number of update data')
             update_items(ids, data, api_response)
         except BadRequestException as e:
             set_api_response_error(api_response, str(e), EAPIResponseCode.bad_request, _logger)
+        except EntityNotFoundException:
+            set_api_response_error(api_response, 'Failed to get items to update', EAPIResponseCode.not_found, _logger)
+        except DuplicateRecordException:
+            set_api_response_error(api_response, 'Item conflict in database', EAPIResponseCode.conflict, _logger)
         except Exception:
             set_api_response_error(api_response, 'Failed to update items', EAPIResponseCode.internal_error, _logger)
         return api_response.json_response()
 
+    @router_bulk.patch('/batch/', response_model=PATCHItemResponse, summary='Move many items to or out of the trash')
+    def trash_items(self, ids: List[UUID] = Query(None), params: PATCHItems = Depends(PATCHItems)):
+        try:
+            api_response = PATCHItemResponse()
+            archive_items_by_ids(ids, params, api_response)
+        except BadRequestException as e:
+            set_api_response_error(api_response, str(e), EAPIResponseCode.bad_request, _logger)
+        except EntityNotFoundException:
+            set_api_response_error(api_response, 'Failed to get items to archive', EAPIResponseCode.not_found, _logger)
+        except DuplicateRecordException:
+            set_api_response_error(api_response, 'Item conflict in database', EAPIResponseCode.conflict, _logger)
+        except Exception:
+            set_api_response_error(api_response, 'Failed to archive items', EAPIResponseCode.internal_error, _logger)
+        return api_response.json_response()
+
     @router_bulk.delete('/batch/', response_model=DELETEItemResponse, summary='Permanently delete many items by IDs')
-    async def delete_items_by_ids(self, ids: List[UUID] = Query(None)):
+    def delete_items_by_ids(
+        self, background_tasks: BackgroundTasks, ids: List[UUID] = Query(None), background: bool = False
+    ):
         try:
             api_response = DELETEItemResponse()
-            delete_items_by_ids(ids, api_response)
+            if background:
+                create_delete_job(ids, background_tasks, api_response)
+            else:
+                delete_items_by_ids(ids, api_response)
         except Exception:
             set_api_response_error(api_response, 'Failed to delete items', EAPIResponseCode.not_found, _logger)
         return api_response.json_response()
 
+    @router_bulk.get(
+        '/batch/jobs/{id}/', response_model=GETItemsDeleteJobResponse, summary='Get the progress of a delete job'
+    )
+    def get_delete_job(self, id: str):
+        try:
+            api_response = GETItemsDeleteJobResponse()
+            job = get_job(id)
+            if not job:
+                raise EntityNotFoundException()
+            api_response.result = job
+            api_response.total = 1
+            api_response.num_of_pages = 1
+        except Exception:
+            set_api_response_error(api_response, f'Failed to get delete job with id {id}', EAPIResponseCode.not_found, _logger)
+        return api_response.json_response()
+
     @router_bulk.put(
         '/batch/bequeath/',
         response_model=PUTItemsBequeathResponse,
         summary='Bequeath properties to a folder\'s children',
     )
-    async def update_items_bequeath(self, data: PUTItemsBequeath, id: UUID = Query(None)):
+    def update_items_bequeath(
+        self, data: PUTItemsBequeath, id: UUID = Query(None), bulk: bool = False, stream: bool = False
+    ):
         try:
             api_response = PUTItemsBequeathResponse()
-            bequeath_to_children(id, data, api_response)
+            if stream and not bulk:
+                raise BadRequestException('Streaming bequeath results requires bulk mode')
+            if bulk:
+                children_ids = bequeath_to_children_in_bulk(id, data)
+                if stream:
+                    return StreamingResponse(stream_items_by_ids(children_ids), media_type='application/x-ndjson')
+                api_response.total = len(children_ids)
+            else:
+                bequeath_to_children(id, data, api_response)
         except BadRequestException as e:
             set_api_response_error(api_response, str(e), EAPIResponseCode.bad_request, _logger)
         except Exception:
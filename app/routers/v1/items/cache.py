@@ -0,0 +1,72 @@
+# Copyright (C) 2022 Indoc Research
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from typing import Iterable
+from typing import Optional
+from typing import Union
+from uuid import UUID
+
+from common import LoggerFactory
+
+from app.cache import RedisCache
+from app.cache import TTLCache
+from app.config import ConfigClass
+
+_logger = LoggerFactory('item_cache').get_logger()
+
+
+def create_item_cache() -> Optional[Union[TTLCache, RedisCache]]:
+    if not ConfigClass.ITEM_CACHE_ENABLED:
+        return None
+    if ConfigClass.ITEM_CACHE_BACKEND == 'redis':
+        try:
+            import redis
+        except ImportError:
+            _logger.error(
+                'ITEM_CACHE_BACKEND is "redis" but the redis package is not installed '
+                '(install the "redis" extra), falling back to the memory backend'
+            )
+        else:
+            client = redis.Redis.from_url(ConfigClass.ITEM_CACHE_REDIS_URL)
+            return RedisCache(client, ConfigClass.ITEM_CACHE_TTL, 'metadata:items:')
+    return TTLCache(ConfigClass.ITEM_CACHE_SIZE, ConfigClass.ITEM_CACHE_TTL)
+
+
+item_cache = create_item_cache()
+
+
+def item_cache_enabled() -> bool:
+    return item_cache is not None
+
+
+def get_cached_item(id: UUID) -> Optional[dict]:
+    if item_cache is not None:
+        return item_cache.get(str(id))
+
+
+def cache_item(id: UUID, item: dict):
+    if item_cache is not None:
+        item_cache.set(str(id), item)
+
+
+def invalidate_items(ids: Iterable[UUID]):
+    if item_cache is not None:
+        item_cache.pop_many([str(id) for id in ids])
+
+
+def get_item_cache_stats() -> dict:
+    if item_cache is None:
+        return {'enabled': False}
+    return {'enabled': True, **item_cache.stats()}
@@ -13,195 +13,277 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-import time
 import uuid
 from datetime import datetime
+from typing import Iterator
+from typing import Union
 from uuid import UUID
 
+import orjson
+from common import LoggerFactory
+from fastapi import BackgroundTasks
 from fastapi_sqlalchemy import db
+from sqlalchemy import Column
+from sqlalchemy import Integer
+from sqlalchemy import String
+from sqlalchemy import Text
+from sqlalchemy import and_
+from sqlalchemy import any_
+from sqlalchemy import bindparam
+from sqlalchemy import delete
+from sqlalchemy import func
+from sqlalchemy import insert
+from sqlalchemy import or_
+from sqlalchemy import select
 from sqlalchemy import update
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Query
+from sqlalchemy.orm import Session
+from sqlalchemy.orm import aliased
+from sqlalchemy.sql import ColumnElement
+from sqlalchemy.sql import Select
 from sqlalchemy.sql import expression
 from sqlalchemy_utils import Ltree
-from sqlalchemy_utils.types.ltree import LQUERY
+from sqlalchemy_utils import LtreeType
 
+from app.app_utils import decode_label_from_ltree
 from app.app_utils import decode_path_from_ltree
-from app.app_utils import encode_label_for_ltree
 from app.app_utils import encode_path_for_ltree
+from app.config import ConfigClass
 from app.models.base_models import APIResponse
 from app.models.models_items import GETItem
 from app.models.models_items import GETItemsByIDs
 from app.models.models_items import GETItemsByLocation
+from app.models.models_items import GETItemsExport
 from app.models.models_items import PATCHItem
+from app.models.models_items import PATCHItems
 from app.models.models_items import POSTItem
 from app.models.models_items import POSTItems
+from app.models.models_items import POSTItemsLookup
+from app.models.models_items import POSTItemsResponse
 from app.models.models_items import PUTItem
 from app.models.models_items import PUTItems
+from app.models.models_items import PUTItemsResponse
 from app.models.models_items import PUTItemsBequeath
-from app.models.sql_attribute_templates import AttributeTemplateModel
 from app.models.sql_extended import ExtendedModel
 from app.models.sql_items import ItemModel
+from app.models.sql_items_collections import ItemsCollectionsModel
 from app.models.sql_storage import StorageModel
 from app.routers.router_exceptions import BadRequestException
 from app.routers.router_exceptions import DuplicateRecordException
 from app.routers.router_exceptions import EntityNotFoundException
+from app.routers.router_utils import decode_cursor
+from app.routers.router_utils import encode_cursor
+from app.routers.router_utils import get_keyset_filter
+from app.routers.router_utils import get_keyset_order_by
 from app.routers.router_utils import paginate
-from app.routers.v1.items.utils import combine_item_tables
-from app.routers.v1.items.utils import get_path_depth
-from app.routers.v1.items.utils import get_relative_path_depth
-
-
-def get_available_file_name(
-    container_code: UUID,
-    zone: int,
-    item_name: str,
-    encoded_item_path: Ltree,
-    archived: bool,
-) -> str:
-    item = (
-        db.session.query(ItemModel)
-        .filter_by(
-            container_code=container_code,
-            zone=zone,
-            name=item_name,
-            parent_path=encoded_item_path,
-            archived=archived,
+from app.routers.v1.attribute_templates.utils import get_template_validator
+from app.routers.v1.attribute_templates.utils import get_template_validators
+from app.routers.v1.items.cache import cache_item
+from app.routers.v1.items.cache import get_cached_item
+from app.routers.v1.items.cache import invalidate_items
+from app.routers.v1.items.cache import item_cache_enabled
+from app.routers.v1.items.jobs import create_job
+from app.routers.v1.items.jobs import update_job
+from app.routers.v1.items.utils import get_encoded_item_path
+from app.routers.v1.items.utils import get_item_keyset_columns
+from app.routers.v1.items.utils import get_item_extra_column
+from app.routers.v1.items.utils import get_item_read_query
+from app.routers.v1.items.utils import get_suffixed_name
+from app.routers.v1.items.utils import item_row_to_dict
+from app.routers.v1.items.utils import replace_display_path_prefix
+from app.routers.v1.items.utils import replace_path_prefix
+
+_logger = LoggerFactory('crud_items').get_logger()
+
+
+def get_archive_location_columns(trash_item: bool) -> list[Column]:
+    location_columns = [ItemModel.container_code, ItemModel.container_type, ItemModel.zone, ItemModel.name]
+    if not trash_item:
+        location_columns.append(ItemModel.restore_path)
+    return location_columns
+
+
+def lock_archive_locations(root_items: list[ItemModel], trash_item: bool):
+    location_keys = (
+        select(func.hashtext(func.concat_ws('/', *get_archive_location_columns(trash_item))).label('key'))
+        .where(ItemModel.id.in_([root_item.id for root_item in root_items]))
+        .distinct()
+        .order_by('key')
+        .subquery()
+    )
+    db.session.execute(select(func.pg_advisory_xact_lock(location_keys.c.key))).all()
+
+
+def get_available_names(root_items: list[ItemModel], trash_item: bool) -> dict[UUID, str]:
+    location_columns = get_archive_location_columns(trash_item)
+    roots = (
+        select(
+            *location_columns,
+            ItemModel.id,
+            func.row_number().over(partition_by=location_columns, order_by=ItemModel.id).label('rank'),
         )
-        .first()
+        .where(ItemModel.id.in_([root_item.id for root_item in root_items]))
+        .cte('roots')
     )
-    if not item:
-        return item_name
-    item_extension = ''
-    if '.' in item_name:
-        item_name_split = item_name.split('.', 1)
-        item_name = item_name_split[0]
-        item_extension = '.' + item_name_split[1]
-    timestamp = round(time.time())
-    item_name_new = f'{item_name}_{timestamp}{item_extension}'
-    return item_name_new
-
-
-def get_item_children(root_item: ItemModel, group_by_depth: bool = False) -> dict:
-    search_path = (
-        f'{root_item.restore_path}.{encode_label_for_ltree(root_item.name)}.*'
-        if root_item.archived
-        else f'{root_item.parent_path}.{encode_label_for_ltree(root_item.name)}.*'
+    suffixes = (
+        func.generate_series(0, ConfigClass.ITEM_NAME_MAX_SUFFIX).table_valued('value').render_derived(name='suffixes')
     )
-    children_item_query = (
-        db.session.query(ItemModel, StorageModel, ExtendedModel)
-        .join(StorageModel, ExtendedModel)
-        .filter(
-            ItemModel.container_code == root_item.container_code,
-            ItemModel.zone == root_item.zone,
-            ItemModel.archived == root_item.archived,
-            ItemModel.restore_path.lquery(expression.cast(search_path, LQUERY))
-            if root_item.archived
-            else ItemModel.parent_path.lquery(expression.cast(search_path, LQUERY)),
+    candidate_name = get_suffixed_name(roots.c.name, suffixes.c.value)
+    existing_items = aliased(ItemModel)
+    taken_query = select(existing_items.id).where(
+        existing_items.container_code == roots.c.container_code,
+        existing_items.container_type == roots.c.container_type,
+        existing_items.zone == roots.c.zone,
+        existing_items.archived == trash_item,
+        existing_items.name == candidate_name,
+        existing_items.parent_path.is_(None) if trash_item else existing_items.parent_path == roots.c.restore_path,
+    )
+    available_name = (
+        select(candidate_name)
+        .select_from(suffixes)
+        .where(~taken_query.exists())
+        .order_by(suffixes.c.value)
+        .offset(roots.c.rank - 1)
+        .limit(1)
+        .scalar_subquery()
+    )
+    available_names = dict(db.session.execute(select(roots.c.id, available_name)).all())
+    if None in available_names.values():
+        raise DuplicateRecordException('No available name for item')
+    return available_names
+
+
+def get_item_children_filter(root_item: ItemModel) -> tuple:
+    # trashed children live under the trash root's current name, which may differ from the name in their restore_path
+    root_path = Ltree(get_encoded_item_path(root_item))
+    return (
+        ItemModel.container_code == root_item.container_code,
+        ItemModel.container_type == root_item.container_type,
+        ItemModel.zone == root_item.zone,
+        ItemModel.archived == root_item.archived,
+        ItemModel.parent_path.descendant_of(root_path),
+    )
+
+
+def update_children_paths(
+    children_filter: tuple, old_item_path: str, new_item_path: str, return_children: bool = False
+) -> Union[int, list[UUID]]:
+    children_query = (
+        update(ItemModel)
+        .where(*children_filter)
+        .values(
+            parent_path=replace_path_prefix(ItemModel.parent_path, old_item_path, new_item_path),
+            display_path=replace_display_path_prefix(ItemModel.display_path, old_item_path, new_item_path),
         )
+        .execution_options(synchronize_session=False)
     )
-    children = children_item_query.all()
-    if not group_by_depth:
-        return children
-    layers = {}
-    for item in children:
-        depth = get_relative_path_depth(root_item, item[0])
-        if depth not in layers:
-            layers[depth] = []
-        layers[depth].append(item)
-    return layers
-
-
-def move_item(item: ItemModel, new_parent_path: str, children: dict = None, depth: int = 1):
-    if not children:
-        children = get_item_children(item, True)
+    if return_children:
+        return db.session.execute(children_query.returning(ItemModel.id)).scalars().all()
+    return db.session.execute(children_query).rowcount
+
+
+def move_item(item: ItemModel, new_parent_path: str, return_children: bool = False) -> Union[int, list[UUID]]:
+    children_filter = get_item_children_filter(item)
+    old_item_path = get_encoded_item_path(item)
     item.parent_path = Ltree(encode_path_for_ltree(new_parent_path)) if new_parent_path else None
-    if depth not in children:
-        return
-    layer = children[depth]
-    for child in layer:
-        move_item(child[0], f'{new_parent_path}.{item.name}' if new_parent_path else item.name, children, depth + 1)
+    item.display_path = new_parent_path if new_parent_path else None
+    return update_children_paths(children_filter, old_item_path, get_encoded_item_path(item), return_children)
 
 
-def rename_item(
-        root_item: ItemModel, item: ItemModel, old_name: str, new_name: str, children: dict = None, depth: int = 1
-):
-    if not children:
-        children = get_item_children(item, True)
-    if item == root_item:
-        item.name = new_name
-    else:
-        decoded_parent_path = decode_path_from_ltree(item.parent_path)
-        root_item_depth = get_path_depth(root_item)
-        labels = decoded_parent_path.split('.')
-        labels[root_item_depth] = new_name
-        new_parent_path = '.'.join(labels)
-        item.parent_path = Ltree(encode_path_for_ltree(new_parent_path))
-    if depth not in children:
-        return
-    layer = children[depth]
-    for child in layer:
-        rename_item(root_item, child[0], old_name, new_name, children, depth + 1)
-
-
-def attributes_match_template(attributes: dict, template_id: UUID) -> bool:
+def rename_item(item: ItemModel, new_name: str, return_children: bool = False) -> Union[int, list[UUID]]:
+    children_filter = get_item_children_filter(item)
+    old_item_path = get_encoded_item_path(item)
+    item.name = new_name
+    return update_children_paths(children_filter, old_item_path, get_encoded_item_path(item), return_children)
+
+
+def attributes_match_template(attributes: dict, template_id: UUID, template_validators: dict = None) -> bool:
     if not template_id and not attributes:
         return True
     try:
-        attribute_template = db.session.query(AttributeTemplateModel).filter_by(id=template_id).first().to_dict()
-        if len(attributes) > len(attribute_template['attributes']):
-            return False
-        for format in attribute_template['attributes']:
-            if not format['optional']:
-                input_value = attributes[format['name']]
-                if 'options' in format:
-                    if format['options']:
-                        if input_value not in format['options']:
-                            return False
-        return True
+        if template_validators is None:
+            template_validator = get_template_validator(template_id)
+        else:
+            template_validator = template_validators[template_id]
+        return template_validator.validate(attributes)
     except Exception:
         return False
 
 
 def get_item_by_id(params: GETItem, api_response: APIResponse):
-    item_query = (
-        db.session.query(ItemModel, StorageModel, ExtendedModel)
-        .join(StorageModel, ExtendedModel)
-        .filter(ItemModel.id == params.id)
-    )
-    item_result = item_query.first()
-    if item_result:
-        api_response.result = combine_item_tables(item_result)
-    else:
-        raise EntityNotFoundException()
+    item = get_cached_item(params.id)
+    if item is None:
+        item_result = get_item_read_query().filter(ItemModel.id == params.id).first()
+        if not item_result:
+            raise EntityNotFoundException()
+        item = item_row_to_dict(item_result)
+        cache_item(params.id, item)
+    api_response.result = item
 
 
 def get_items_by_ids(params: GETItemsByIDs, ids: list[UUID], api_response: APIResponse):
+    item_query = get_item_read_query().filter(ItemModel.id.in_(ids))
+    paginate(params, api_response, item_query, item_row_to_dict)
+
+
+def stream_items_lookup(engine: Engine, item_query: Query, ids: list[UUID]) -> Iterator[bytes]:
+    with Session(bind=engine) as session:
+        item_query = item_query.with_session(session)
+        for i in range(0, len(ids), ConfigClass.LOOKUP_ITEMS_CHUNK_SIZE):
+            chunk_ids = ids[i:i + ConfigClass.LOOKUP_ITEMS_CHUNK_SIZE]
+            items_by_id = {item.id: item for item in item_query.params(ids=chunk_ids).all()}
+            lines = []
+            for id in chunk_ids:
+                item = items_by_id.get(id)
+                line = {'id': str(id), 'found': item is not None, 'item': item_row_to_dict(item) if item else None}
+                lines.append(orjson.dumps(line) + b'\n')
+            yield b''.join(lines)
+
+
+def stream_items_by_ids(ids: list[UUID]) -> Iterator[bytes]:
+    item_query = get_item_read_query().filter(
+        ItemModel.id == any_(bindparam('ids', type_=postgresql.ARRAY(postgresql.UUID(as_uuid=True))))
+    )
+    return stream_items_lookup(db.session.get_bind(), item_query, ids)
+
+
+def lookup_items(data: POSTItemsLookup) -> Iterator[bytes]:
+    return stream_items_by_ids(data.ids)
+
+
+def get_items_in_order(ids: list[UUID]) -> list:
     item_query = (
         db.session.query(ItemModel, StorageModel, ExtendedModel)
         .join(StorageModel, ExtendedModel)
         .filter(ItemModel.id.in_(ids))
     )
-    paginate(params, api_response, item_query, combine_item_tables)
+    items_by_id = {item[0].id: item for item in item_query.all()}
+    return [items_by_id[id] for id in ids if id in items_by_id]
 
 
-def get_items_by_location(params: GETItemsByLocation, api_response: APIResponse):
-    if params.type and params.type not in ['name_folder', 'folder', 'file']:
-        raise BadRequestException(f'Invalid type {params.type}')
-    if params.container_type and params.container_type not in ['project', 'dataset']:
-        raise BadRequestException(f'Invalid container_type {params.container_type}')
-    try:
-        custom_sort = getattr(ItemModel, params.sorting).asc()
-        if params.order == 'desc':
-            custom_sort = getattr(ItemModel, params.sorting).desc()
-    except Exception:
-        raise BadRequestException(f'Cannot sort by {params.sorting}')
+def get_item_dicts_in_order(ids: list[UUID]) -> list[dict]:
+    item_query = get_item_read_query().filter(ItemModel.id.in_(ids))
+    items_by_id = {item.id: item for item in item_query.all()}
+    return [item_row_to_dict(items_by_id[id]) for id in ids if id in items_by_id]
+
+
+def get_items_by_location_query(
+    params: Union[GETItemsByLocation, GETItemsExport],
+    keyset_columns: list[tuple[Column, bool]],
+    extra_filter: dict = None,
+) -> Query:
     item_query = (
-        db.session.query(ItemModel, StorageModel, ExtendedModel)
-        .join(StorageModel, ExtendedModel)
+        get_item_read_query()
         .filter(
             ItemModel.container_code == params.container_code,
             ItemModel.archived == params.archived,
         )
-        .order_by(ItemModel.type, custom_sort)
+        .order_by(*get_keyset_order_by(keyset_columns))
     )
     if params.zone is not None:
         item_query = item_query.filter(ItemModel.zone == params.zone)
@@ -216,21 +298,106 @@ def get_items_by_location(params: GETItemsByLocation, api_response: APIResponse)
     if params.parent_path:
         search_path = encode_path_for_ltree(params.parent_path)
         if params.recursive:
-            search_path += '.*'
-        item_query = item_query.filter(ItemModel.parent_path.lquery(expression.cast(search_path, LQUERY)))
+            item_query = item_query.filter(ItemModel.parent_path.descendant_of(Ltree(search_path)))
+        else:
+            item_query = item_query.filter(ItemModel.parent_path == Ltree(search_path))
     else:
         if not params.recursive:
             item_query = item_query.filter(ItemModel.parent_path == None)
-    paginate(params, api_response, item_query, combine_item_tables)
+    if extra_filter:
+        item_query = item_query.filter(get_item_extra_column().contains(extra_filter))
+    return item_query
 
 
-def create_item(data: POSTItem) -> dict:
-    if not attributes_match_template(data.attributes, data.attribute_template_id):
-        raise BadRequestException('Attributes do not match attribute template')
+def validate_location_params(params: Union[GETItemsByLocation, GETItemsExport]):
+    if params.type and params.type not in ['name_folder', 'folder', 'file']:
+        raise BadRequestException(f'Invalid type {params.type}')
+    if params.container_type and params.container_type not in ['project', 'dataset']:
+        raise BadRequestException(f'Invalid container_type {params.container_type}')
+
+
+def get_extra_filter(
+    params: GETItemsByLocation, tags: list[str] = None, system_tags: list[str] = None, attributes: list[str] = None
+) -> dict:
+    extra_filter = {}
+    if tags:
+        extra_filter['tags'] = tags
+    if system_tags:
+        extra_filter['system_tags'] = system_tags
+    if attributes and not params.attribute_template_id:
+        raise BadRequestException('attribute_template_id is required to filter by attributes')
+    if params.attribute_template_id:
+        attribute_values = {}
+        for attribute in attributes or []:
+            name, separator, value = attribute.partition(':')
+            if not name or not separator:
+                raise BadRequestException(f'Invalid attribute filter {attribute}')
+            attribute_values[name] = value
+        extra_filter['attributes'] = {str(params.attribute_template_id): attribute_values}
+    return extra_filter
+
+
+def get_items_by_location(
+    params: GETItemsByLocation,
+    api_response: APIResponse,
+    tags: list[str] = None,
+    system_tags: list[str] = None,
+    attributes: list[str] = None,
+):
+    validate_location_params(params)
+    try:
+        keyset_columns = get_item_keyset_columns(params.sorting, params.order)
+    except Exception:
+        raise BadRequestException(f'Cannot sort by {params.sorting}')
+    extra_filter = get_extra_filter(params, tags, system_tags, attributes)
+    item_query = get_items_by_location_query(params, keyset_columns, extra_filter)
+    paginate(params, api_response, item_query, item_row_to_dict, keyset_columns)
+
+
+def stream_items_export(
+    engine: Engine, item_query: Query, params: GETItemsExport, keyset_columns: list[tuple[Column, bool]]
+) -> Iterator[bytes]:
+    with Session(bind=engine) as session:
+        lines = []
+        for item in item_query.with_session(session).yield_per(ConfigClass.EXPORT_ITEMS_BATCH_SIZE):
+            resume_token = encode_cursor(params, keyset_columns, item)
+            lines.append(orjson.dumps({'resume_token': resume_token, 'item': item_row_to_dict(item)}) + b'\n')
+            if len(lines) == ConfigClass.EXPORT_ITEMS_BATCH_SIZE:
+                yield b''.join(lines)
+                lines = []
+        if lines:
+            yield b''.join(lines)
+
+
+def export_items(params: GETItemsExport) -> Iterator[bytes]:
+    validate_location_params(params)
+    keyset_columns = get_item_keyset_columns(params.sorting, params.order)
+    item_query = get_items_by_location_query(params, keyset_columns)
+    if params.resume_token:
+        resume_values = decode_cursor(params, keyset_columns, params.resume_token)
+        item_query = item_query.filter(get_keyset_filter(keyset_columns, resume_values))
+    return stream_items_export(db.session.get_bind(), item_query, params, keyset_columns)
+
+
+def get_item_model_data(data: POSTItem) -> tuple[dict, dict, dict]:
+    storage_model_data = {
+        'id': uuid.uuid4(),
+        'location_uri': data.location_uri,
+        'version': data.version,
+    }
+    extended_model_data = {
+        'id': uuid.uuid4(),
+        'extra': {
+            'tags': data.tags,
+            'system_tags': data.system_tags,
+            'attributes': {str(data.attribute_template_id): data.attributes} if data.attributes else {},
+        },
+    }
     item_model_data = {
         'id': data.id if data.id else uuid.uuid4(),
         'parent': data.parent if data.parent else None,
         'parent_path': Ltree(f'{encode_path_for_ltree(data.parent_path)}') if data.parent_path else None,
+        'display_path': data.parent_path if data.parent_path else None,
         'archived': False,
         'type': data.type,
         'zone': data.zone,
@@ -239,62 +406,92 @@ def create_item(data: POSTItem) -> dict:
         'owner': data.owner,
         'container_code': data.container_code,
         'container_type': data.container_type,
+        'storage_id': storage_model_data['id'],
+        'location_uri': storage_model_data['location_uri'],
+        'version': storage_model_data['version'],
+        'extended_id': extended_model_data['id'],
+        'extra': extended_model_data['extra'],
     }
+    storage_model_data['item_id'] = item_model_data['id']
+    extended_model_data['item_id'] = item_model_data['id']
+    return item_model_data, storage_model_data, extended_model_data
+
+
+def create_item(data: POSTItem) -> dict:
+    if not attributes_match_template(data.attributes, data.attribute_template_id):
+        raise BadRequestException('Attributes do not match attribute template')
+    item_model_data, storage_model_data, extended_model_data = get_item_model_data(data)
     item = ItemModel(**item_model_data)
-    storage_model_data = {
-        'item_id': item.id,
-        'location_uri': data.location_uri,
-        'version': data.version,
-    }
     storage = StorageModel(**storage_model_data)
-    extended_model_data = {
-        'item_id': item.id,
-        'extra': {
-            'tags': data.tags,
-            'system_tags': data.system_tags,
-            'attributes': {str(data.attribute_template_id): data.attributes} if data.attributes else {},
-        },
-    }
     extended = ExtendedModel(**extended_model_data)
     try:
         db.session.add_all([item, storage, extended])
         db.session.commit()
-        db.session.refresh(item)
-        db.session.refresh(storage)
-        db.session.refresh(extended)
     except Exception:
         raise DuplicateRecordException
-    return combine_item_tables((item, storage, extended))
-
-
-def create_items(data: POSTItems, api_response: APIResponse):
-    results = []
-    for item in data.items:
-        try:
-            results.append(create_item(item))
-        except DuplicateRecordException as e:
-            if data.skip_duplicates:
-                pass
-            else:
-                raise e
-    api_response.result = results
-    api_response.total = len(results)
-
-
-def update_item(item_id: UUID, data: PUTItem) -> dict:
-    item = db.session.query(ItemModel).filter_by(id=item_id).first()
-    if not item:
-        raise EntityNotFoundException()
+    return get_item_dicts_in_order([item.id])[0]
+
+
+def insert_items(items_model_data: list[tuple[dict, dict, dict]]) -> set[UUID]:
+    created_time = datetime.utcnow()
+    item_rows = [
+        {**item_model_data, 'created_time': created_time, 'last_updated_time': created_time}
+        for item_model_data, _, _ in items_model_data
+    ]
+    item_query = postgresql.insert(ItemModel).on_conflict_do_nothing().returning(ItemModel.id)
+    created_ids = set(db.session.execute(item_query, item_rows).scalars().all())
+    created_rows = [model_data for model_data in items_model_data if model_data[0]['id'] in created_ids]
+    if created_rows:
+        db.session.execute(insert(StorageModel), [storage_model_data for _, storage_model_data, _ in created_rows])
+        db.session.execute(insert(ExtendedModel), [extended_model_data for _, _, extended_model_data in created_rows])
+    return created_ids
+
+
+def create_items(data: POSTItems, api_response: POSTItemsResponse):
+    template_ids = {item.attribute_template_id for item in data.items if item.attribute_template_id}
+    template_validators = get_template_validators(template_ids) if template_ids else {}
+    for index, item in enumerate(data.items):
+        if not attributes_match_template(item.attributes, item.attribute_template_id, template_validators):
+            raise BadRequestException(f'Attributes do not match attribute template for item at index {index}')
+    items_model_data = [get_item_model_data(item) for item in data.items]
+    created_ids = set()
+    for i in range(0, len(items_model_data), ConfigClass.CREATE_ITEMS_CHUNK_SIZE):
+        created_ids |= insert_items(items_model_data[i:i + ConfigClass.CREATE_ITEMS_CHUNK_SIZE])
+    if len(created_ids) != len(items_model_data) and not data.skip_duplicates:
+        db.session.rollback()
+        raise DuplicateRecordException()
+    db.session.commit()
+    ordered_ids = [item_model_data['id'] for item_model_data, _, _ in items_model_data]
+    api_response.result = get_item_dicts_in_order([id for id in ordered_ids if id in created_ids])
+    api_response.outcomes = [
+        {'index': index, 'id': str(id), 'status': 'created' if id in created_ids else 'skipped'}
+        for index, id in enumerate(ordered_ids)
+    ]
+    api_response.total = len(created_ids)
+
+
+def apply_item_update(item_result: tuple, data: PUTItem, template_validators: dict = None) -> list[UUID]:
+    item, storage, extended = item_result
+    children_ids = []
+    # moved children ids are only needed to invalidate cached items
+    return_children = item_cache_enabled()
+    if data.attribute_template_id and data.attributes:
+        if not attributes_match_template(data.attributes, data.attribute_template_id, template_validators):
+            raise BadRequestException('Attributes do not match attribute template')
     if data.parent != '':
         item.parent = data.parent if data.parent else None
     if data.parent_path != '' and not item.archived:
-        move_item(item, data.parent_path)
+        moved_children = move_item(item, data.parent_path, return_children)
+        if return_children:
+            children_ids += moved_children
     if data.type:
         item.type = data.type
     if data.zone:
         item.zone = data.zone
     if data.name and not item.archived:
-        rename_item(item, item, item.name, data.name)
+        renamed_children = rename_item(item, data.name, return_children)
+        if return_children:
+            children_ids += renamed_children
     if data.size:
         item.size = data.size
     if data.owner:
@@ -304,183 +501,391 @@ def update_item(item_id: UUID, data: PUTItem) -> dict:
     if data.container_type:
         item.container_type = data.container_type
     item.last_updated_time = datetime.utcnow()
-    storage = db.session.query(StorageModel).filter_by(item_id=item_id).first()
     if data.location_uri:
         storage.location_uri = data.location_uri
     if data.version:
         storage.version = data.version
-    extended = db.session.query(ExtendedModel).filter_by(item_id=item_id).first()
     extra = dict(extended.extra)
     if data.tags is not None:
         extra['tags'] = data.tags
     if data.system_tags is not None:
         extra['system_tags'] = data.system_tags
     if data.attribute_template_id and data.attributes:
-        if not attributes_match_template(data.attributes, data.attribute_template_id):
-            raise BadRequestException('Attributes do not match attribute template')
         extra['attributes'] = {str(data.attribute_template_id): data.attributes} if data.attributes else {}
     if extra != extended.extra:
         extended.extra = extra
+    return children_ids
+
+
+def changes_unique_fields(data: PUTItem) -> bool:
+    return data.parent_path != '' or bool(
+        data.name or data.type or data.zone or data.container_code or data.container_type
+    )
+
+
+def update_item(item_id: UUID, data: PUTItem) -> dict:
+    item_result = get_items_in_order([item_id])
+    if not item_result:
+        raise EntityNotFoundException()
+    children_ids = apply_item_update(item_result[0], data)
     db.session.commit()
-    db.session.refresh(item)
-    db.session.refresh(storage)
-    db.session.refresh(extended)
-    return combine_item_tables((item, storage, extended))
+    invalidate_items([item_id, *children_ids])
+    return get_item_dicts_in_order([item_id])[0]
 
 
-def update_items(ids: list[UUID], data: PUTItems, api_response: APIResponse):
-    results = []
-    for i in range(0, len(ids)):
-        results.append(update_item(ids[i], data.items[i]))
-    api_response.result = results
-    api_response.total = len(results)
+def update_items(ids: list[UUID], data: PUTItems, api_response: PUTItemsResponse):
+    items_by_id = {item[0].id: item for item in get_items_in_order(ids)}
+    template_ids = {item.attribute_template_id for item in data.items if item.attribute_template_id}
+    template_validators = get_template_validators(template_ids) if template_ids else {}
+    outcomes = []
+    changed_ids = []
+    for index, (id, item_data) in enumerate(zip(ids, data.items)):
+        try:
+            if id not in items_by_id:
+                raise EntityNotFoundException()
+            if changes_unique_fields(item_data):
+                with db.session.begin_nested():
+                    children_ids = apply_item_update(items_by_id[id], item_data, template_validators)
+            else:
+                children_ids = apply_item_update(items_by_id[id], item_data, template_validators)
+            changed_ids += [id, *children_ids]
+            outcomes.append({'index': index, 'id': str(id), 'status': 'updated', 'error_msg': ''})
+        except (BadRequestException, EntityNotFoundException, IntegrityError) as e:
+            if data.atomic:
+                db.session.rollback()
+                if isinstance(e, IntegrityError):
+                    raise DuplicateRecordException()
+                raise e
+            if isinstance(e, EntityNotFoundException):
+                error_msg = 'Item not found'
+            elif isinstance(e, IntegrityError):
+                error_msg = 'Item conflict in database'
+            else:
+                error_msg = str(e)
+            outcomes.append({'index': index, 'id': str(id), 'status': 'failed', 'error_msg': error_msg})
+    db.session.commit()
+    invalidate_items(changed_ids)
+    updated_ids = [id for id, outcome in zip(ids, outcomes) if outcome['status'] == 'updated']
+    api_response.result = get_item_dicts_in_order(updated_ids)
+    api_response.outcomes = outcomes
+    api_response.total = len(updated_ids)
+
+
+def get_restore_destinations(root_items: list[ItemModel]) -> dict[UUID, tuple[UUID, str]]:
+    restore_destinations = {}
+    restore_parent_ids = {root_item.restore_parent for root_item in root_items if root_item.restore_parent}
+    if restore_parent_ids:
+        restore_parents_query = select(
+            ItemModel.id, ItemModel.container_code, ItemModel.zone, ItemModel.parent_path, ItemModel.name
+        ).where(ItemModel.id.in_(restore_parent_ids), ItemModel.archived == False)
+        restore_parents = {
+            restore_parent.id: restore_parent for restore_parent in db.session.execute(restore_parents_query)
+        }
+        for root_item in root_items:
+            restore_parent = restore_parents.get(root_item.restore_parent)
+            if restore_parent and (restore_parent.container_code, restore_parent.zone) == (
+                root_item.container_code,
+                root_item.zone,
+            ):
+                restore_destinations[root_item.id] = (restore_parent.id, get_encoded_item_path(restore_parent))
+    unresolved_root_items = [root_item for root_item in root_items if root_item.id not in restore_destinations]
+    if unresolved_root_items:
+        restore_locations = expression.values(
+            expression.column('container_code', String()),
+            expression.column('zone', Integer()),
+            expression.column('parent_path', String()),
+            expression.column('name', String()),
+            name='restore_locations',
+        ).data(
+            [
+                (
+                    root_item.container_code,
+                    root_item.zone,
+                    str(root_item.restore_path).rpartition('.')[0] or None,
+                    decode_label_from_ltree(str(root_item.restore_path).rpartition('.')[2]),
+                )
+                for root_item in unresolved_root_items
+            ]
+        )
+        destinations_query = (
+            select(ItemModel.id, ItemModel.container_code, ItemModel.zone, ItemModel.parent_path, ItemModel.name)
+            .join(
+                restore_locations,
+                and_(
+                    ItemModel.container_code == restore_locations.c.container_code,
+                    ItemModel.zone == restore_locations.c.zone,
+                    ItemModel.name == restore_locations.c.name,
+                    ItemModel.parent_path.is_not_distinct_from(
+                        expression.cast(restore_locations.c.parent_path, LtreeType())
+                    ),
+                ),
+            )
+            .where(ItemModel.archived == False)
+        )
+        destination_ids = {
+            (destination.container_code, destination.zone, get_encoded_item_path(destination)): destination.id
+            for destination in db.session.execute(destinations_query)
+        }
+        for root_item in unresolved_root_items:
+            location = (root_item.container_code, root_item.zone, str(root_item.restore_path))
+            if location in destination_ids:
+                restore_destinations[root_item.id] = (destination_ids[location], location[2])
+    return restore_destinations
+
+
+def archive_item(item: ItemModel, trash_item: bool, item_name: str, restore_destination_id: UUID = None):
+    if trash_item:
+        item.name = item_name
+        item.restore_parent = item.parent
+        item.parent = None
+        item.restore_path = item.parent_path
+        item.parent_path = None
+        item.display_restore_path = item.display_path
+        item.display_path = None
+    else:
+        item.parent = restore_destination_id
+        item.restore_parent = None
+        item.name = item_name
+        item.parent_path = item.restore_path
+        item.restore_path = None
+        item.display_path = item.display_restore_path
+        item.display_restore_path = None
+    item.archived = trash_item
+    item.last_updated_time = datetime.utcnow()
 
 
-def get_restore_destination_id(container_code: str, zone: int, restore_path: Ltree) -> UUID:
-    decoded_restore_path = decode_path_from_ltree(restore_path)
-    destination_name = decoded_restore_path
-    destination_path = None
-    decoded_restore_path_labels = decoded_restore_path.split('.')
-    if len(decoded_restore_path_labels) > 1:
-        destination_name = decoded_restore_path_labels[-1]
-        destination_path = '.'.join(decoded_restore_path_labels[:-1])
-    destination_query = db.session.query(ItemModel).filter(
-        ItemModel.container_code == container_code,
-        ItemModel.zone == zone,
-        ItemModel.archived == False,
-        ItemModel.name == destination_name,
+def archive_item_children(children_filter: tuple, old_item_path: str, new_item_path: str, trash_item: bool) -> list:
+    if trash_item:
+        children_values = {
+            'restore_path': ItemModel.parent_path,
+            'parent_path': replace_path_prefix(ItemModel.parent_path, old_item_path, new_item_path),
+            'display_restore_path': ItemModel.display_path,
+            'display_path': replace_display_path_prefix(ItemModel.display_path, old_item_path, new_item_path),
+        }
+    else:
+        children_values = {
+            'restore_path': None,
+            'parent_path': replace_path_prefix(ItemModel.parent_path, old_item_path, new_item_path),
+            'display_restore_path': None,
+            'display_path': replace_display_path_prefix(ItemModel.display_path, old_item_path, new_item_path),
+        }
+    children_query = (
+        update(ItemModel)
+        .where(*children_filter)
+        .values(archived=trash_item, last_updated_time=datetime.utcnow(), **children_values)
+        .returning(ItemModel.id)
+        .execution_options(synchronize_session=False)
     )
-    if destination_path:
-        destination_query = destination_query.filter(
-            ItemModel.parent_path.lquery(expression.cast(encode_path_for_ltree(destination_path), LQUERY))
+    return db.session.execute(children_query).scalars().all()
+
+
+def archive_root_items(root_items: list[ItemModel], trash_item: bool):
+    restore_destination_ids = {}
+    if not trash_item:
+        restore_destinations = get_restore_destinations(root_items)
+        if len(restore_destinations) != len(root_items):
+            raise BadRequestException('Restore destination does not exist')
+        for root_item in root_items:
+            restore_destination_id, restore_path = restore_destinations[root_item.id]
+            restore_destination_ids[root_item.id] = restore_destination_id
+            if str(root_item.restore_path) != restore_path:
+                root_item.restore_path = Ltree(restore_path)
+                root_item.display_restore_path = decode_path_from_ltree(restore_path)
+    lock_archive_locations(root_items, trash_item)
+    for _ in range(ConfigClass.ITEM_NAME_CONFLICT_RETRIES):
+        try:
+            with db.session.begin_nested():
+                available_names = get_available_names(root_items, trash_item)
+                for root_item in root_items:
+                    archive_item(
+                        root_item,
+                        trash_item,
+                        available_names[root_item.id],
+                        restore_destination_ids.get(root_item.id),
+                    )
+            return
+        except IntegrityError:
+            continue
+    raise DuplicateRecordException('Item name conflicts could not be resolved')
+
+
+def archive_items(root_items: list[ItemModel], trash_item: bool) -> list[UUID]:
+    folder_items = [root_item for root_item in root_items if root_item.type == 'folder']
+    children_filters = {root_item.id: get_item_children_filter(root_item) for root_item in folder_items}
+    old_root_item_paths = {root_item.id: get_encoded_item_path(root_item) for root_item in folder_items}
+    archive_root_items(root_items, trash_item)
+    children_ids = []
+    for root_item in folder_items:
+        children_ids += archive_item_children(
+            children_filters[root_item.id],
+            old_root_item_paths[root_item.id],
+            get_encoded_item_path(root_item),
+            trash_item,
         )
-    destination = destination_query.first()
-    if destination:
-        return destination.id
-
-
-def archive_item(item: ItemModel, trash_item: bool, parent: bool):
-    if item.archived != trash_item:
-        if trash_item:
-            if parent:
-                item.name = get_available_file_name(item.container_code, item.zone, item.name, None, True)
-                item.parent = None
-            item.restore_path = item.parent_path
-        else:
-            if parent:
-                item_file_name = get_available_file_name(item.container_code, item.zone, item.name, item.restore_path, False)
-                restore_destination_id = get_restore_destination_id(item.container_code, item.zone, item.restore_path)
-                if not restore_destination_id:
-                    raise BadRequestException('Restore destination does not exist')
-                item.parent = restore_destination_id
-                item.name = item_file_name
-            item.parent_path = item.restore_path
-            item.restore_path = None
-        item.archived = trash_item
-        item.last_updated_time = datetime.utcnow()
+    return children_ids
+
+
+def validate_archive_root_items(root_items: list[ItemModel]):
+    folder_paths = {
+        (root_item.container_code, root_item.zone, root_item.archived, get_encoded_item_path(root_item))
+        for root_item in root_items
+        if root_item.type == 'folder'
+    }
+    for root_item in root_items:
+        if root_item.type == 'name_folder':
+            raise BadRequestException('Name folders cannot be archived or restored')
+        labels = str(root_item.parent_path).split('.') if root_item.parent_path else []
+        for depth in range(1, len(labels) + 1):
+            location = (root_item.container_code, root_item.zone, root_item.archived, '.'.join(labels[:depth]))
+            if location in folder_paths:
+                raise BadRequestException('Items cannot be archived or restored together with their parent folder')
 
 
 def archive_item_by_id(params: PATCHItem, api_response: APIResponse):
-    root_item_query = (
-        db.session.query(ItemModel, StorageModel, ExtendedModel)
-        .join(StorageModel, ExtendedModel)
-        .filter(ItemModel.id == params.id)
-    )
-    root_item_result = root_item_query.first()
-    if not root_item_result:
+    root_item = db.session.query(ItemModel).filter_by(id=params.id).first()
+    if not root_item:
         raise EntityNotFoundException()
-    if root_item_result[0].type == 'name_folder':
-        raise BadRequestException('Name folders cannot be archived or restored')
-    children_result = []
-    if root_item_result[0].type == 'folder':
-        children_result = get_item_children(root_item_result[0])
-    all_items = []
-    children_checkpoint = db.session.begin_nested()
-    try:
-        archive_item(root_item_result[0], params.archived, True)
-        all_items.append(root_item_result)
-        for child in children_result:
-            archive_item(child[0], params.archived, False)
-            all_items.append(child)
-        if params.archived:
-            move_item(root_item_result[0], None)
-    except BadRequestException:
-        raise
-    if params.archived:
-        archived_items = {str(item[0].id): item[0].to_dict() for item in all_items}
-        children_checkpoint.rollback()
-        for item in all_items:
-            item_id = str(item[0].id)
-            db.session.execute(update(ItemModel).where(ItemModel.id == item[0].id).values(
-                parent_path=Ltree(f'{encode_path_for_ltree(archived_items[item_id]["parent_path"])}')
-                if archived_items[item_id]['parent_path'] else None,
-                archived=archived_items[item_id]['archived'],
-                name=archived_items[item_id]['name'],
-                parent=archived_items[item_id]['parent'],
-                restore_path=Ltree(f'{encode_path_for_ltree(archived_items[item_id]["restore_path"])}')
-                if archived_items[item_id]['restore_path'] else None,
-                last_updated_time=archived_items[item_id]['last_updated_time']
-            ))
+    validate_archive_root_items([root_item])
+    children_ids = []
+    if root_item.archived != params.archived:
+        children_ids = archive_items([root_item], params.archived)
+        db.session.commit()
+        invalidate_items([params.id, *children_ids])
+    elif root_item.type == 'folder':
+        children_query = select(ItemModel.id).where(*get_item_children_filter(root_item))
+        children_ids = db.session.execute(children_query).scalars().all()
+    result_ids = [params.id] if params.summary else [params.id] + children_ids
+    api_response.result = get_item_dicts_in_order(result_ids)
+    api_response.total = 1 + len(children_ids)
+
+
+def archive_items_by_ids(ids: list[UUID], params: PATCHItems, api_response: APIResponse):
+    root_items = get_root_items(ids)
+    validate_archive_root_items(root_items)
+    root_items = [root_item for root_item in root_items if root_item.archived != params.archived]
+    children_ids = archive_items(root_items, params.archived) if root_items else []
     db.session.commit()
-    results = []
-    for item in all_items:
-        db.session.refresh(item[0])
-        results.append(combine_item_tables(item))
-    api_response.result = results
-    api_response.total = len(results)
+    invalidate_items([*ids, *children_ids])
+    api_response.result = get_item_dicts_in_order(ids)
+    api_response.total = len(ids) + len(children_ids)
 
 
-def delete_item_by_id(id: UUID, api_response: APIResponse):
-    root_item_query = (
-        db.session.query(ItemModel, StorageModel, ExtendedModel)
-        .join(StorageModel, ExtendedModel)
-        .filter(ItemModel.id == id)
-    )
-    root_item_result = root_item_query.first()
-    if not root_item_result:
+def get_items_subtree_filter(root_items: list[ItemModel]) -> expression.ColumnElement:
+    subtree_filters = [ItemModel.id.in_([root_item.id for root_item in root_items])]
+    for root_item in root_items:
+        if root_item.type == 'folder':
+            subtree_filters.append(and_(*get_item_children_filter(root_item)))
+    return or_(*subtree_filters)
+
+
+def get_root_items(ids: list[UUID]) -> list[ItemModel]:
+    root_items = db.session.query(ItemModel).filter(ItemModel.id.in_(ids)).all()
+    if len(root_items) != len(set(ids)):
         raise EntityNotFoundException()
-    if root_item_result[0].type == 'folder':
-        children_result = get_item_children(root_item_result[0])
-        for child in children_result:
-            for row in child:
-                db.session.delete(row)
-    for row in root_item_result:
-        db.session.delete(row)
+    return root_items
+
+
+def delete_items(item_ids: Select) -> list[UUID]:
+    subtree = item_ids.cte('subtree')
+    subtree_ids = select(subtree.c.id)
+    delete_query = delete(ItemModel).where(ItemModel.id.in_(subtree_ids))
+    for model in [StorageModel, ExtendedModel, ItemsCollectionsModel]:
+        delete_query = delete_query.add_cte(
+            delete(model).where(model.item_id.in_(subtree_ids)).cte(f'delete_{model.__tablename__}')
+        )
+    delete_query = delete_query.returning(ItemModel.id).execution_options(synchronize_session=False)
+    return db.session.execute(delete_query).scalars().all()
+
+
+def delete_item_by_id(id: UUID, api_response: APIResponse):
+    delete_items_by_ids([id], api_response)
+
+
+def delete_items_by_ids(ids: list[UUID], api_response: APIResponse):
+    subtree_filter = get_items_subtree_filter(get_root_items(ids))
+    deleted_ids = delete_items(select(ItemModel.id).where(subtree_filter))
     db.session.commit()
+    invalidate_items(deleted_ids)
     api_response.total = 0
     api_response.num_of_pages = 0
 
 
-def delete_items_by_ids(ids: list[UUID], api_response: APIResponse):
-    for id in ids:
-        delete_item_by_id(id, api_response)
+def delete_items_in_background(job_id: str, subtree_filter: expression.ColumnElement):
+    update_job(job_id, status='running')
+    processed = 0
+    try:
+        with db():
+            while True:
+                chunk_ids = select(ItemModel.id).where(subtree_filter).limit(ConfigClass.DELETE_JOB_CHUNK_SIZE)
+                deleted_ids = delete_items(chunk_ids)
+                db.session.commit()
+                invalidate_items(deleted_ids)
+                processed += len(deleted_ids)
+                update_job(job_id, processed=processed)
+                if len(deleted_ids) < ConfigClass.DELETE_JOB_CHUNK_SIZE:
+                    break
+        update_job(job_id, status='succeeded')
+    except Exception as e:
+        _logger.exception(f'Delete job {job_id} failed')
+        update_job(job_id, status='failed', error_msg=str(e))
+
+
+def create_delete_job(ids: list[UUID], background_tasks: BackgroundTasks, api_response: APIResponse):
+    subtree_filter = get_items_subtree_filter(get_root_items(ids))
+    total = db.session.query(func.count(ItemModel.id)).filter(subtree_filter).scalar()
+    job = create_job(total)
+    background_tasks.add_task(delete_items_in_background, job['id'], subtree_filter)
+    api_response.result = job
+    api_response.total = 1
+    api_response.num_of_pages = 1
+
+
+def get_bequeathed_extra(extra: Column, data: PUTItemsBequeath) -> ColumnElement:
+    empty_object = expression.literal({}, JSONB())
+    bequeathed_extra = func.coalesce(extra, empty_object, type_=JSONB)
+    if data.attribute_template_id and data.attributes:
+        attributes = func.coalesce(extra['attributes'], empty_object, type_=JSONB).op('||', return_type=JSONB)(
+            expression.literal({str(data.attribute_template_id): data.attributes}, JSONB())
+        )
+        bequeathed_extra = func.jsonb_set(
+            bequeathed_extra, expression.literal(['attributes'], ARRAY(Text)), attributes, type_=JSONB
+        )
+    if data.system_tags:
+        system_tags = list(dict.fromkeys(data.system_tags))
+        merged_tags = (
+            func.coalesce(extra['system_tags'], expression.literal([], JSONB()), type_=JSONB)
+            .op('-', return_type=JSONB)(expression.literal(system_tags, ARRAY(Text)))
+            .op('||', return_type=JSONB)(expression.literal(system_tags, JSONB()))
+        )
+        bequeathed_extra = func.jsonb_set(
+            bequeathed_extra, expression.literal(['system_tags'], ARRAY(Text)), merged_tags, type_=JSONB
+        )
+    return bequeathed_extra
 
 
 def bequeath_to_children(id: UUID, data: PUTItemsBequeath, api_response: APIResponse):
+    children_ids = bequeath_to_children_in_bulk(id, data)
+    results = get_item_dicts_in_order(children_ids)
+    api_response.result = results
+    api_response.total = len(results)
+
+
+def bequeath_to_children_in_bulk(id: UUID, data: PUTItemsBequeath) -> list[UUID]:
     if not attributes_match_template(data.attributes, data.attribute_template_id):
         raise BadRequestException('Attributes do not match attribute template')
-    root_item_query = (
-        db.session.query(ItemModel, StorageModel, ExtendedModel)
-        .join(StorageModel, ExtendedModel)
-        .filter(ItemModel.id == id)
-    )
-    root_item_result = root_item_query.first()
-    if not root_item_result:
+    root_item = db.session.query(ItemModel).filter_by(id=id).first()
+    if not root_item:
         raise EntityNotFoundException()
-    if root_item_result[0].type != 'folder':
+    if root_item.type != 'folder':
         raise BadRequestException('Properties can only be bequeathed from folders')
-    children_result = get_item_children(root_item_result[0])
-    results = []
-    for child in children_result:
-        extra = {}
-        if data.attribute_template_id and data.attributes:
-            extra = {'attributes': {str(data.attribute_template_id): data.attributes} if data.attributes else {}}
-        if data.system_tags:
-            extra['system_tags'] = data.system_tags
-        child[2].extra = extra
+    bequeath_query = (
+        update(ExtendedModel)
+        .where(ExtendedModel.item_id == ItemModel.id, *get_item_children_filter(root_item))
+        .values(extra=get_bequeathed_extra(ExtendedModel.extra, data))
+        .returning(ExtendedModel.item_id)
+        .execution_options(synchronize_session=False)
+    )
+    children_ids = db.session.execute(bequeath_query).scalars().all()
     db.session.commit()
-    for child in children_result:
-        db.session.refresh(child[2])
-        results.append(combine_item_tables(child))
-    api_response.result = results
-    api_response.total = len(results)
+    invalidate_items(children_ids)
+    return children_ids
@@ -0,0 +1,55 @@
+# Copyright (C) 2022 Indoc Research
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional
+
+from app.config import ConfigClass
+
+_jobs = OrderedDict()
+_jobs_lock = threading.Lock()
+
+
+def create_job(total: int) -> dict:
+    job = {
+        'id': str(uuid.uuid4()),
+        'status': 'pending',
+        'total': total,
+        'processed': 0,
+        'error_msg': '',
+        'created_time': str(datetime.utcnow()),
+        'last_updated_time': str(datetime.utcnow()),
+    }
+    with _jobs_lock:
+        _jobs[job['id']] = job
+        while len(_jobs) > ConfigClass.MAX_JOBS:
+            _jobs.popitem(last=False)
+        return dict(job)
+
+
+def get_job(id: str) -> Optional[dict]:
+    with _jobs_lock:
+        job = _jobs.get(id)
+        return dict(job) if job else None
+
+
+def update_job(id: str, **fields):
+    with _jobs_lock:
+        job = _jobs.get(id)
+        if job:
+            job.update(fields, last_updated_time=str(datetime.utcnow()))
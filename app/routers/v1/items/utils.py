@@ -13,25 +13,94 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+from fastapi_sqlalchemy import db
+from sqlalchemy import BIGINT
+from sqlalchemy import Column
+from sqlalchemy import String
+from sqlalchemy import func
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Query
+from sqlalchemy.sql import expression
+from sqlalchemy_utils import Ltree
+from sqlalchemy_utils import LtreeType
 
 from app.app_utils import decode_path_from_ltree
+from app.app_utils import encode_label_for_ltree
+from app.config import ConfigClass
+from app.models.sql_extended import ExtendedModel
 from app.models.sql_items import ItemModel
+from app.models.sql_storage import StorageModel
 
+ITEM_INLINE_COLUMNS = ['storage_id', 'location_uri', 'version', 'extended_id', 'extra']
 
-def combine_item_tables(item_result: tuple) -> dict:
-    item_data = item_result[0].to_dict()
-    storage_data = item_result[1].to_dict()
-    storage_data.pop('item_id')
-    extended_data = item_result[2].to_dict()
-    extended_data.pop('item_id')
-    item_data['storage'] = storage_data
-    item_data['extended'] = extended_data
+ITEM_READ_COLUMNS = [
+    *[column for column in ItemModel.__table__.columns if column.name not in ITEM_INLINE_COLUMNS],
+    StorageModel.id.label('storage_id'),
+    StorageModel.location_uri,
+    StorageModel.version,
+    ExtendedModel.id.label('extended_id'),
+    ExtendedModel.extra,
+]
+
+ITEM_INLINE_READ_COLUMNS = list(ItemModel.__table__.columns)
+
+
+def get_item_read_query() -> Query:
+    if ConfigClass.ITEM_INLINE_READS:
+        return db.session.query(*ITEM_INLINE_READ_COLUMNS).select_from(ItemModel)
+    return (
+        db.session.query(*ITEM_READ_COLUMNS)
+        .select_from(ItemModel)
+        .join(StorageModel, StorageModel.item_id == ItemModel.id)
+        .join(ExtendedModel, ExtendedModel.item_id == ItemModel.id)
+    )
+
+
+def get_item_extra_column() -> Column:
+    return ItemModel.extra if ConfigClass.ITEM_INLINE_READS else ExtendedModel.extra
+
+
+def item_row_to_dict(row: Row) -> dict:
+    item_data = ItemModel.row_to_dict(row)
+    item_data['storage'] = {'id': str(row.storage_id), 'location_uri': row.location_uri, 'version': row.version}
+    item_data['extended'] = {'id': str(row.extended_id), 'extra': row.extra}
     return item_data
 
 
-def get_path_depth(item: ItemModel) -> int:
-    return len(decode_path_from_ltree(item.parent_path).split('.'))
+def get_item_keyset_columns(sorting: str, order: str) -> list[tuple[Column, bool]]:
+    sort_column = ItemModel.__table__.columns[sorting]
+    descending = order == 'desc'
+    return [(ItemModel.__table__.c.type, False), (sort_column, descending), (ItemModel.__table__.c.id, descending)]
+
+
+def get_encoded_item_path(item: ItemModel) -> str:
+    encoded_name = encode_label_for_ltree(item.name)
+    return f'{item.parent_path}.{encoded_name}' if item.parent_path else encoded_name
+
+
+def replace_path_prefix(path_column: LtreeType, old_prefix: str, new_prefix: str) -> expression.ColumnElement:
+    old_prefix_depth = len(old_prefix.split('.'))
+    new_prefix_value = expression.literal(Ltree(new_prefix), LtreeType())
+    return expression.case(
+        (func.nlevel(path_column) == old_prefix_depth, new_prefix_value),
+        else_=new_prefix_value + func.subpath(path_column, old_prefix_depth, type_=LtreeType()),
+    )
+
+
+def replace_display_path_prefix(
+    display_path_column: Column, old_prefix: str, new_prefix: str
+) -> expression.ColumnElement:
+    old_display_prefix = decode_path_from_ltree(old_prefix)
+    new_display_prefix = decode_path_from_ltree(new_prefix)
+    return expression.literal(new_display_prefix) + func.substr(display_path_column, len(old_display_prefix) + 1)
 
 
-def get_relative_path_depth(parent: ItemModel, child: ItemModel) -> int:
-    return get_path_depth(child) - get_path_depth(parent)
+def get_suffixed_name(name_column: Column, suffix_index: Column) -> expression.ColumnElement:
+    stem = func.split_part(name_column, '.', 1, type_=String())
+    extension = func.substr(name_column, func.length(stem) + 1, type_=String())
+    timestamp = expression.cast(expression.cast(func.round(func.extract('epoch', func.now())), BIGINT()), String())
+    return expression.case(
+        (suffix_index == 0, name_column),
+        (suffix_index == 1, stem + '_' + timestamp + extension),
+        else_=stem + '_' + timestamp + '_' + expression.cast(suffix_index - 1, String()) + extension,
+    )
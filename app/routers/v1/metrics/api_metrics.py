@@ -0,0 +1,51 @@
+# Copyright (C) 2022 Indoc Research
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from common import LoggerFactory
+from fastapi import APIRouter
+from fastapi_sqlalchemy import db
+from fastapi_utils.cbv import cbv
+
+from app.models.base_models import EAPIResponseCode
+from app.models.models_metrics import GETItemCacheMetricsResponse
+from app.models.models_metrics import GETPoolMetricsResponse
+from app.routers.router_utils import set_api_response_error
+from app.routers.v1.items.cache import get_item_cache_stats
+
+router = APIRouter()
+_logger = LoggerFactory('api_metrics').get_logger()
+
+
+@cbv(router)
+class APIMetrics:
+    @router.get('/pool/', response_model=GETPoolMetricsResponse, summary='Get database connection pool metrics')
+    def get_pool_metrics(self):
+        try:
+            api_response = GETPoolMetricsResponse()
+            api_response.result = db.session.get_bind().pool.status_dict()
+        except Exception:
+            set_api_response_error(api_response, 'Failed to get pool metrics', EAPIResponseCode.internal_error, _logger)
+        return api_response.json_response()
+
+    @router.get('/item-cache/', response_model=GETItemCacheMetricsResponse, summary='Get item cache metrics')
+    def get_item_cache_metrics(self):
+        try:
+            api_response = GETItemCacheMetricsResponse()
+            api_response.result = get_item_cache_stats()
+        except Exception:
+            set_api_response_error(
+                api_response, 'Failed to get item cache metrics', EAPIResponseCode.internal_error, _logger
+            )
+        return api_response.json_response()
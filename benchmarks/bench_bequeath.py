@@ -0,0 +1,61 @@
+# Copyright (C) 2022 Indoc Research
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Compare the set-based bulk bequeath with loading, updating and serialising every descendant.
+
+Usage: python -m benchmarks.bench_bequeath [descendants ...]
+"""
+
+import sys
+
+from fastapi_sqlalchemy import db
+
+from app.models.base_models import APIResponse
+from app.models.models_items import PUTItemsBequeath
+from app.routers.v1.items.crud import bequeath_to_children
+from app.routers.v1.items.crud import bequeath_to_children_in_bulk
+from benchmarks.utils import generate_container_code
+from benchmarks.utils import print_table
+from benchmarks.utils import remove_container
+from benchmarks.utils import seed_folder
+from benchmarks.utils import timer
+
+DESCENDANTS = [1000, 10000, 50000]
+
+
+def run(descendants: int) -> list:
+    container_code = generate_container_code('bench_bequeath')
+    data = PUTItemsBequeath(system_tags=['copied-to-core'])
+    results = {}
+    with db():
+        root_id = seed_folder(container_code, descendants)
+        try:
+            with timer(results, 'legacy'):
+                bequeath_to_children(root_id, data, APIResponse())
+            db.session.expunge_all()
+            with timer(results, 'bulk'):
+                bequeath_to_children_in_bulk(root_id, data)
+        finally:
+            remove_container(container_code)
+    return [descendants, f'{results["legacy"]:.3f}', f'{results["bulk"]:.3f}']
+
+
+def main():
+    sizes = [int(size) for size in sys.argv[1:]] or DESCENDANTS
+    print_table(['descendants', 'legacy_s', 'bulk_s'], [run(size) for size in sizes])
+
+
+if __name__ == '__main__':
+    main()
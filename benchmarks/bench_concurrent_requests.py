@@ -0,0 +1,155 @@
+# Copyright (C) 2022 Indoc Research
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Measure request latency under mixed concurrent traffic for event loop and threadpool endpoints.
+
+The legacy app declares its endpoints with `async def` while calling the synchronous crud functions, as the item
+endpoints did before; the current app runs them in the threadpool. Both are served by uvicorn in a subprocess while
+client threads issue slow recursive searches alongside fast single item lookups.
+
+Usage: python -m benchmarks.bench_concurrent_requests [seconds]
+"""
+
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+import requests
+from fastapi import Depends
+from fastapi import FastAPI
+from fastapi_sqlalchemy import DBSessionMiddleware
+from fastapi_sqlalchemy import db
+
+from app.config import ConfigClass
+from app.models.models_items import GETItem
+from app.models.models_items import GETItemResponse
+from app.models.models_items import GETItemsByLocation
+from app.routers.v1.items.crud import get_item_by_id
+from app.routers.v1.items.crud import get_items_by_location
+from benchmarks.utils import generate_container_code
+from benchmarks.utils import print_table
+from benchmarks.utils import remove_container
+from benchmarks.utils import seed_folder
+
+DESCENDANTS = 200000
+DURATION = 20
+SLOW_CLIENTS = 4
+FAST_CLIENTS = 16
+
+legacy_app = FastAPI()
+legacy_app.add_middleware(DBSessionMiddleware, db_url=ConfigClass.SQLALCHEMY_DATABASE_URI)
+
+
+@legacy_app.get('/v1/item/{id}/')
+async def legacy_get_item(params: GETItem = Depends(GETItem)):
+    api_response = GETItemResponse()
+    get_item_by_id(params, api_response)
+    return api_response.json_response()
+
+
+@legacy_app.get('/v1/items/search/')
+async def legacy_get_items_by_location(params: GETItemsByLocation = Depends(GETItemsByLocation)):
+    api_response = GETItemResponse()
+    get_items_by_location(params, api_response)
+    return api_response.json_response()
+
+
+def start_server(app_path: str, port: int) -> subprocess.Popen:
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', app_path, '--port', str(port), '--log-level', 'warning'],
+    )
+    for _ in range(100):
+        try:
+            requests.get(f'http://127.0.0.1:{port}/docs')
+            return server
+        except requests.ConnectionError:
+            time.sleep(0.1)
+    server.kill()
+    raise RuntimeError(f'Server for {app_path} did not start')
+
+
+def run_client(url: str, params: dict, deadline: float, latencies: list):
+    with requests.Session() as session:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            session.get(url, params=params).raise_for_status()
+            latencies.append((time.perf_counter() - start) * 1000)
+
+
+def percentile(latencies: list, percent: int) -> float:
+    return statistics.quantiles(latencies, n=100)[percent - 1]
+
+
+def run(app_path: str, port: int, container_code: str, item_id: str, duration: int) -> dict:
+    server = start_server(app_path, port)
+    try:
+        search_params = {'container_code': container_code, 'parent_path': 'benchmark.root', 'recursive': True}
+        latencies = {'slow': [], 'fast': []}
+        deadline = time.perf_counter() + duration
+        clients = [
+            threading.Thread(
+                target=run_client,
+                args=(f'http://127.0.0.1:{port}/v1/items/search/', search_params, deadline, latencies['slow']),
+            )
+            for _ in range(SLOW_CLIENTS)
+        ] + [
+            threading.Thread(
+                target=run_client, args=(f'http://127.0.0.1:{port}/v1/item/{item_id}/', {}, deadline, latencies['fast'])
+            )
+            for _ in range(FAST_CLIENTS)
+        ]
+        for client in clients:
+            client.start()
+        for client in clients:
+            client.join()
+        return latencies
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    duration = int(sys.argv[1]) if len(sys.argv) > 1 else DURATION
+    container_code = generate_container_code('bench_concurrent')
+    rows = []
+    with db():
+        root_id = seed_folder(container_code, DESCENDANTS)
+        db.session.execute('ANALYZE')
+        db.session.commit()
+        try:
+            for label, app_path, port in [
+                ('async_def', 'benchmarks.bench_concurrent_requests:legacy_app', 5081),
+                ('threadpool', 'app.main:app', 5082),
+            ]:
+                latencies = run(app_path, port, container_code, str(root_id), duration)
+                for kind in ['fast', 'slow']:
+                    rows.append(
+                        [
+                            label,
+                            kind,
+                            len(latencies[kind]),
+                            f'{percentile(latencies[kind], 50):.1f}',
+                            f'{percentile(latencies[kind], 99):.1f}',
+                        ]
+                    )
+        finally:
+            remove_container(container_code)
+    print_table(['endpoints', 'requests', 'count', 'p50_ms', 'p99_ms'], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+# Copyright (C) 2022 Indoc Research
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Compare the batched POST /v1/items/batch/ path with creating the same items one at a time.
+
+Usage: python -m benchmarks.bench_create_items [items ...]
+"""
+
+import sys
+import uuid
+
+from fastapi_sqlalchemy import db
+
+from app.models.models_items import POSTItem
+from app.models.models_items import POSTItems
+from app.models.models_items import POSTItemsResponse
+from app.routers.v1.items.crud import create_item
+from app.routers.v1.items.crud import create_items
+from benchmarks.utils import generate_container_code
+from benchmarks.utils import print_table
+from benchmarks.utils import remove_container
+from benchmarks.utils import timer
+
+ITEMS = [100, 1000, 5000]
+
+
+def build_payload(container_code: str, items: int) -> POSTItems:
+    return POSTItems(
+        items=[
+            POSTItem(
+                id=uuid.uuid4(),
+                parent=uuid.uuid4(),
+                parent_path='benchmark.root',
+                type='file',
+                name=f'file_{i}.txt',
+                size=100,
+                owner='benchmark',
+                container_code=container_code,
+                location_uri='',
+                version='',
+            )
+            for i in range(items)
+        ]
+    )
+
+
+def legacy_create_items(data: POSTItems):
+    for item in data.items:
+        create_item(item)
+
+
+def run(items: int) -> list:
+    results = {}
+    with db():
+        for key, create_func in [
+            ('legacy', legacy_create_items),
+            ('batched', lambda data: create_items(data, POSTItemsResponse())),
+        ]:
+            container_code = generate_container_code('bench_create')
+            payload = build_payload(container_code, items)
+            try:
+                with timer(results, key):
+                    create_func(payload)
+            finally:
+                remove_container(container_code)
+    return [items, f'{results["legacy"]:.3f}', f'{results["batched"]:.3f}']
+
+
+def main():
+    sizes = [int(size) for size in sys.argv[1:]] or ITEMS
+    print_table(['items', 'legacy_s', 'batched_s'], [run(size) for size in sizes])
+
+
+if __name__ == '__main__':
+    main()
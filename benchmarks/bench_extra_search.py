@@ -0,0 +1,158 @@
+# Copyright (C) 2022 Indoc Research
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Compare the GIN backed tag/attribute search with filtering a folder listing in Python.
+
+Usage: python -m benchmarks.bench_extra_search [items ...]
+"""
+
+import random
+import statistics
+import sys
+import uuid
+
+from fastapi_sqlalchemy import db
+
+from app.models.models_items import GETItemsByLocation
+from app.models.sql_extended import ExtendedModel
+from app.models.sql_items import ItemModel
+from app.routers.router_utils import Explain
+from app.routers.v1.items.crud import get_extra_filter
+from app.routers.v1.items.crud import get_item_keyset_columns
+from app.routers.v1.items.crud import get_items_by_location_query
+from benchmarks.utils import INSERT_CHUNK_SIZE
+from benchmarks.utils import build_item_row
+from benchmarks.utils import generate_container_code
+from benchmarks.utils import insert_items
+from benchmarks.utils import print_table
+from benchmarks.utils import remove_container
+from benchmarks.utils import timer
+
+ITEMS = [1000000]
+TAGS = [f'tag_{i}' for i in range(1000)]
+SYSTEM_TAGS = ['copied-to-core', 'processed', 'archived-copy']
+TEMPLATE_ID = str(uuid.UUID(int=0))
+ATTRIBUTE_RATIO = 0.1
+REPEATS = 5
+
+
+def build_extra() -> dict:
+    extra = {
+        'tags': random.sample(TAGS, random.randint(0, 3)),
+        'system_tags': random.sample(SYSTEM_TAGS, random.randint(0, 1)),
+        'attributes': {},
+    }
+    if random.random() < ATTRIBUTE_RATIO:
+        extra['attributes'] = {TEMPLATE_ID: {'species': random.choice(['mouse', 'rat', 'human'])}}
+    return extra
+
+
+def seed(container_code: str, items: int):
+    name_folder = build_item_row(container_code, 'name_folder', 'benchmark')
+    insert_items([name_folder])
+    for i in range(0, items, INSERT_CHUNK_SIZE):
+        rows = [
+            build_item_row(container_code, 'file', f'file_{j}.txt', 'benchmark', name_folder['id'])
+            for j in range(i, min(i + INSERT_CHUNK_SIZE, items))
+        ]
+        insert_items(rows, [build_extra() for _ in rows])
+    for model in [ItemModel, ExtendedModel]:
+        db.session.execute(f'ANALYZE {model.__table__.fullname}')
+    db.session.commit()
+
+
+def matches(extra: dict, extra_filter: dict) -> bool:
+    if not set(extra_filter.get('tags', [])).issubset(extra['tags']):
+        return False
+    if not set(extra_filter.get('system_tags', [])).issubset(extra['system_tags']):
+        return False
+    for template_id, attributes in extra_filter.get('attributes', {}).items():
+        template_attributes = extra['attributes'].get(template_id)
+        if template_attributes is None or any(template_attributes.get(k) != v for k, v in attributes.items()):
+            return False
+    return True
+
+
+def legacy_search(params: GETItemsByLocation, keyset_columns: list, extra_filter: dict) -> int:
+    item_query = get_items_by_location_query(params, keyset_columns)
+    return sum(1 for row in item_query.yield_per(INSERT_CHUNK_SIZE) if matches(row.extra, extra_filter))
+
+
+def indexed_search(params: GETItemsByLocation, keyset_columns: list, extra_filter: dict) -> int:
+    return get_items_by_location_query(params, keyset_columns, extra_filter).count()
+
+
+def get_index_names(plan: dict) -> set:
+    index_names = {plan['Index Name']} if 'Index Name' in plan else set()
+    for child_plan in plan.get('Plans', []):
+        index_names |= get_index_names(child_plan)
+    return index_names
+
+
+def uses_index(params: GETItemsByLocation, keyset_columns: list, extra_filter: dict) -> bool:
+    item_query = get_items_by_location_query(params, keyset_columns, extra_filter)
+    plan = db.session.execute(Explain(item_query.statement)).scalar()
+    return 'extended_extra_gin' in get_index_names(plan[0]['Plan'])
+
+
+def run(items: int) -> list:
+    container_code = generate_container_code('bench_extra')
+    rows = []
+    with db():
+        seed(container_code, items)
+        try:
+            keyset_columns = get_item_keyset_columns('created_time', 'desc')
+            for label, tags, system_tags, attributes, template_id in [
+                ('tag', [TAGS[0]], None, None, None),
+                ('system_tag', None, [SYSTEM_TAGS[0]], None, None),
+                ('attribute', None, None, ['species:rat'], TEMPLATE_ID),
+            ]:
+                params = GETItemsByLocation(
+                    container_code=container_code,
+                    recursive=True,
+                    parent_path='benchmark',
+                    attribute_template_id=template_id,
+                )
+                extra_filter = get_extra_filter(params, tags, system_tags, attributes)
+                results = {}
+                timings = {'legacy': [], 'indexed': []}
+                for _ in range(REPEATS):
+                    for key, search_func in [('legacy', legacy_search), ('indexed', indexed_search)]:
+                        with timer(results, key):
+                            count = search_func(params, keyset_columns, extra_filter)
+                        timings[key].append(results[key])
+                rows.append(
+                    [
+                        items,
+                        label,
+                        count,
+                        f'{statistics.median(timings["legacy"]):.3f}',
+                        f'{statistics.median(timings["indexed"]):.3f}',
+                        uses_index(params, keyset_columns, extra_filter),
+                    ]
+                )
+        finally:
+            remove_container(container_code)
+    return rows
+
+
+def main():
+    sizes = [int(size) for size in sys.argv[1:]] or ITEMS
+    rows = [row for size in sizes for row in run(size)]
+    print_table(['items', 'filter', 'matches', 'legacy_s', 'indexed_s', 'gin_index'], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+# Copyright (C) 2022 Indoc Research
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Compare item searches and creates with the joined storage/extended layout and the inline items columns.
+
+Usage: python -m benchmarks.bench_inline_items [descendants ...]
+"""
+
+import statistics
+import sys
+import time
+import uuid
+
+from fastapi_sqlalchemy import db
+
+from app.config import ConfigClass
+from app.models.models_items import GETItemsByLocation
+from app.models.models_items import POSTItem
+from app.models.models_items import POSTItems
+from app.models.models_items import POSTItemsResponse
+from app.routers.v1.items.crud import create_items
+from app.routers.v1.items.crud import get_extra_filter
+from app.routers.v1.items.crud import get_items_by_location_query
+from app.routers.v1.items.utils import get_item_keyset_columns
+from app.routers.v1.items.utils import item_row_to_dict
+from benchmarks.utils import generate_container_code
+from benchmarks.utils import print_table
+from benchmarks.utils import remove_container
+from benchmarks.utils import seed_folder
+from benchmarks.utils import timer
+
+DESCENDANTS = [10000, 100000]
+PAGE_SIZE = 1000
+CREATE_ITEMS = 5000
+REPEATS = 10
+SYNC_TRIGGERS = [
+    ('storage', 'storage_sync_items_insert'),
+    ('storage', 'storage_sync_items_update'),
+    ('extended', 'extended_sync_items_insert'),
+    ('extended', 'extended_sync_items_update'),
+]
+
+
+def search_page(container_code: str, tags: list[str] = None) -> list[dict]:
+    params = GETItemsByLocation(container_code=container_code, recursive=True, parent_path='benchmark')
+    keyset_columns = get_item_keyset_columns(params.sorting, params.order)
+    item_query = get_items_by_location_query(params, keyset_columns, get_extra_filter(params, tags))
+    return [item_row_to_dict(item) for item in item_query.limit(PAGE_SIZE).all()]
+
+
+def measure_search(container_code: str, tags: list[str] = None) -> str:
+    search_page(container_code, tags)
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        search_page(container_code, tags)
+        timings.append(time.perf_counter() - start)
+    return f'{statistics.median(timings) * 1000:.1f}'
+
+
+def set_sync_triggers(enabled: bool):
+    for table, trigger in SYNC_TRIGGERS:
+        action = 'ENABLE' if enabled else 'DISABLE'
+        db.session.execute(f'ALTER TABLE {ConfigClass.METADATA_SCHEMA}.{table} {action} TRIGGER {trigger}')
+    db.session.commit()
+
+
+def measure_create(sync_triggers: bool) -> str:
+    container_code = generate_container_code('bench_inline_create')
+    payload = POSTItems(
+        items=[
+            POSTItem(
+                id=uuid.uuid4(),
+                parent=uuid.uuid4(),
+                parent_path='benchmark.root',
+                type='file',
+                name=f'file_{i}.txt',
+                size=100,
+                owner='benchmark',
+                container_code=container_code,
+                location_uri='',
+                version='',
+                tags=['benchmark'],
+            )
+            for i in range(CREATE_ITEMS)
+        ]
+    )
+    results = {}
+    set_sync_triggers(sync_triggers)
+    try:
+        with timer(results, 'create'):
+            create_items(payload, POSTItemsResponse())
+    finally:
+        set_sync_triggers(True)
+        remove_container(container_code)
+    return f'{CREATE_ITEMS / results["create"]:.0f}'
+
+
+def run(descendants: int) -> list[list]:
+    container_code = generate_container_code('bench_inline')
+    rows = []
+    with db():
+        seed_folder(container_code, descendants)
+        try:
+            for layout, inline_reads in [('joined', False), ('inline', True)]:
+                ConfigClass.ITEM_INLINE_READS = inline_reads
+                rows.append(
+                    [
+                        descendants,
+                        layout,
+                        measure_search(container_code),
+                        measure_search(container_code, ['benchmark']),
+                        measure_create(sync_triggers=inline_reads),
+                    ]
+                )
+        finally:
+            ConfigClass.ITEM_INLINE_READS = False
+            remove_container(container_code)
+    return rows
+
+
+def main():
+    sizes = [int(size) for size in sys.argv[1:]] or DESCENDANTS
+    rows = [row for size in sizes for row in run(size)]
+    print_table(['descendants', 'layout', 'search_ms', 'tag_search_ms', 'create_items_per_s'], rows)
+
+
+if __name__ == '__main__':
+    main()
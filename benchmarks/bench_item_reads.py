@@ -0,0 +1,101 @@
+# Copyright (C) 2022 Indoc Research
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Compare the column projection item read path with full ORM entity joins.
+
+Usage: python -m benchmarks.bench_item_reads [page_size ...]
+"""
+
+import statistics
+import sys
+import time
+import tracemalloc
+
+from fastapi_sqlalchemy import db
+
+from app.models.sql_extended import ExtendedModel
+from app.models.sql_items import ItemModel
+from app.models.sql_storage import StorageModel
+from app.routers.v1.items.utils import combine_item_tables
+from app.routers.v1.items.utils import get_item_read_query
+from app.routers.v1.items.utils import item_row_to_dict
+from benchmarks.utils import generate_container_code
+from benchmarks.utils import print_table
+from benchmarks.utils import remove_container
+from benchmarks.utils import seed_folder
+
+PAGE_SIZES = [100, 1000]
+REPEATS = 20
+
+
+def legacy_read_page(container_code: str, page_size: int) -> list[dict]:
+    item_query = (
+        db.session.query(ItemModel, StorageModel, ExtendedModel)
+        .join(StorageModel, ExtendedModel)
+        .filter(ItemModel.container_code == container_code)
+        .order_by(ItemModel.id)
+        .limit(page_size)
+    )
+    results = [combine_item_tables(item) for item in item_query.all()]
+    # a request ends with the session being closed, which empties the identity map
+    db.session.expunge_all()
+    return results
+
+
+def projection_read_page(container_code: str, page_size: int) -> list[dict]:
+    item_query = (
+        get_item_read_query()
+        .filter(ItemModel.container_code == container_code)
+        .order_by(ItemModel.id)
+        .limit(page_size)
+    )
+    return [item_row_to_dict(item) for item in item_query.all()]
+
+
+def measure(read_func, container_code: str, page_size: int) -> list:
+    read_func(container_code, page_size)
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        read_func(container_code, page_size)
+        timings.append(time.perf_counter() - start)
+    tracemalloc.start()
+    read_func(container_code, page_size)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return [f'{statistics.median(timings) * 1000:.1f}', f'{peak / 1024:.0f}']
+
+
+def run(page_size: int) -> list[list]:
+    container_code = generate_container_code('bench_reads')
+    with db():
+        seed_folder(container_code, page_size)
+        try:
+            return [
+                [page_size, key, *measure(read_func, container_code, page_size)]
+                for key, read_func in [('legacy', legacy_read_page), ('projection', projection_read_page)]
+            ]
+        finally:
+            remove_container(container_code)
+
+
+def main():
+    sizes = [int(size) for size in sys.argv[1:]] or PAGE_SIZES
+    rows = [row for size in sizes for row in run(size)]
+    print_table(['page_size', 'read_path', 'median_ms', 'peak_alloc_kib'], rows)
+
+
+if __name__ == '__main__':
+    main()
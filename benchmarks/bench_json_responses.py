@@ -0,0 +1,83 @@
+# Copyright (C) 2022 Indoc Research
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Compare the pydantic and json based response serialization with the orjson fast path.
+
+Usage: python -m benchmarks.bench_json_responses [page_size ...]
+"""
+
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime
+
+from app.models.models_items import GETItemResponse
+from benchmarks.utils import print_table
+
+PAGE_SIZES = [25, 100, 1000, 10000]
+REPEATS = 20
+
+
+def build_item_dict(index: int) -> dict:
+    return {
+        'id': str(uuid.uuid4()),
+        'parent': str(uuid.uuid4()),
+        'parent_path': f'user.projects.data_{index % 100}',
+        'restore_path': None,
+        'archived': False,
+        'type': 'file',
+        'zone': 0,
+        'name': f'file_{index}.txt',
+        'size': 100,
+        'owner': 'benchmark',
+        'container_code': 'benchmark',
+        'container_type': 'project',
+        'created_time': str(datetime.utcnow()),
+        'last_updated_time': str(datetime.utcnow()),
+        'storage': {'id': str(uuid.uuid4()), 'location_uri': f'minio://core/file_{index}.txt', 'version': '1'},
+        'extended': {
+            'id': str(uuid.uuid4()),
+            'extra': {'tags': ['raw', 'dicom'], 'system_tags': ['copied-to-core'], 'attributes': {}},
+        },
+    }
+
+
+def median_ms(func) -> float:
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def run(page_size: int) -> list:
+    api_response = GETItemResponse()
+    api_response.result = [build_item_dict(i) for i in range(page_size)]
+    api_response.total = page_size
+    default_ms = median_ms(api_response.json_response)
+    fast_ms = median_ms(lambda: api_response.json_response(fast=True))
+    body_kib = len(api_response.json_response(fast=True).body) / 1024
+    return [page_size, f'{body_kib:.0f}', f'{default_ms:.2f}', f'{fast_ms:.2f}', f'{default_ms / fast_ms:.1f}x']
+
+
+def main():
+    sizes = [int(size) for size in sys.argv[1:]] or PAGE_SIZES
+    print_table(['page_size', 'body_kib', 'default_ms', 'fast_ms', 'speedup'], [run(size) for size in sizes])
+
+
+if __name__ == '__main__':
+    main()
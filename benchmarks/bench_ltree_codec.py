@@ -0,0 +1,153 @@
+# Copyright (C) 2022 Indoc Research
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Measure the per-row cost of the ltree label codec when serializing pages of items.
+
+Usage: python -m benchmarks.bench_ltree_codec [page_size ...]
+"""
+
+import base64
+import math
+import re
+import sys
+import time
+import uuid
+from datetime import datetime
+from unittest import mock
+
+from sqlalchemy_utils import Ltree
+
+from app import app_utils
+from app.models.sql_items import ItemModel
+from benchmarks.utils import print_table
+
+PAGE_SIZES = [1000, 10000]
+FOLDERS = 100
+REPEATS = 5
+
+
+def legacy_encode_label_for_ltree(raw_string: str) -> str:
+    base32_string = str(base64.b32encode(raw_string.encode('utf-8')), 'utf-8')
+    return re.sub('=', '', base32_string)
+
+
+def legacy_encode_path_for_ltree(raw_path: str) -> str:
+    labels = raw_path.split('.')
+    path = ''
+    for label in labels:
+        path += f'{legacy_encode_label_for_ltree(label)}.'
+    return path[:-1]
+
+
+def legacy_decode_label_from_ltree(encoded_string: str) -> str:
+    missing_padding = math.ceil(len(encoded_string) / 8) * 8 - len(encoded_string)
+    if missing_padding:
+        encoded_string += '=' * missing_padding
+    utf8_string = base64.b32decode(encoded_string.encode('utf-8')).decode('utf-8')
+    return utf8_string
+
+
+def legacy_decode_path_from_ltree(encoded_path: str) -> str:
+    if type(encoded_path) == Ltree:
+        encoded_path = str(encoded_path)
+    labels = encoded_path.split('.')
+    path = ''
+    for label in labels:
+        path += f'{legacy_decode_label_from_ltree(label)}.'
+    return path[:-1]
+
+
+def clear_caches():
+    for func in [
+        app_utils.encode_label_for_ltree,
+        app_utils.encode_path_for_ltree,
+        app_utils.decode_label_from_ltree,
+        app_utils._decode_path_from_ltree,
+    ]:
+        func.cache_clear()
+
+
+def build_page(page_size: int) -> tuple[list[ItemModel], list[str]]:
+    raw_paths = [f'user.projects.data_{i % FOLDERS}.raw' for i in range(page_size)]
+    items = []
+    for i, raw_path in enumerate(raw_paths):
+        item = ItemModel(
+            uuid.uuid4(),
+            uuid.uuid4(),
+            Ltree(legacy_encode_path_for_ltree(raw_path)),
+            False,
+            'file',
+            0,
+            f'file_{i}.txt',
+            100,
+            'benchmark',
+            'benchmark',
+            'project',
+        )
+        item.created_time = item.last_updated_time = datetime.utcnow()
+        items.append(item)
+    return items, raw_paths
+
+
+def best_of(func, cold: bool = False) -> float:
+    timings = []
+    for _ in range(REPEATS):
+        if cold:
+            clear_caches()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def per_row_us(seconds: float, rows: int) -> str:
+    return f'{seconds / rows * 1e6:.2f}'
+
+
+def run(page_size: int) -> list[list]:
+    items, raw_paths = build_page(page_size)
+    encoded_paths = [str(item.parent_path) for item in items]
+
+    def serialize():
+        return [item.to_dict() for item in items]
+
+    with mock.patch('app.models.sql_items.decode_path_from_ltree', legacy_decode_path_from_ltree):
+        legacy_serialize = best_of(serialize)
+    cold_serialize = best_of(serialize, cold=True)
+    warm_serialize = best_of(serialize)
+
+    legacy_encode = best_of(lambda: [legacy_encode_path_for_ltree(path) for path in raw_paths])
+    cold_encode = best_of(lambda: app_utils.encode_paths_for_ltree(raw_paths), cold=True)
+    warm_encode = best_of(lambda: app_utils.encode_paths_for_ltree(raw_paths))
+
+    legacy_decode = best_of(lambda: [legacy_decode_path_from_ltree(path) for path in encoded_paths])
+    cold_decode = best_of(lambda: app_utils.decode_paths_from_ltree(encoded_paths), cold=True)
+    warm_decode = best_of(lambda: app_utils.decode_paths_from_ltree(encoded_paths))
+
+    return [
+        [page_size, 'to_dict', *[per_row_us(t, page_size) for t in [legacy_serialize, cold_serialize, warm_serialize]]],
+        [page_size, 'encode', *[per_row_us(t, page_size) for t in [legacy_encode, cold_encode, warm_encode]]],
+        [page_size, 'decode', *[per_row_us(t, page_size) for t in [legacy_decode, cold_decode, warm_decode]]],
+    ]
+
+
+def main():
+    sizes = [int(size) for size in sys.argv[1:]] or PAGE_SIZES
+    rows = [row for size in sizes for row in run(size)]
+    print_table(['rows', 'operation', 'legacy_us', 'cached_cold_us', 'cached_warm_us'], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+# Copyright (C) 2022 Indoc Research
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Compare the set-based subtree move with the previous recursive per-row implementation.
+
+Usage: python -m benchmarks.bench_move_item [descendants ...]
+"""
+
+import sys
+
+from fastapi_sqlalchemy import db
+from sqlalchemy.sql import expression
+from sqlalchemy_utils import Ltree
+from sqlalchemy_utils.types.ltree import LQUERY
+
+from app.app_utils import decode_path_from_ltree
+from app.app_utils import encode_label_for_ltree
+from app.app_utils import encode_path_for_ltree
+from app.models.sql_extended import ExtendedModel
+from app.models.sql_items import ItemModel
+from app.models.sql_storage import StorageModel
+from app.routers.v1.items.crud import move_item
+from benchmarks.utils import generate_container_code
+from benchmarks.utils import print_table
+from benchmarks.utils import remove_container
+from benchmarks.utils import seed_folder
+from benchmarks.utils import timer
+
+DESCENDANTS = [1000, 10000, 100000]
+# the recursive implementation revisits a whole depth layer for every item above it, so keep the fan-out fixed
+SUBFOLDERS = 10
+
+
+def legacy_get_item_children(root_item: ItemModel) -> dict:
+    search_path = f'{root_item.parent_path}.{encode_label_for_ltree(root_item.name)}.*'
+    children = (
+        db.session.query(ItemModel, StorageModel, ExtendedModel)
+        .join(StorageModel, ExtendedModel)
+        .filter(
+            ItemModel.container_code == root_item.container_code,
+            ItemModel.zone == root_item.zone,
+            ItemModel.archived == root_item.archived,
+            ItemModel.parent_path.lquery(expression.cast(search_path, LQUERY)),
+        )
+        .all()
+    )
+    root_depth = len(decode_path_from_ltree(root_item.parent_path).split('.'))
+    layers = {}
+    for item in children:
+        depth = len(decode_path_from_ltree(item[0].parent_path).split('.')) - root_depth
+        layers.setdefault(depth, []).append(item)
+    return layers
+
+
+def legacy_move_item(item: ItemModel, new_parent_path: str, children: dict = None, depth: int = 1):
+    if not children:
+        children = legacy_get_item_children(item)
+    item.parent_path = Ltree(encode_path_for_ltree(new_parent_path)) if new_parent_path else None
+    if depth not in children:
+        return
+    for child in children[depth]:
+        legacy_move_item(
+            child[0], f'{new_parent_path}.{item.name}' if new_parent_path else item.name, children, depth + 1
+        )
+
+
+def run(descendants: int) -> list:
+    container_code = generate_container_code('bench_move')
+    results = {}
+    with db():
+        root_id = seed_folder(container_code, descendants, files_per_folder=descendants // SUBFOLDERS - 1)
+        try:
+            for key, move_func in [('legacy', legacy_move_item), ('set_based', move_item)]:
+                root_item = db.session.query(ItemModel).filter_by(id=root_id).first()
+                with timer(results, key):
+                    move_func(root_item, 'benchmark.moved')
+                    db.session.flush()
+                db.session.rollback()
+        finally:
+            remove_container(container_code)
+    return [descendants, f'{results["legacy"]:.3f}', f'{results["set_based"]:.3f}']
+
+
+def main():
+    sizes = [int(size) for size in sys.argv[1:]] or DESCENDANTS
+    print_table(['descendants', 'legacy_s', 'set_based_s'], [run(size) for size in sizes])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+# Copyright (C) 2022 Indoc Research
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Compare lquery wildcard matching with the ltree descendant operator for subtree lookups.
+
+Usage: python -m benchmarks.bench_subtree_queries [descendants]
+"""
+
+import statistics
+import sys
+import time
+
+from fastapi_sqlalchemy import db
+from sqlalchemy import func
+from sqlalchemy import select
+from sqlalchemy.sql import expression
+from sqlalchemy_utils import Ltree
+from sqlalchemy_utils.types.ltree import LQUERY
+
+from app.app_utils import encode_path_for_ltree
+from app.models.sql_items import ItemModel
+from benchmarks.utils import generate_container_code
+from benchmarks.utils import print_table
+from benchmarks.utils import remove_container
+from benchmarks.utils import seed_folder
+
+DESCENDANTS = 1000000
+REPEATS = 20
+
+
+def time_query(query) -> float:
+    durations = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        db.session.execute(select(func.count()).select_from(query.subquery())).scalar()
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations) * 1000
+
+
+def get_queries(container_code: str, path: str) -> dict:
+    encoded_path = encode_path_for_ltree(path)
+    base_query = select(ItemModel.id).where(ItemModel.container_code == container_code, ItemModel.archived == False)
+    return {
+        'lquery': base_query.where(ItemModel.parent_path.lquery(expression.cast(f'{encoded_path}.*', LQUERY))),
+        'descendant_of': base_query.where(ItemModel.parent_path.descendant_of(Ltree(encoded_path))),
+    }
+
+
+def main():
+    descendants = int(sys.argv[1]) if len(sys.argv) > 1 else DESCENDANTS
+    container_code = generate_container_code('bench_subtree')
+    rows = []
+    with db():
+        seed_folder(container_code, descendants)
+        db.session.execute('ANALYZE metadata.items')
+        db.session.commit()
+        try:
+            for label, path, limit in [
+                ('folder subtree', 'benchmark.root.folder_500', None),
+                ('root subtree, first page', 'benchmark.root', 25),
+                ('root subtree', 'benchmark.root', None),
+            ]:
+                queries = get_queries(container_code, path)
+                results = {key: time_query(query.limit(limit)) for key, query in queries.items()}
+                rows.append([label, f'{results["lquery"]:.2f}', f'{results["descendant_of"]:.2f}'])
+        finally:
+            remove_container(container_code)
+    print_table(['query', 'lquery_ms', 'descendant_of_ms'], rows)
+
+
+if __name__ == '__main__':
+    main()
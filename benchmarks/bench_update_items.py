@@ -0,0 +1,72 @@
+# Copyright (C) 2022 Indoc Research
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Compare the batched PUT /v1/items/batch/ path with updating the same items one at a time.
+
+Usage: python -m benchmarks.bench_update_items [items ...]
+"""
+
+import sys
+
+from fastapi_sqlalchemy import db
+from sqlalchemy import select
+
+from app.models.models_items import PUTItem
+from app.models.models_items import PUTItems
+from app.models.models_items import PUTItemsResponse
+from app.models.sql_items import ItemModel
+from app.routers.v1.items.crud import update_item
+from app.routers.v1.items.crud import update_items
+from benchmarks.utils import generate_container_code
+from benchmarks.utils import print_table
+from benchmarks.utils import remove_container
+from benchmarks.utils import seed_folder
+from benchmarks.utils import timer
+
+ITEMS = [100, 1000, 5000]
+
+
+def legacy_update_items(ids: list, data: PUTItems):
+    for id, item in zip(ids, data.items):
+        update_item(id, item)
+
+
+def run(items: int) -> list:
+    container_code = generate_container_code('bench_update')
+    results = {}
+    with db():
+        seed_folder(container_code, items)
+        try:
+            ids_query = select(ItemModel.id).where(ItemModel.container_code == container_code, ItemModel.type == 'file')
+            ids = db.session.execute(ids_query).scalars().all()
+            for key, update_func in [
+                ('legacy', legacy_update_items),
+                ('batched', lambda ids, data: update_items(ids, data, PUTItemsResponse())),
+            ]:
+                payload = PUTItems(items=[PUTItem(owner=f'{key}_{i}', tags=[key]) for i in range(len(ids))])
+                with timer(results, key):
+                    update_func(ids, payload)
+        finally:
+            remove_container(container_code)
+    return [len(ids), f'{results["legacy"]:.3f}', f'{results["batched"]:.3f}']
+
+
+def main():
+    sizes = [int(size) for size in sys.argv[1:]] or ITEMS
+    print_table(['items', 'legacy_s', 'batched_s'], [run(size) for size in sizes])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+# Copyright (C) 2022 Indoc Research
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import time
+import uuid
+from contextlib import contextmanager
+
+from fastapi_sqlalchemy import db
+from sqlalchemy import delete
+from sqlalchemy import insert
+from sqlalchemy import select
+from sqlalchemy_utils import Ltree
+
+import app.main  # noqa: F401 (initialises the database session middleware)
+from app.app_utils import encode_path_for_ltree
+from app.models.sql_extended import ExtendedModel
+from app.models.sql_items import ItemModel
+from app.models.sql_storage import StorageModel
+
+INSERT_CHUNK_SIZE = 10000
+
+
+def generate_container_code(prefix: str) -> str:
+    return f'{prefix}_{uuid.uuid4().hex[:8]}'
+
+
+def build_item_row(container_code: str, item_type: str, name: str, parent_path: str = None, parent=None) -> dict:
+    return {
+        'id': uuid.uuid4(),
+        'parent': parent,
+        'parent_path': Ltree(encode_path_for_ltree(parent_path)) if parent_path else None,
+        'restore_path': None,
+        'display_path': parent_path,
+        'archived': False,
+        'type': item_type,
+        'zone': 0,
+        'name': name,
+        'size': 0 if item_type != 'file' else 100,
+        'owner': 'benchmark',
+        'container_code': container_code,
+        'container_type': 'project',
+    }
+
+
+def insert_items(rows: list[dict], extras: list[dict] = None):
+    for i in range(0, len(rows), INSERT_CHUNK_SIZE):
+        chunk = rows[i:i + INSERT_CHUNK_SIZE]
+        chunk_extras = extras[i:i + INSERT_CHUNK_SIZE] if extras else [None] * len(chunk)
+        db.session.execute(insert(ItemModel.__table__), chunk)
+        db.session.execute(
+            insert(StorageModel.__table__),
+            [{'id': uuid.uuid4(), 'item_id': row['id'], 'location_uri': '', 'version': ''} for row in chunk],
+        )
+        db.session.execute(
+            insert(ExtendedModel.__table__),
+            [
+                {
+                    'id': uuid.uuid4(),
+                    'item_id': row['id'],
+                    'extra': extra or {'tags': [], 'system_tags': [], 'attributes': {}},
+                }
+                for row, extra in zip(chunk, chunk_extras)
+            ],
+        )
+    db.session.commit()
+
+
+def seed_folder(container_code: str, descendants: int, files_per_folder: int = 99) -> uuid.UUID:
+    name_folder = build_item_row(container_code, 'name_folder', 'benchmark')
+    root_folder = build_item_row(container_code, 'folder', 'root', 'benchmark', name_folder['id'])
+    rows = [name_folder, root_folder]
+    folder = None
+    for i in range(descendants):
+        if i % (files_per_folder + 1) == 0:
+            folder = build_item_row(container_code, 'folder', f'folder_{i}', 'benchmark.root', root_folder['id'])
+            rows.append(folder)
+        else:
+            folder_path = f'benchmark.root.{folder["name"]}'
+            rows.append(build_item_row(container_code, 'file', f'file_{i}.txt', folder_path, folder['id']))
+    insert_items(rows)
+    return root_folder['id']
+
+
+def remove_container(container_code: str):
+    item_ids = select(ItemModel.id).where(ItemModel.container_code == container_code)
+    for model, criteria in [
+        (StorageModel, StorageModel.item_id.in_(item_ids)),
+        (ExtendedModel, ExtendedModel.item_id.in_(item_ids)),
+        (ItemModel, ItemModel.container_code == container_code),
+    ]:
+        db.session.execute(delete(model).where(criteria).execution_options(synchronize_session=False))
+    db.session.commit()
+
+
+@contextmanager
+def timer(results: dict, key: str):
+    start = time.perf_counter()
+    yield
+    results[key] = time.perf_counter() - start
+
+
+def print_table(headers: list[str], rows: list[list]):
+    widths = [max(len(str(value)) for value in column) for column in zip(headers, *rows)]
+    for row in [headers, *rows]:
+        print('  '.join(str(value).rjust(width) for value, width in zip(row, widths)))  # noqa: T001
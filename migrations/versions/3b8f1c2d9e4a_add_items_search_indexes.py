@@ -0,0 +1,80 @@
+"""Add items search indexes
+
+Revision ID: 3b8f1c2d9e4a
+Revises: 644ba6b47222
+Create Date: 2026-10-18 10:12:41.220319
+
+"""
+from alembic import op
+
+from app.config import ConfigClass
+
+
+# revision identifiers, used by Alembic.
+revision = '3b8f1c2d9e4a'
+down_revision = '644ba6b47222'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'items_parent_path_gist',
+            'items',
+            ['parent_path'],
+            schema=ConfigClass.METADATA_SCHEMA,
+            postgresql_using='gist',
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'items_restore_path_gist',
+            'items',
+            ['restore_path'],
+            schema=ConfigClass.METADATA_SCHEMA,
+            postgresql_using='gist',
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'items_location',
+            'items',
+            ['container_code', 'zone', 'archived', 'parent_path'],
+            schema=ConfigClass.METADATA_SCHEMA,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'items_listing',
+            'items',
+            ['container_code', 'archived', 'type', 'created_time', 'id'],
+            schema=ConfigClass.METADATA_SCHEMA,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'storage_item_id',
+            'storage',
+            ['item_id'],
+            schema=ConfigClass.METADATA_SCHEMA,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'extended_item_id',
+            'extended',
+            ['item_id'],
+            schema=ConfigClass.METADATA_SCHEMA,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for table_name, index_name in [
+            ('extended', 'extended_item_id'),
+            ('storage', 'storage_item_id'),
+            ('items', 'items_listing'),
+            ('items', 'items_location'),
+            ('items', 'items_restore_path_gist'),
+            ('items', 'items_parent_path_gist'),
+        ]:
+            op.drop_index(
+                index_name, table_name=table_name, schema=ConfigClass.METADATA_SCHEMA, postgresql_concurrently=True
+            )
@@ -0,0 +1,28 @@
+"""Add items restore parent
+
+Revision ID: 4f1a6c8e0b35
+Revises: e2b8d4f61a07
+Create Date: 2026-10-18 21:54:30.671028
+
+"""
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+from app.config import ConfigClass
+
+# revision identifiers, used by Alembic.
+revision = '4f1a6c8e0b35'
+down_revision = 'e2b8d4f61a07'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        'items', sa.Column('restore_parent', postgresql.UUID(as_uuid=True)), schema=ConfigClass.METADATA_SCHEMA
+    )
+
+
+def downgrade():
+    op.drop_column('items', 'restore_parent', schema=ConfigClass.METADATA_SCHEMA)
@@ -0,0 +1,58 @@
+"""Change extended extra to jsonb
+
+Revision ID: 5c1e9f3a7d28
+Revises: 8d4e2a7b1c93
+Create Date: 2026-10-18 16:41:07.380552
+
+"""
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+from app.config import ConfigClass
+
+
+# revision identifiers, used by Alembic.
+revision = '5c1e9f3a7d28'
+down_revision = '8d4e2a7b1c93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.alter_column(
+        'extended',
+        'extra',
+        existing_type=sa.JSON(),
+        type_=postgresql.JSONB(),
+        postgresql_using='extra::jsonb',
+        schema=ConfigClass.METADATA_SCHEMA,
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'extended_extra_gin',
+            'extended',
+            ['extra'],
+            schema=ConfigClass.METADATA_SCHEMA,
+            postgresql_using='gin',
+            postgresql_ops={'extra': 'jsonb_path_ops'},
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'extended_extra_gin',
+            table_name='extended',
+            schema=ConfigClass.METADATA_SCHEMA,
+            postgresql_concurrently=True,
+        )
+    op.alter_column(
+        'extended',
+        'extra',
+        existing_type=postgresql.JSONB(),
+        type_=sa.JSON(),
+        postgresql_using='extra::json',
+        schema=ConfigClass.METADATA_SCHEMA,
+    )
@@ -0,0 +1,86 @@
+"""Add items display paths
+
+Revision ID: 8d4e2a7b1c93
+Revises: 3b8f1c2d9e4a
+Create Date: 2026-10-18 14:03:52.517406
+
+"""
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+from sqlalchemy_utils import LtreeType
+
+from app.app_utils import decode_path_from_ltree
+from app.config import ConfigClass
+
+
+# revision identifiers, used by Alembic.
+revision = '8d4e2a7b1c93'
+down_revision = '3b8f1c2d9e4a'
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH_SIZE = 10000
+
+items_table = sa.table(
+    'items',
+    sa.column('id', postgresql.UUID(as_uuid=True)),
+    sa.column('parent_path', LtreeType()),
+    sa.column('restore_path', LtreeType()),
+    sa.column('display_path', sa.String()),
+    sa.column('display_restore_path', sa.String()),
+    schema=ConfigClass.METADATA_SCHEMA,
+)
+
+
+def backfill_display_paths():
+    connection = op.get_bind()
+    select_query = (
+        sa.select(items_table.c.id, items_table.c.parent_path, items_table.c.restore_path)
+        .where(sa.or_(items_table.c.parent_path.isnot(None), items_table.c.restore_path.isnot(None)))
+        .order_by(items_table.c.id)
+        .limit(BACKFILL_BATCH_SIZE)
+    )
+    last_id = None
+    while True:
+        batch_query = select_query.where(items_table.c.id > last_id) if last_id else select_query
+        rows = connection.execute(batch_query).all()
+        if not rows:
+            break
+        batch_values = sa.values(
+            sa.column('item_id', sa.String()),
+            sa.column('display_path', sa.String()),
+            sa.column('display_restore_path', sa.String()),
+            name='batch_values',
+        ).data(
+            [
+                (
+                    str(row.id),
+                    decode_path_from_ltree(row.parent_path) if row.parent_path else None,
+                    decode_path_from_ltree(row.restore_path) if row.restore_path else None,
+                )
+                for row in rows
+            ]
+        )
+        # One statement per batch, so each batch is committed on its own inside the autocommit block.
+        connection.execute(
+            items_table.update()
+            .where(items_table.c.id == sa.cast(batch_values.c.item_id, postgresql.UUID(as_uuid=True)))
+            .values(
+                display_path=batch_values.c.display_path,
+                display_restore_path=batch_values.c.display_restore_path,
+            )
+        )
+        last_id = rows[-1].id
+
+
+def upgrade():
+    op.add_column('items', sa.Column('display_path', sa.String()), schema=ConfigClass.METADATA_SCHEMA)
+    op.add_column('items', sa.Column('display_restore_path', sa.String()), schema=ConfigClass.METADATA_SCHEMA)
+    with op.get_context().autocommit_block():
+        backfill_display_paths()
+
+
+def downgrade():
+    op.drop_column('items', 'display_restore_path', schema=ConfigClass.METADATA_SCHEMA)
+    op.drop_column('items', 'display_path', schema=ConfigClass.METADATA_SCHEMA)
@@ -0,0 +1,35 @@
+"""Add items listing desc index
+
+Revision ID: 9c2e5b7a4d16
+Revises: 4f1a6c8e0b35
+Create Date: 2026-10-18 23:12:05.482913
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+from app.config import ConfigClass
+
+# revision identifiers, used by Alembic.
+revision = '9c2e5b7a4d16'
+down_revision = '4f1a6c8e0b35'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'items_listing_desc',
+            'items',
+            ['container_code', 'archived', 'type', sa.text('created_time DESC'), sa.text('id DESC')],
+            schema=ConfigClass.METADATA_SCHEMA,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'items_listing_desc', table_name='items', schema=ConfigClass.METADATA_SCHEMA, postgresql_concurrently=True
+        )
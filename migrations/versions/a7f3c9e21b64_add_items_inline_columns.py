@@ -0,0 +1,111 @@
+"""Add items inline storage and extended columns
+
+Revision ID: a7f3c9e21b64
+Revises: 5c1e9f3a7d28
+Create Date: 2026-10-18 18:12:44.905213
+
+"""
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+from app.config import ConfigClass
+
+# revision identifiers, used by Alembic.
+revision = 'a7f3c9e21b64'
+down_revision = '5c1e9f3a7d28'
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH_SIZE = 10000
+
+SCHEMA = ConfigClass.METADATA_SCHEMA
+
+INLINE_TABLES = {
+    'storage': {'storage_id': 'id', 'location_uri': 'location_uri', 'version': 'version'},
+    'extended': {'extended_id': 'id', 'extra': 'extra'},
+}
+
+
+def create_sync_triggers(table: str, columns: dict):
+    set_clause = ', '.join(f'{item_column} = new_rows.{column}' for item_column, column in columns.items())
+    item_columns = ', '.join(f'items.{item_column}' for item_column in columns)
+    new_columns = ', '.join(f'new_rows.{column}' for column in columns.values())
+    op.execute(
+        f'''
+        CREATE FUNCTION {SCHEMA}.sync_items_{table}() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            UPDATE {SCHEMA}.items AS items SET {set_clause}
+            FROM new_rows
+            WHERE items.id = new_rows.item_id AND ({item_columns}) IS DISTINCT FROM ({new_columns});
+            RETURN NULL;
+        END;
+        $$
+        '''
+    )
+    for event in ['insert', 'update']:
+        op.execute(
+            f'CREATE TRIGGER {table}_sync_items_{event} AFTER {event.upper()} ON {SCHEMA}.{table} '
+            f'REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE PROCEDURE {SCHEMA}.sync_items_{table}()'
+        )
+
+
+def drop_sync_triggers(table: str):
+    for event in ['insert', 'update']:
+        op.execute(f'DROP TRIGGER {table}_sync_items_{event} ON {SCHEMA}.{table}')
+    op.execute(f'DROP FUNCTION {SCHEMA}.sync_items_{table}()')
+
+
+def backfill_inline_columns():
+    connection = op.get_bind()
+    select_query = sa.text(f'SELECT id FROM {SCHEMA}.items WHERE id > :last_id ORDER BY id LIMIT :limit')
+    update_queries = []
+    for table, columns in INLINE_TABLES.items():
+        set_clause = ', '.join(f'{item_column} = {table}.{column}' for item_column, column in columns.items())
+        # rows already synced by the triggers are skipped so a concurrent write is never overwritten
+        first_column = next(iter(columns))
+        update_queries.append(
+            sa.text(
+                f'UPDATE {SCHEMA}.items AS items SET {set_clause} FROM {SCHEMA}.{table} AS {table} '
+                f'WHERE {table}.item_id = items.id AND items.{first_column} IS NULL '
+                'AND items.id = ANY(CAST(:ids AS UUID[]))'
+            )
+        )
+    last_id = '00000000-0000-0000-0000-000000000000'
+    while True:
+        ids = connection.execute(select_query, {'last_id': last_id, 'limit': BACKFILL_BATCH_SIZE}).scalars().all()
+        if not ids:
+            break
+        for update_query in update_queries:
+            connection.execute(update_query, {'ids': [str(id) for id in ids]})
+        last_id = ids[-1]
+
+
+def upgrade():
+    op.add_column('items', sa.Column('storage_id', postgresql.UUID(as_uuid=True)), schema=SCHEMA)
+    op.add_column('items', sa.Column('location_uri', sa.String()), schema=SCHEMA)
+    op.add_column('items', sa.Column('version', sa.String()), schema=SCHEMA)
+    op.add_column('items', sa.Column('extended_id', postgresql.UUID(as_uuid=True)), schema=SCHEMA)
+    op.add_column('items', sa.Column('extra', postgresql.JSONB()), schema=SCHEMA)
+    for table, columns in INLINE_TABLES.items():
+        create_sync_triggers(table, columns)
+    with op.get_context().autocommit_block():
+        backfill_inline_columns()
+        op.create_index(
+            'items_extra_gin',
+            'items',
+            ['extra'],
+            schema=SCHEMA,
+            postgresql_using='gin',
+            postgresql_ops={'extra': 'jsonb_path_ops'},
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('items_extra_gin', table_name='items', schema=SCHEMA, postgresql_concurrently=True)
+    for table in INLINE_TABLES:
+        drop_sync_triggers(table)
+    for column in ['extra', 'extended_id', 'version', 'location_uri', 'storage_id']:
+        op.drop_column('items', column, schema=SCHEMA)
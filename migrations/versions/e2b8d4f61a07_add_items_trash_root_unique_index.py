@@ -0,0 +1,138 @@
+"""Add items trash root unique index
+
+Revision ID: e2b8d4f61a07
+Revises: a7f3c9e21b64
+Create Date: 2026-10-18 20:27:16.138540
+
+"""
+from collections import Counter
+
+import sqlalchemy as sa
+from alembic import op
+
+from app.app_utils import encode_label_for_ltree
+from app.config import ConfigClass
+
+# revision identifiers, used by Alembic.
+revision = 'e2b8d4f61a07'
+down_revision = 'a7f3c9e21b64'
+branch_labels = None
+depends_on = None
+
+SCHEMA = ConfigClass.METADATA_SCHEMA
+
+
+def rename_duplicate_trash_roots() -> list:
+    connection = op.get_bind()
+    return connection.execute(
+        sa.text(
+            f'''
+            UPDATE {SCHEMA}.items AS items
+            SET name = split_part(items.name, '.', 1) || '_' || duplicates.suffix
+                || substr(items.name, length(split_part(items.name, '.', 1)) + 1)
+            FROM (
+                SELECT
+                    id,
+                    name,
+                    round(extract(epoch FROM created_time))::bigint || '_' || row_number() OVER (
+                        PARTITION BY container_code, container_type, zone, name ORDER BY created_time, id
+                    ) AS suffix,
+                    row_number() OVER (
+                        PARTITION BY container_code, container_type, zone, name ORDER BY created_time, id
+                    ) AS rank
+                FROM {SCHEMA}.items
+                WHERE parent_path IS NULL AND archived
+            ) AS duplicates
+            WHERE items.id = duplicates.id AND duplicates.rank > 1
+            RETURNING items.id, items.type, items.zone, items.container_code, items.container_type,
+                items.restore_path, duplicates.name AS old_name, items.name AS new_name
+            '''
+        )
+    ).all()
+
+
+def get_trash_location(root) -> tuple:
+    return root.zone, root.container_code, root.container_type, root.restore_path, root.old_name
+
+
+def rename_trash_subtree(root, shares_location: bool):
+    # Children of a trash root are located by the root name, so renaming a folder root has to move its subtree.
+    # Roots trashed from the same location share their subtree paths and are told apart by the parent chain.
+    connection = op.get_bind()
+    old_prefix = encode_label_for_ltree(root.old_name)
+    connection.execute(
+        sa.text(
+            f'''
+            WITH RECURSIVE descendants AS (
+                SELECT id FROM {SCHEMA}.items WHERE parent = :root_id AND archived
+                UNION
+                SELECT items.id FROM {SCHEMA}.items AS items JOIN descendants ON items.parent = descendants.id
+                WHERE items.archived
+            )
+            UPDATE {SCHEMA}.items
+            SET parent_path = CASE
+                    WHEN nlevel(parent_path) = 1 THEN CAST(:new_prefix AS ltree)
+                    ELSE CAST(:new_prefix AS ltree) || subpath(parent_path, 1)
+                END,
+                display_path = :new_name || substr(display_path, length(:old_name) + 1)
+            WHERE archived
+                AND zone = :zone
+                AND container_code = :container_code
+                AND container_type = :container_type
+                AND restore_path <@ CAST(:restore_prefix AS ltree)
+                AND parent_path <@ CAST(:old_prefix AS ltree)
+                AND (
+                    NOT (
+                        :shares_location
+                        OR EXISTS (
+                            SELECT 1 FROM {SCHEMA}.items AS roots
+                            WHERE roots.parent_path IS NULL
+                                AND roots.archived
+                                AND roots.type = 'folder'
+                                AND roots.name = :old_name
+                                AND roots.zone = :zone
+                                AND roots.container_code = :container_code
+                                AND roots.container_type = :container_type
+                                AND roots.restore_path IS NOT DISTINCT FROM CAST(:restore_path AS ltree)
+                        )
+                    )
+                    OR id IN (SELECT id FROM descendants)
+                )
+            '''
+        ),
+        {
+            'root_id': root.id,
+            'zone': root.zone,
+            'container_code': root.container_code,
+            'container_type': root.container_type,
+            'restore_path': str(root.restore_path) if root.restore_path else None,
+            'restore_prefix': f'{root.restore_path}.{old_prefix}' if root.restore_path else old_prefix,
+            'old_name': root.old_name,
+            'new_name': root.new_name,
+            'old_prefix': old_prefix,
+            'new_prefix': encode_label_for_ltree(root.new_name),
+            'shares_location': shares_location,
+        },
+    )
+
+
+def upgrade():
+    renamed_folders = [root for root in rename_duplicate_trash_roots() if root.type == 'folder']
+    locations = Counter(get_trash_location(root) for root in renamed_folders)
+    for root in renamed_folders:
+        rename_trash_subtree(root, locations[get_trash_location(root)] > 1)
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'items_trash_root_unique',
+            'items',
+            ['zone', 'name', 'container_code', 'container_type'],
+            unique=True,
+            schema=SCHEMA,
+            postgresql_where=sa.text('parent_path IS NULL AND archived'),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('items_trash_root_unique', table_name='items', schema=SCHEMA, postgresql_concurrently=True)
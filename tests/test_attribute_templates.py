@@ -81,6 +81,30 @@ class TestAttributeTemplates:
         assert response.status_code == 200
         assert len(loads(response.text)['result']['attributes']) == 2
 
+    def test_update_attribute_template_revalidates_items_200(self, test_items, test_attribute_template):
+        template_params = {'id': test_attribute_template}
+        template_payload = {
+            'name': 'test_template',
+            'project_code': 'test_project',
+            'attributes': [
+                {'name': 'attribute_1', 'optional': False, 'type': 'multiple_choice', 'options': ['val1', 'val2']}
+            ],
+        }
+        item_params = {'id': test_items['ids']['file_1']}
+        item_payload = {'attribute_template_id': test_attribute_template, 'attributes': {'attribute_1': 'val3'}}
+        response = app.put('/v1/template/', json=template_payload, params=template_params)
+        assert response.status_code == 200
+        response = app.put('/v1/item/', json=item_payload, params=item_params)
+        assert response.status_code == 400
+        template_payload['attributes'][0]['options'].append('val3')
+        response = app.put('/v1/template/', json=template_payload, params=template_params)
+        assert response.status_code == 200
+        response = app.put('/v1/item/', json=item_payload, params=item_params)
+        assert response.status_code == 200
+        assert loads(response.text)['result']['extended']['extra']['attributes'] == {
+            test_attribute_template: {'attribute_1': 'val3'}
+        }
+
     def test_delete_attribute_template_200(self, test_attribute_template):
         params = {'id': test_attribute_template}
         response = app.delete('/v1/template/', params=params)
@@ -251,6 +251,25 @@ class TestItems:
         assert res[0]['name'] == 'test_file_2.txt'
         assert res[0]['archived'] is True
 
+    def test_get_collection_items_cursor_200(self, test_collections, test_items):
+        payload = {
+            'id': test_collections[0]['id'],
+            'item_ids': [
+                test_items['ids']['file_1'], test_items['ids']['file_2'], test_items['ids']['file_3']
+            ]
+        }
+        app.post('/v1/collection/items/', json=payload)
+
+        params = {'id': test_collections[0]['id'], 'page_size': 2, 'sorting': 'name', 'order': 'desc'}
+        response = app.get('/v1/collection/items/', params=params)
+        next_cursor = response.json()['next_cursor']
+        response = app.get('/v1/collection/items/', params={**params, 'cursor': next_cursor})
+        res = response.json()['result']
+        assert response.status_code == 200
+        assert len(res) == 1
+        assert res[0]['name'] == 'test_file_1.txt'
+        assert response.json()['next_cursor'] is None
+
     def test_add_collection_items_200(self, test_collections, test_items):
         # add items
         payload = {
@@ -13,13 +13,23 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import asyncio
 import re
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from json import loads
 
+import pytest
 from fastapi.testclient import TestClient
+from fastapi_sqlalchemy import db
+from sqlalchemy import update
 
+from app.app_utils import decode_path_from_ltree
+from app.config import ConfigClass
 from app.main import app
+from app.models.sql_extended import ExtendedModel
+from app.models.sql_items import ItemModel
+from app.routers.v1.items.crud import move_item
 
 app = TestClient(app)
 
@@ -60,6 +70,162 @@ class TestItems:
         response = app.get('/v1/items/search/', params=params)
         assert response.status_code == 200
 
+    @pytest.mark.parametrize('order', ['asc', 'desc'])
+    def test_get_items_by_location_cursor_200(self, test_items, order):
+        params = {
+            'container_code': test_items['container_code'],
+            'recursive': True,
+            'sorting': 'name',
+            'order': order,
+            'page_size': 2,
+        }
+        response = app.get('/v1/items/search/', params=params)
+        names = [item['name'] for item in loads(response.text)['result']]
+        next_cursor = loads(response.text)['next_cursor']
+        while next_cursor:
+            response = app.get('/v1/items/search/', params={**params, 'cursor': next_cursor})
+            assert response.status_code == 200
+            names += [item['name'] for item in loads(response.text)['result']]
+            next_cursor = loads(response.text)['next_cursor']
+        file_names = ['test_file_1.txt', 'test_file_2.txt', 'test_file_3.txt']
+        assert names == ['user', 'test_folder', *(file_names if order == 'asc' else file_names[::-1])]
+
+    def test_get_items_by_location_invalid_cursor_400(self, test_items):
+        params = {
+            'container_code': test_items['container_code'],
+            'recursive': True,
+            'cursor': 'invalid',
+        }
+        response = app.get('/v1/items/search/', params=params)
+        assert response.status_code == 400
+
+    def test_get_items_by_location_total_mode_none_200(self, test_items):
+        params = {
+            'container_code': test_items['container_code'],
+            'recursive': True,
+            'page_size': 2,
+            'total_mode': 'none',
+        }
+        response = app.get('/v1/items/search/', params=params)
+        assert response.status_code == 200
+        assert loads(response.text)['total'] is None
+        assert loads(response.text)['has_more'] is True
+        assert len(loads(response.text)['result']) == 2
+
+    def test_get_items_by_location_total_mode_estimate_200(self, test_items):
+        params = {
+            'container_code': test_items['container_code'],
+            'recursive': True,
+            'page_size': 5,
+            'total_mode': 'estimate',
+        }
+        response = app.get('/v1/items/search/', params=params)
+        assert response.status_code == 200
+        assert loads(response.text)['total'] == 5
+        assert loads(response.text)['has_more'] is False
+
+    def test_get_items_by_location_invalid_total_mode_422(self, test_items):
+        params = {
+            'container_code': test_items['container_code'],
+            'recursive': True,
+            'total_mode': 'approximate',
+        }
+        response = app.get('/v1/items/search/', params=params)
+        assert response.status_code == 422
+
+    def test_get_items_by_location_tags_200(self, test_items):
+        for file, tags in [('file_1', ['tag_a', 'tag_b']), ('file_2', ['tag_a'])]:
+            app.put('/v1/item/', params={'id': test_items['ids'][file]}, json={'tags': tags})
+        params = {
+            'container_code': test_items['container_code'],
+            'recursive': True,
+            'tags': ['tag_a'],
+            'sorting': 'name',
+        }
+        response = app.get('/v1/items/search/', params=params)
+        assert response.status_code == 200
+        assert [item['name'] for item in loads(response.text)['result']] == ['test_file_1.txt', 'test_file_2.txt']
+        response = app.get('/v1/items/search/', params={**params, 'tags': ['tag_a', 'tag_b']})
+        assert [item['name'] for item in loads(response.text)['result']] == ['test_file_1.txt']
+        response = app.get('/v1/items/search/', params={**params, 'system_tags': ['copied-to-core']})
+        assert loads(response.text)['total'] == 0
+
+    def test_get_items_by_location_attributes_200(self, test_items, test_attribute_template):
+        payload = {'attribute_template_id': test_attribute_template, 'attributes': {'attribute_1': 'val1'}}
+        app.put('/v1/item/', params={'id': test_items['ids']['file_1']}, json=payload)
+        params = {
+            'container_code': test_items['container_code'],
+            'recursive': True,
+            'attribute_template_id': test_attribute_template,
+        }
+        response = app.get('/v1/items/search/', params=params)
+        assert response.status_code == 200
+        assert [item['id'] for item in loads(response.text)['result']] == [test_items['ids']['file_1']]
+        response = app.get('/v1/items/search/', params={**params, 'attributes': ['attribute_1:val1']})
+        assert [item['id'] for item in loads(response.text)['result']] == [test_items['ids']['file_1']]
+        response = app.get('/v1/items/search/', params={**params, 'attributes': ['attribute_1:val2']})
+        assert loads(response.text)['total'] == 0
+
+    @pytest.mark.parametrize(
+        'params',
+        [
+            {'attributes': ['attribute_1:val1']},
+            {'attributes': ['attribute_1'], 'attribute_template_id': str(uuid.uuid4())},
+        ],
+    )
+    def test_get_items_by_location_invalid_attributes_400(self, test_items, params):
+        params = {'container_code': test_items['container_code'], 'recursive': True, **params}
+        response = app.get('/v1/items/search/', params=params)
+        assert response.status_code == 400
+
+    def test_get_items_by_location_inline_reads_200(self, test_items, monkeypatch):
+        payload = {'location_uri': 'https://example.com/updated', 'tags': ['tag_a']}
+        app.put('/v1/item/', params={'id': test_items['ids']['file_1']}, json=payload)
+        params = {'container_code': test_items['container_code'], 'recursive': True, 'sorting': 'name'}
+        joined_items = loads(app.get('/v1/items/search/', params=params).text)['result']
+        monkeypatch.setattr(ConfigClass, 'ITEM_INLINE_READS', True)
+        inline_items = loads(app.get('/v1/items/search/', params=params).text)['result']
+        assert inline_items == joined_items
+        response = app.get('/v1/items/search/', params={**params, 'tags': ['tag_a']})
+        assert [item['storage']['location_uri'] for item in loads(response.text)['result']] == [payload['location_uri']]
+
+    def test_lookup_items_batch_200(self, test_items, monkeypatch):
+        monkeypatch.setattr(ConfigClass, 'LOOKUP_ITEMS_CHUNK_SIZE', 2)
+        missing_id = str(uuid.uuid4())
+        ids = [test_items['ids']['file_2'], missing_id, test_items['ids']['file_1'], test_items['ids']['file_2']]
+        response = app.post('/v1/items/batch/lookup/', json={'ids': ids})
+        assert response.status_code == 200
+        assert response.headers['content-type'] == 'application/x-ndjson'
+        lines = [loads(line) for line in response.text.splitlines()]
+        assert [line['id'] for line in lines] == ids
+        assert [line['found'] for line in lines] == [True, False, True, True]
+        assert lines[1]['item'] is None
+        assert [line['item']['id'] for line in lines if line['found']] == [ids[0], ids[2], ids[3]]
+
+    def test_lookup_items_batch_empty_ids_422(self):
+        response = app.post('/v1/items/batch/lookup/', json={'ids': []})
+        assert response.status_code == 422
+
+    def test_export_items_200(self, test_items):
+        params = {'container_code': test_items['container_code']}
+        response = app.get('/v1/items/export/', params=params)
+        assert response.status_code == 200
+        assert response.headers['content-type'] == 'application/x-ndjson'
+        lines = [loads(line) for line in response.text.splitlines()]
+        assert [line['item']['type'] for line in lines] == ['name_folder', 'folder', 'file', 'file', 'file']
+        assert {line['item']['id'] for line in lines} == set(test_items['ids'].values())
+        params['resume_token'] = lines[2]['resume_token']
+        response = app.get('/v1/items/export/', params=params)
+        assert response.status_code == 200
+        resumed_lines = [loads(line) for line in response.text.splitlines()]
+        assert resumed_lines == lines[3:]
+
+    def test_export_items_invalid_resume_token_400(self, test_items):
+        params = {'container_code': test_items['container_code'], 'resume_token': 'invalid'}
+        response = app.get('/v1/items/export/', params=params)
+        assert response.status_code == 400
+        assert response.json()['error_msg'] == 'Invalid cursor'
+
     def test_get_items_by_id_batch_200(self, test_items):
         params = {'ids': [test_items['ids']['name_folder'], test_items['ids']['folder'], test_items['ids']['file_1']]}
         response = app.get('/v1/items/batch/', params=params)
@@ -86,6 +252,34 @@ class TestItems:
         }
         response = app.post('/v1/item/', json=payload)
         assert response.status_code == 200
+        assert loads(app.get(f'/v1/item/{item_id}/').text)['result'] == loads(response.text)['result']
+
+    def test_create_item_inline_reads_200(self, monkeypatch):
+        monkeypatch.setattr(ConfigClass, 'ITEM_INLINE_READS', True)
+        item_id = str(uuid.uuid4())
+        self.cleanup_item_ids.append(item_id)
+        payload = {
+            'id': item_id,
+            'parent': '3fa85f64-5717-4562-b3fc-2c963f66afa6',
+            'parent_path': 'user',
+            'type': 'file',
+            'zone': 0,
+            'name': 'test_file.txt',
+            'size': 0,
+            'owner': 'admin',
+            'container_code': 'create_item_inline_reads_200',
+            'container_type': 'project',
+            'location_uri': 'https://example.com/item',
+            'version': '1',
+            'tags': ['tag_a'],
+            'system_tags': [],
+        }
+        response = app.post('/v1/item/', json=payload)
+        assert response.status_code == 200
+        created_item = loads(response.text)['result']
+        assert created_item['storage']['location_uri'] == payload['location_uri']
+        assert created_item['extended']['extra']['tags'] == payload['tags']
+        assert loads(app.get(f'/v1/item/{item_id}/').text)['result'] == created_item
 
     def test_create_items_batch_200(self):
         item_ids = [str(uuid.uuid4()), str(uuid.uuid4())]
@@ -130,6 +324,64 @@ class TestItems:
         response = app.post('/v1/items/batch/', json=payload)
         assert response.status_code == 200
 
+    def test_create_items_batch_skip_duplicates_200(self, test_items):
+        item_id = str(uuid.uuid4())
+        self.cleanup_item_ids.append(item_id)
+        payload = {
+            'items': [
+                {
+                    'id': item_id,
+                    'parent': test_items['ids']['folder'],
+                    'parent_path': 'user.test_folder',
+                    'type': 'file',
+                    'zone': 0,
+                    'name': name,
+                    'size': 0,
+                    'owner': 'user',
+                    'container_code': test_items['container_code'],
+                    'container_type': 'project',
+                    'location_uri': '',
+                    'version': '',
+                    'tags': [],
+                    'system_tags': [],
+                }
+                for item_id, name in [(item_id, 'test_file_4.txt'), (str(uuid.uuid4()), 'test_file_1.txt')]
+            ],
+            'skip_duplicates': True,
+        }
+        response = app.post('/v1/items/batch/', json=payload)
+        assert response.status_code == 200
+        assert loads(response.text)['total'] == 1
+        assert loads(response.text)['result'][0]['id'] == item_id
+        assert [outcome['status'] for outcome in loads(response.text)['outcomes']] == ['created', 'skipped']
+
+    def test_create_items_batch_duplicate_409(self, test_items):
+        item_id = str(uuid.uuid4())
+        payload = {
+            'items': [
+                {
+                    'id': item_id,
+                    'parent': test_items['ids']['folder'],
+                    'parent_path': 'user.test_folder',
+                    'type': 'file',
+                    'zone': 0,
+                    'name': name,
+                    'size': 0,
+                    'owner': 'user',
+                    'container_code': test_items['container_code'],
+                    'container_type': 'project',
+                    'location_uri': '',
+                    'version': '',
+                    'tags': [],
+                    'system_tags': [],
+                }
+                for item_id, name in [(item_id, 'test_file_4.txt'), (str(uuid.uuid4()), 'test_file_1.txt')]
+            ],
+        }
+        response = app.post('/v1/items/batch/', json=payload)
+        assert response.status_code == 409
+        assert app.get(f'/v1/item/{item_id}/').status_code == 404
+
     def test_create_item_wrong_type_422(self):
         payload = {
             'id': str(uuid.uuid4()),
@@ -271,6 +523,79 @@ class TestItems:
         assert loads(response.text)['result'][1]['extended']['extra']['tags'] == ['update_items_batch']
         assert loads(response.text)['result'][2]['size'] == 500
 
+    def test_update_items_batch_partial_failure_200(self, test_items):
+        params = {'ids': [test_items['ids']['file_1'], str(uuid.uuid4()), test_items['ids']['file_2']]}
+        payload = {'items': [{'size': 500}, {'size': 500}, {'name': 'test_file_1.txt'}]}
+        response = app.put('/v1/items/batch/', params=params, json=payload)
+        assert response.status_code == 200
+        assert loads(response.text)['total'] == 1
+        assert loads(response.text)['result'][0]['size'] == 500
+        outcomes = loads(response.text)['outcomes']
+        assert [outcome['status'] for outcome in outcomes] == ['updated', 'failed', 'failed']
+        assert outcomes[1]['error_msg'] == 'Item not found'
+        assert outcomes[2]['error_msg'] == 'Item conflict in database'
+
+    def test_update_items_batch_type_conflict_200(self, test_items):
+        app.put('/v1/item/', params={'id': test_items['ids']['file_2']}, json={'name': 'user'})
+        params = {'ids': [test_items['ids']['file_1'], test_items['ids']['file_2']]}
+        payload = {'items': [{'size': 500}, {'type': 'name_folder'}]}
+        response = app.put('/v1/items/batch/', params=params, json=payload)
+        assert response.status_code == 200
+        outcomes = loads(response.text)['outcomes']
+        assert [outcome['status'] for outcome in outcomes] == ['updated', 'failed']
+        assert outcomes[1]['error_msg'] == 'Item conflict in database'
+        assert loads(app.get(f'/v1/item/{test_items["ids"]["file_1"]}/').text)['result']['size'] == 500
+
+    def test_update_items_batch_atomic_404(self, test_items):
+        params = {'ids': [test_items['ids']['file_1'], str(uuid.uuid4())]}
+        payload = {'items': [{'size': 500}, {'size': 500}], 'atomic': True}
+        response = app.put('/v1/items/batch/', params=params, json=payload)
+        assert response.status_code == 404
+        response = app.get(f'/v1/item/{test_items["ids"]["file_1"]}/')
+        assert loads(response.text)['result']['size'] != 500
+
+    def test_update_item_move_folder_with_children_200(self, test_items):
+        params = {'id': test_items['ids']['folder']}
+        payload = {'parent_path': 'user.new_parent'}
+        response = app.put('/v1/item/', json=payload, params=params)
+        assert response.status_code == 200
+        assert loads(response.text)['result']['parent_path'] == 'user.new_parent'
+        params = {
+            'parent_path': 'user.new_parent.test_folder',
+            'container_code': test_items['container_code'],
+            'recursive': False,
+        }
+        response = app.get('/v1/items/search/', params=params)
+        assert response.status_code == 200
+        assert loads(response.text)['total'] == 3
+
+    @pytest.mark.parametrize('return_children', [False, True])
+    def test_move_item_returns_children_count_or_ids(self, test_items, return_children):
+        file_ids = {uuid.UUID(test_items['ids'][f'file_{i}']) for i in range(1, 4)}
+        with db():
+            folder = db.session.query(ItemModel).filter_by(id=test_items['ids']['folder']).one()
+            moved_children = move_item(folder, 'user.new_parent', return_children)
+            db.session.rollback()
+        if return_children:
+            assert set(moved_children) == file_ids
+        else:
+            assert moved_children == len(file_ids)
+
+    def test_update_item_rename_folder_with_children_200(self, test_items):
+        params = {'id': test_items['ids']['folder']}
+        payload = {'name': 'test_folder_renamed'}
+        response = app.put('/v1/item/', json=payload, params=params)
+        assert response.status_code == 200
+        assert loads(response.text)['result']['name'] == 'test_folder_renamed'
+        params = {
+            'parent_path': 'user.test_folder_renamed',
+            'container_code': test_items['container_code'],
+            'recursive': False,
+        }
+        response = app.get('/v1/items/search/', params=params)
+        assert response.status_code == 200
+        assert loads(response.text)['total'] == 3
+
     def test_update_item_wrong_type_422(self, test_items):
         params = {'id': test_items['ids']['file_1']}
         payload = {'type': 'invalid'}
@@ -323,6 +648,129 @@ class TestItems:
         for i in range(4):
             assert not loads(response.text)['result'][i]['archived']
 
+    def test_trash_folder_with_children_summary_200(self, test_items):
+        params = {
+            'id': test_items['ids']['folder'],
+            'archived': True,
+            'summary': True,
+        }
+        response = app.patch('/v1/item/', params=params)
+        assert response.status_code == 200
+        assert len(loads(response.text)['result']) == 1
+        assert loads(response.text)['total'] == 4
+        params = {
+            'parent_path': 'test_folder',
+            'container_code': test_items['container_code'],
+            'archived': True,
+            'recursive': False,
+        }
+        response = app.get('/v1/items/search/', params=params)
+        assert loads(response.text)['total'] == 3
+        for item in loads(response.text)['result']:
+            assert item['restore_path'] == 'user.test_folder'
+
+    def test_trash_and_restore_folder_with_children_200(self, test_items):
+        params = {'id': test_items['ids']['folder'], 'archived': True}
+        app.patch('/v1/item/', params=params)
+        params = {'id': test_items['ids']['folder'], 'archived': False}
+        response = app.patch('/v1/item/', params=params)
+        assert response.status_code == 200
+        assert len(loads(response.text)['result']) == 4
+        for item in loads(response.text)['result'][1:]:
+            assert item['parent_path'] == 'user.test_folder'
+            assert item['restore_path'] is None
+
+    def test_restore_item_to_recorded_parent_200(self, test_items):
+        params = {'id': test_items['ids']['file_1'], 'archived': True}
+        app.patch('/v1/item/', params=params)
+        with db():
+            item = db.session.query(ItemModel).filter_by(id=test_items['ids']['file_1']).first()
+        assert str(item.restore_parent) == test_items['ids']['folder']
+        params = {'id': test_items['ids']['file_1'], 'archived': False}
+        response = app.patch('/v1/item/', params=params)
+        assert response.status_code == 200
+        assert loads(response.text)['result'][0]['parent'] == test_items['ids']['folder']
+        with db():
+            item = db.session.query(ItemModel).filter_by(id=test_items['ids']['file_1']).first()
+        assert item.restore_parent is None
+
+    def test_restore_items_batch_with_missing_recorded_parent_200(self, test_items):
+        item_ids = [test_items['ids']['file_1'], test_items['ids']['file_2']]
+        app.patch('/v1/items/batch/', params={'ids': item_ids, 'archived': True})
+        with db():
+            db.session.query(ItemModel).filter_by(id=item_ids[0]).update({'restore_parent': uuid.uuid4()})
+            db.session.commit()
+        response = app.patch('/v1/items/batch/', params={'ids': item_ids, 'archived': False})
+        assert response.status_code == 200
+        for item in loads(response.text)['result']:
+            assert item['parent'] == test_items['ids']['folder']
+            assert item['parent_path'] == 'user.test_folder'
+
+    def test_restore_item_to_renamed_recorded_parent_200(self, test_items):
+        params = {'id': test_items['ids']['file_1'], 'archived': True}
+        app.patch('/v1/item/', params=params)
+        app.put('/v1/item/', params={'id': test_items['ids']['folder']}, json={'name': 'test_folder_renamed'})
+        params = {'id': test_items['ids']['file_1'], 'archived': False}
+        response = app.patch('/v1/item/', params=params)
+        assert response.status_code == 200
+        item = loads(response.text)['result'][0]
+        assert item['parent'] == test_items['ids']['folder']
+        assert item['parent_path'] == 'user.test_folder_renamed'
+
+    def test_restore_folder_to_moved_recorded_parent_200(self, test_items):
+        app.patch('/v1/item/', params={'id': test_items['ids']['folder'], 'archived': True})
+        app.put('/v1/item/', params={'id': test_items['ids']['name_folder']}, json={'name': 'user_renamed'})
+        response = app.patch('/v1/item/', params={'id': test_items['ids']['folder'], 'archived': False})
+        assert response.status_code == 200
+        assert loads(response.text)['result'][0]['parent_path'] == 'user_renamed'
+        # item container codes are stored stripped, and the generated code may end with a space
+        container_code = test_items['container_code'].strip()
+        with db():
+            items = db.session.query(ItemModel).filter_by(container_code=container_code).all()
+        assert len(items) == 5
+        for item in items:
+            assert not item.archived
+            if item.type == 'file':
+                assert decode_path_from_ltree(item.parent_path) == 'user_renamed.test_folder'
+                assert item.display_path == 'user_renamed.test_folder'
+
+    def test_restore_item_without_recorded_parent_moved_destination_400(self, test_items):
+        params = {'id': test_items['ids']['file_1'], 'archived': True}
+        app.patch('/v1/item/', params=params)
+        with db():
+            db.session.query(ItemModel).filter_by(id=test_items['ids']['file_1']).update({'restore_parent': None})
+            db.session.commit()
+        app.put('/v1/item/', params={'id': test_items['ids']['folder']}, json={'name': 'test_folder_renamed'})
+        params = {'id': test_items['ids']['file_1'], 'archived': False}
+        response = app.patch('/v1/item/', params=params)
+        assert response.status_code == 400
+
+    @pytest.mark.parametrize(
+        'requests',
+        [
+            [('put', {'parent_path': 'user.new_parent'})],
+            [('put', {'name': 'test_folder_renamed'})],
+            [('patch', {'archived': True})],
+            [('patch', {'archived': True}), ('patch', {'archived': False})],
+        ],
+    )
+    def test_display_paths_follow_encoded_paths(self, test_items, requests):
+        for method, values in requests:
+            if method == 'put':
+                response = app.put('/v1/item/', json=values, params={'id': test_items['ids']['folder']})
+            else:
+                response = app.patch('/v1/item/', params={'id': test_items['ids']['folder'], **values})
+            assert response.status_code == 200
+        container_code = test_items['container_code'].strip()
+        with db():
+            items = db.session.query(ItemModel).filter_by(container_code=container_code).all()
+        assert len(items) == 5
+        for item in items:
+            assert item.display_path == (decode_path_from_ltree(item.parent_path) if item.parent_path else None)
+            assert item.display_restore_path == (
+                decode_path_from_ltree(item.restore_path) if item.restore_path else None
+            )
+
     def test_rename_item_on_conflict_200(self, test_items):
         params = {
             'id': test_items['ids']['file_1'],
@@ -357,6 +805,98 @@ class TestItems:
         regex = '_\d{10}'
         assert re.search(regex, loads(response.text)['result'][0]['name'])
 
+    def test_restore_renamed_trash_folder_with_children_200(self, test_items):
+        app.patch('/v1/item/', params={'id': test_items['ids']['folder'], 'archived': True})
+        test_items['ids']['new_folder'] = str(uuid.uuid4())
+        test_items['ids']['new_file'] = str(uuid.uuid4())
+        for id, parent, parent_path, type, name in [
+            (test_items['ids']['new_folder'], test_items['ids']['name_folder'], 'user', 'folder', 'test_folder'),
+            (test_items['ids']['new_file'], test_items['ids']['new_folder'], 'user.test_folder', 'file', 'new.txt'),
+        ]:
+            payload = {
+                'id': id,
+                'parent': parent,
+                'parent_path': parent_path,
+                'type': type,
+                'zone': 0,
+                'name': name,
+                'size': 0,
+                'owner': 'user',
+                'container_code': test_items['container_code'],
+                'container_type': 'project',
+                'location_uri': '',
+                'version': '',
+            }
+            assert app.post('/v1/item/', json=payload).status_code == 200
+        response = app.patch('/v1/item/', params={'id': test_items['ids']['new_folder'], 'archived': True})
+        assert response.status_code == 200
+        trash_name = loads(response.text)['result'][0]['name']
+        assert re.fullmatch(r'test_folder_\d{10}', trash_name)
+        response = app.patch('/v1/item/', params={'id': test_items['ids']['new_folder'], 'archived': False})
+        assert response.status_code == 200
+        restored = {item['id']: item for item in loads(response.text)['result']}
+        assert set(restored) == {test_items['ids']['new_folder'], test_items['ids']['new_file']}
+        assert not restored[test_items['ids']['new_file']]['archived']
+        assert restored[test_items['ids']['new_file']]['parent_path'] == f'user.{trash_name}'
+        response = app.get(f'/v1/item/{test_items["ids"]["file_1"]}/')
+        assert loads(response.text)['result']['archived']
+        assert loads(response.text)['result']['parent_path'] == 'test_folder'
+
+    def create_same_name_files(self, container_code: str, count: int) -> list[str]:
+        item_ids = [str(uuid.uuid4()) for _ in range(count)]
+        payload = {
+            'items': [
+                {
+                    'id': item_id,
+                    'parent': str(uuid.uuid4()),
+                    'parent_path': f'user.folder_{i}',
+                    'type': 'file',
+                    'zone': 0,
+                    'name': 'same_name.txt',
+                    'size': 100,
+                    'owner': 'user',
+                    'container_code': container_code,
+                    'container_type': 'project',
+                    'location_uri': '',
+                    'version': '',
+                }
+                for i, item_id in enumerate(item_ids)
+            ]
+        }
+        response = app.post('/v1/items/batch/', json=payload)
+        assert response.status_code == 200
+        return item_ids
+
+    def test_trash_items_batch_same_name_200(self):
+        item_ids = self.create_same_name_files('trash_items_batch_same_name_200', 3)
+        response = app.patch('/v1/items/batch/', params={'ids': item_ids, 'archived': True})
+        app.delete('/v1/items/batch/', params={'ids': item_ids})
+        assert response.status_code == 200
+        names = sorted(item['name'] for item in loads(response.text)['result'])
+        assert names[0] == 'same_name.txt'
+        assert re.fullmatch(r'same_name_\d{10}\.txt', names[1])
+        assert re.fullmatch(r'same_name_\d{10}_1\.txt', names[2])
+
+    def test_trash_items_concurrently_same_name_200(self):
+        item_ids = self.create_same_name_files('trash_items_concurrently_same_name_200', 200)
+
+        def trash_item(item_id: str) -> int:
+            asyncio.set_event_loop(asyncio.new_event_loop())
+            return app.patch('/v1/item/', params={'id': item_id, 'archived': True}).status_code
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            status_codes = list(executor.map(trash_item, item_ids))
+        response = app.get('/v1/items/batch/', params={'ids': item_ids, 'page_size': len(item_ids)})
+        app.delete('/v1/items/batch/', params={'ids': item_ids})
+        assert status_codes == [200] * len(item_ids)
+        names = [item['name'] for item in loads(response.text)['result']]
+        assert len(names) == len(set(names)) == len(item_ids)
+
+    def test_trash_items_batch_with_parent_folder_400(self, test_items):
+        params = {'ids': [test_items['ids']['folder'], test_items['ids']['file_1']], 'archived': True}
+        response = app.patch('/v1/items/batch/', params=params)
+        assert response.status_code == 400
+
     def test_delete_item_200(self, test_items):
         params = {'id': test_items['ids']['file_1']}
         response = app.delete('/v1/item/', params=params)
@@ -367,6 +907,36 @@ class TestItems:
         response = app.delete('/v1/items/batch/', params=params)
         assert response.status_code == 200
 
+    def test_delete_folder_with_children_200(self, test_items):
+        params = {'id': test_items['ids']['folder']}
+        response = app.delete('/v1/item/', params=params)
+        assert response.status_code == 200
+        for id in test_items['ids'].values():
+            if id != test_items['ids']['name_folder']:
+                assert app.get(f'/v1/item/{id}/').status_code == 404
+
+    def test_delete_items_by_id_batch_missing_id_404(self, test_items):
+        params = {'ids': [test_items['ids']['file_1'], str(uuid.uuid4())]}
+        response = app.delete('/v1/items/batch/', params=params)
+        assert response.status_code == 404
+        assert app.get(f'/v1/item/{test_items["ids"]["file_1"]}/').status_code == 200
+
+    def test_delete_folder_with_children_background_200(self, test_items):
+        params = {'id': test_items['ids']['folder'], 'background': True}
+        response = app.delete('/v1/item/', params=params)
+        assert response.status_code == 200
+        job = loads(response.text)['result']
+        assert job['total'] == 4
+        response = app.get(f'/v1/items/batch/jobs/{job["id"]}/')
+        assert response.status_code == 200
+        assert loads(response.text)['result']['status'] == 'succeeded'
+        assert loads(response.text)['result']['processed'] == 4
+        assert app.get(f'/v1/item/{test_items["ids"]["file_1"]}/').status_code == 404
+
+    def test_get_delete_job_404(self):
+        response = app.get(f'/v1/items/batch/jobs/{uuid.uuid4()}/')
+        assert response.status_code == 404
+
     def test_bequeath_to_children_200(self, test_items, test_attribute_template):
         params = {'id': test_items['ids']['folder']}
         payload = {
@@ -382,3 +952,70 @@ class TestItems:
             == payload['attributes']
         )
         assert loads(response.text)['result'][0]['extended']['extra']['system_tags'] == payload['system_tags']
+
+    def test_bequeath_to_children_bulk_200(self, test_items, test_attribute_template):
+        app.put('/v1/item/', params={'id': test_items['ids']['file_1']}, json={'tags': ['tag_a']})
+        params = {'id': test_items['ids']['folder'], 'bulk': True}
+        payload = {
+            'attribute_template_id': test_attribute_template,
+            'attributes': {'attribute_1': 'val1'},
+            'system_tags': ['copied-to-core'],
+        }
+        response = app.put('/v1/items/batch/bequeath/', params=params, json=payload)
+        assert response.status_code == 200
+        assert loads(response.text)['total'] == 3
+        assert not loads(response.text)['result']
+        extra = loads(app.get(f'/v1/item/{test_items["ids"]["file_1"]}/').text)['result']['extended']['extra']
+        assert extra == {
+            'tags': ['tag_a'],
+            'system_tags': payload['system_tags'],
+            'attributes': {test_attribute_template: payload['attributes']},
+        }
+
+    def test_bequeath_to_children_bulk_stream_200(self, test_items):
+        params = {'id': test_items['ids']['folder'], 'bulk': True, 'stream': True}
+        payload = {'system_tags': ['copied-to-core']}
+        response = app.put('/v1/items/batch/bequeath/', params=params, json=payload)
+        assert response.status_code == 200
+        assert response.headers['content-type'] == 'application/x-ndjson'
+        lines = [loads(line) for line in response.text.splitlines()]
+        assert {line['id'] for line in lines} == {
+            test_items['ids']['file_1'],
+            test_items['ids']['file_2'],
+            test_items['ids']['file_3'],
+        }
+        for line in lines:
+            assert line['item']['extended']['extra']['system_tags'] == payload['system_tags']
+
+    @pytest.mark.parametrize('bulk', [False, True])
+    def test_bequeath_to_children_merges_extra_200(self, test_items, test_attribute_template, bulk):
+        file_id = test_items['ids']['file_1']
+        other_template = str(uuid.uuid4())
+        with db():
+            db.session.execute(
+                update(ExtendedModel)
+                .where(ExtendedModel.item_id == file_id)
+                .values(extra={'system_tags': ['tag_a'], 'attributes': {other_template: {'a': 'b'}}})
+            )
+            db.session.commit()
+        params = {'id': test_items['ids']['folder'], 'bulk': bulk}
+        payload = {
+            'attribute_template_id': test_attribute_template,
+            'attributes': {'attribute_1': 'val1'},
+            'system_tags': ['copied-to-core', 'tag_a'],
+        }
+        response = app.put('/v1/items/batch/bequeath/', params=params, json=payload)
+        assert response.status_code == 200
+        extra = loads(app.get(f'/v1/item/{file_id}/').text)['result']['extended']['extra']
+        assert extra['system_tags'] == payload['system_tags']
+        assert extra['attributes'] == {other_template: {'a': 'b'}, test_attribute_template: payload['attributes']}
+
+    def test_bequeath_to_children_stream_without_bulk_400(self, test_items):
+        params = {'id': test_items['ids']['folder'], 'stream': True}
+        response = app.put('/v1/items/batch/bequeath/', params=params, json={'system_tags': ['copied-to-core']})
+        assert response.status_code == 400
+
+    def test_bequeath_to_children_bulk_file_400(self, test_items):
+        params = {'id': test_items['ids']['file_1'], 'bulk': True}
+        response = app.put('/v1/items/batch/bequeath/', params=params, json={'system_tags': ['copied-to-core']})
+        assert response.status_code == 400
@@ -0,0 +1,126 @@
+# Copyright (C) 2022 Indoc Research
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import sys
+from json import loads
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.cache import RedisCache
+from app.cache import TTLCache
+from app.main import app
+from app.routers.v1.items import cache
+
+app = TestClient(app)
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values = {}
+
+    def get(self, key: str):
+        return self.values.get(key)
+
+    def set(self, key: str, value: bytes, ex: int = None):
+        self.values[key] = value
+
+    def delete(self, *keys: str):
+        for key in keys:
+            self.values.pop(key, None)
+
+
+@pytest.fixture(params=['memory', 'redis'])
+def item_cache(request, monkeypatch):
+    if request.param == 'memory':
+        item_cache = TTLCache(maxsize=100, ttl=60)
+    else:
+        item_cache = RedisCache(FakeRedis(), ttl=60, key_prefix='test:items:')
+    monkeypatch.setattr(cache, 'item_cache', item_cache)
+    yield item_cache
+
+
+class TestItemsCache:
+    def get_file(self, test_items: dict) -> dict:
+        response = app.get(f'/v1/item/{test_items["ids"]["file_1"]}/')
+        assert response.status_code == 200
+        return loads(response.text)['result']
+
+    def test_get_item_read_through_200(self, test_items, item_cache):
+        first_result = self.get_file(test_items)
+        second_result = self.get_file(test_items)
+        assert first_result == second_result
+        response = app.get('/v1/metrics/item-cache/')
+        stats = loads(response.text)['result']
+        assert stats['enabled'] is True
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+
+    def test_get_item_cache_disabled_200(self, test_items):
+        self.get_file(test_items)
+        response = app.get('/v1/metrics/item-cache/')
+        assert loads(response.text)['result'] == {'enabled': False}
+
+    @pytest.mark.parametrize(
+        'mutation,check',
+        [
+            (
+                lambda ids: app.put('/v1/item/', json={'size': 500}, params={'id': ids['file_1']}),
+                lambda item: item['size'] == 500,
+            ),
+            (
+                lambda ids: app.put(
+                    '/v1/items/batch/', json={'items': [{'owner': 'admin'}]}, params={'ids': [ids['file_1']]}
+                ),
+                lambda item: item['owner'] == 'admin',
+            ),
+            (
+                lambda ids: app.put('/v1/item/', json={'parent_path': 'user.new_parent'}, params={'id': ids['folder']}),
+                lambda item: item['parent_path'] == 'user.new_parent.test_folder',
+            ),
+            (
+                lambda ids: app.put('/v1/item/', json={'name': 'renamed'}, params={'id': ids['folder']}),
+                lambda item: item['parent_path'] == 'user.renamed',
+            ),
+            (
+                lambda ids: app.patch('/v1/item/', params={'id': ids['folder'], 'archived': True}),
+                lambda item: item['archived'] is True,
+            ),
+            (
+                lambda ids: app.put(
+                    '/v1/items/batch/bequeath/', json={'system_tags': ['copied-to-core']}, params={'id': ids['folder']}
+                ),
+                lambda item: item['extended']['extra']['system_tags'] == ['copied-to-core'],
+            ),
+        ],
+    )
+    def test_mutations_invalidate_cached_items_200(self, test_items, item_cache, mutation, check):
+        assert not check(self.get_file(test_items))
+        response = mutation(test_items['ids'])
+        assert response.status_code == 200
+        assert check(self.get_file(test_items))
+
+    def test_delete_invalidates_cached_items_404(self, test_items, item_cache):
+        self.get_file(test_items)
+        response = app.delete('/v1/item/', params={'id': test_items['ids']['folder']})
+        assert response.status_code == 200
+        response = app.get(f'/v1/item/{test_items["ids"]["file_1"]}/')
+        assert response.status_code == 404
+
+    def test_redis_backend_without_redis_falls_back_to_memory(self, monkeypatch):
+        monkeypatch.setattr(cache.ConfigClass, 'ITEM_CACHE_ENABLED', True)
+        monkeypatch.setattr(cache.ConfigClass, 'ITEM_CACHE_BACKEND', 'redis')
+        monkeypatch.setitem(sys.modules, 'redis', None)
+        assert isinstance(cache.create_item_cache(), TTLCache)
@@ -0,0 +1,185 @@
+# Copyright (C) 2022 Indoc Research
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import uuid
+from datetime import datetime
+
+import pytest
+from fastapi_sqlalchemy import db
+from sqlalchemy import delete
+from sqlalchemy import select
+from sqlalchemy import text
+
+from app.app_utils import encode_path_for_ltree
+from app.config import ConfigClass
+from app.models.models_items import GETItemsByLocation
+from app.models.sql_extended import ExtendedModel
+from app.models.sql_items import ItemModel
+from app.models.sql_storage import StorageModel
+from app.routers.router_utils import Explain
+from app.routers.router_utils import get_keyset_filter
+from app.routers.v1.items.crud import get_items_by_location_query
+from app.routers.v1.items.utils import get_item_keyset_columns
+
+SEEDED_ITEMS = 20000
+SEEDED_CONTAINERS = 20
+
+# every 50th item is a name folder, a few are folders under it and the rest are files in user.test_folder
+SEED_ITEMS_SQL = '''
+    INSERT INTO items (
+        id, parent_path, archived, type, zone, name, size, owner, container_code, container_type,
+        created_time, last_updated_time, extra
+    )
+    SELECT
+        md5(:prefix || 'item' || n)::uuid,
+        CASE WHEN n % 50 = 0 THEN NULL WHEN n % 50 < 5 THEN CAST(:name_folder_path AS ltree)
+            ELSE CAST(:folder_path AS ltree) END,
+        n % 10 = 0,
+        CAST(CASE WHEN n % 50 = 0 THEN 'name_folder' WHEN n % 50 < 5 THEN 'folder' ELSE 'file' END AS type_enum),
+        n / :containers % 2,
+        'item_' || n,
+        100,
+        'user',
+        :prefix || n % :containers,
+        'project',
+        timestamp '2022-01-01' + n * interval '1 second',
+        timestamp '2022-01-01',
+        jsonb_build_object(
+            'tags', jsonb_build_array('tag_' || n % 1000),
+            'system_tags', '[]'::jsonb,
+            'attributes', jsonb_build_object(
+                md5('template' || n % 50), jsonb_build_object('attribute_1', 'val' || n % 10)
+            )
+        )
+    FROM generate_series(1, :count) AS n
+'''
+SEED_STORAGE_SQL = '''
+    INSERT INTO storage (id, item_id, location_uri, version)
+    SELECT md5(:prefix || 'storage' || id)::uuid, id, '', '' FROM items WHERE starts_with(container_code, :prefix)
+'''
+SEED_EXTENDED_SQL = '''
+    INSERT INTO extended (id, item_id, extra)
+    SELECT md5(:prefix || 'extended' || id)::uuid, id, extra FROM items WHERE starts_with(container_code, :prefix)
+'''
+
+
+@pytest.fixture(scope='module')
+def seeded_container_code() -> str:
+    prefix = f'index_test_{uuid.uuid4().hex[:8]}_'
+    params = {
+        'prefix': prefix,
+        'count': SEEDED_ITEMS,
+        'containers': SEEDED_CONTAINERS,
+        'name_folder_path': encode_path_for_ltree('user'),
+        'folder_path': encode_path_for_ltree('user.test_folder'),
+    }
+    with db():
+        db.session.execute(text(f'SET LOCAL search_path TO {ConfigClass.METADATA_SCHEMA}, public'))
+        for statement in (SEED_ITEMS_SQL, SEED_STORAGE_SQL, SEED_EXTENDED_SQL):
+            db.session.execute(text(statement), params)
+        for table in ('items', 'storage', 'extended'):
+            db.session.execute(text(f'ANALYZE {table}'))
+        db.session.commit()
+    yield f'{prefix}3'
+    with db():
+        seeded_filter = ItemModel.container_code.startswith(prefix, autoescape=True)
+        seeded_ids = select(ItemModel.id).where(seeded_filter)
+        for model in (StorageModel, ExtendedModel):
+            db.session.execute(
+                delete(model).where(model.item_id.in_(seeded_ids)).execution_options(synchronize_session=False)
+            )
+        db.session.execute(delete(ItemModel).where(seeded_filter).execution_options(synchronize_session=False))
+        db.session.commit()
+
+
+def get_scanned_relations(plan: dict) -> dict:
+    relations = {}
+    if 'Relation Name' in plan:
+        relations[plan['Relation Name']] = plan['Node Type']
+    for child_plan in plan.get('Plans', []):
+        relations.update(get_scanned_relations(child_plan))
+    return relations
+
+
+def get_index_conditions(plan: dict) -> dict:
+    index_conditions = {plan['Index Name']: plan.get('Index Cond', '')} if 'Index Name' in plan else {}
+    for child_plan in plan.get('Plans', []):
+        index_conditions.update(get_index_conditions(child_plan))
+    return index_conditions
+
+
+def get_index_names(plan: dict) -> set:
+    index_names = {plan['Index Name']} if 'Index Name' in plan else set()
+    for child_plan in plan.get('Plans', []):
+        index_names |= get_index_names(child_plan)
+    return index_names
+
+
+class TestItemsIndexes:
+    def explain_items_by_location(self, extra_filter: dict = None, keyset_values: list = None, **params) -> dict:
+        params = GETItemsByLocation(**params)
+        keyset_columns = get_item_keyset_columns(params.sorting, params.order)
+        with db():
+            item_query = get_items_by_location_query(params, keyset_columns, extra_filter)
+            if keyset_values:
+                item_query = item_query.filter(get_keyset_filter(keyset_columns, keyset_values))
+            # paginate reads one row past the page to tell whether there are more
+            item_query = item_query.limit(params.page_size + 1)
+            plan = db.session.execute(Explain(item_query.statement)).scalar()
+        return plan[0]['Plan']
+
+    @pytest.mark.parametrize(
+        'params',
+        [
+            {'parent_path': 'user.test_folder', 'zone': 0, 'recursive': False},
+            {'parent_path': 'user', 'zone': 0, 'recursive': True},
+            {'parent_path': 'user', 'recursive': True, 'archived': True},
+            {'recursive': False},
+            {'recursive': True, 'sorting': 'name', 'order': 'desc'},
+        ],
+    )
+    def test_get_items_by_location_uses_index_scans(self, seeded_container_code, params):
+        plan = self.explain_items_by_location(container_code=seeded_container_code, **params)
+        relations = get_scanned_relations(plan)
+        assert set(relations) == {'items', 'storage', 'extended'}
+        for relation, node_type in relations.items():
+            assert node_type != 'Seq Scan', f'{relation} is read with a sequential scan'
+
+    @pytest.mark.parametrize(
+        'extra_filter', [{'tags': ['tag_a']}, {'attributes': {str(uuid.uuid4()): {'attribute_1': 'val1'}}}]
+    )
+    def test_get_items_by_location_extra_filter_uses_gin_index(self, seeded_container_code, extra_filter):
+        plan = self.explain_items_by_location(extra_filter, container_code=seeded_container_code, recursive=True)
+        assert 'extended_extra_gin' in get_index_names(plan)
+
+    def test_get_items_by_location_inline_reads_only_scan_items(self, seeded_container_code, monkeypatch):
+        monkeypatch.setattr(ConfigClass, 'ITEM_INLINE_READS', True)
+        plan = self.explain_items_by_location({'tags': ['tag_a']}, container_code=seeded_container_code, recursive=True)
+        assert set(get_scanned_relations(plan)) == {'items'}
+
+    @pytest.mark.parametrize(
+        'order,index_name,index_condition',
+        [('asc', 'items_listing', 'ROW(type, created_time, id) >'), ('desc', 'items_listing_desc', 'type >=')],
+    )
+    def test_get_items_by_location_cursor_seeks_listing_index(
+        self, seeded_container_code, order, index_name, index_condition
+    ):
+        keyset_values = ['file', datetime(2022, 1, 1, 3), uuid.uuid4()]
+        plan = self.explain_items_by_location(
+            keyset_values=keyset_values, container_code=seeded_container_code, recursive=True, order=order
+        )
+        index_conditions = get_index_conditions(plan)
+        assert index_name in index_conditions
+        assert index_condition in index_conditions[index_name]
@@ -0,0 +1,33 @@
+# Copyright (C) 2022 Indoc Research
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from fastapi.testclient import TestClient
+
+from app.config import ConfigClass
+from app.main import app
+
+app = TestClient(app)
+
+
+class TestMetrics:
+    def test_get_pool_metrics_200(self, test_items):
+        app.get(f'/v1/item/{test_items["ids"]["file_1"]}/')
+        response = app.get('/v1/metrics/pool/')
+        res = response.json()['result']
+        assert response.status_code == 200
+        assert res['pool_size'] == ConfigClass.OPSDB_POOL_SIZE
+        assert res['checkouts'] >= 1
+        assert res['timeouts'] == 0
+        assert sum(res['wait_buckets_ms'].values()) == res['checkouts']
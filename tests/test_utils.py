@@ -14,12 +14,20 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import random
+from json import loads
 
 from fastapi.testclient import TestClient
+from sqlalchemy_utils import Ltree
 
 from app.app_utils import decode_path_from_ltree
+from app.app_utils import decode_paths_from_ltree
 from app.app_utils import encode_path_for_ltree
+from app.app_utils import encode_paths_for_ltree
+from app.cache import TTLCache
 from app.main import app
+from app.models.base_models import APIResponse
+from app.models.base_models import EAPIResponseCode
+from app.routers.v1.attribute_templates.utils import AttributeTemplateValidator
 
 
 class TestUtils:
@@ -48,3 +56,61 @@ class TestUtils:
             encoded = encode_path_for_ltree(path)
             decoded = decode_path_from_ltree(encoded)
             assert decoded == path
+
+    def test_02_encode_decode_paths_batch(self):
+        random_paths = [self.generate_random_path() for _ in range(100)]
+        encoded = encode_paths_for_ltree(random_paths)
+        assert encoded == [encode_path_for_ltree(path) for path in random_paths]
+        decoded = decode_paths_from_ltree([Ltree(encode_path_for_ltree('user.folder')), None, *encoded])
+        assert decoded == ['user.folder', None, *random_paths]
+
+    def test_03_encode_decode_unicode_path(self):
+        path = 'user.données.数据.f'
+        encoded = encode_path_for_ltree(path)
+        assert '=' not in encoded
+        assert decode_path_from_ltree(Ltree(encoded)) == path
+        assert decode_path_from_ltree(encoded) == path
+
+    def test_04_fast_json_response_matches_json_response(self):
+        api_response = APIResponse()
+        api_response.result = [
+            {'id': 'id_1', 'parent_path': 'user.données', 'size': None, 'extended': {'extra': {'tags': ['a']}}},
+            {'id': 'id_2', 'parent_path': None, 'size': 10, 'extended': {'extra': {'attributes': {}}}},
+        ]
+        api_response.total = None
+        api_response.next_cursor = 'cursor'
+        api_response.set_code(EAPIResponseCode.not_found)
+        fast_response = api_response.json_response(fast=True)
+        response = api_response.json_response()
+        assert fast_response.status_code == response.status_code == 404
+        assert loads(fast_response.body) == loads(response.body)
+
+    def test_05_ttl_cache_evicts_least_recently_used_and_expired(self):
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        assert cache.get('a') == 1
+        cache.set('c', 3)
+        assert cache.get('b') is None
+        assert cache.get('a') == 1
+        assert cache.get('c') == 3
+        cache.pop('a')
+        assert cache.get('a') is None
+        expired_cache = TTLCache(maxsize=2, ttl=0)
+        expired_cache.set('a', 1)
+        assert expired_cache.get('a') is None
+        assert len(expired_cache) == 0
+
+    def test_06_attribute_template_validator(self):
+        validator = AttributeTemplateValidator(
+            [
+                {'name': 'choice', 'optional': False, 'type': 'multiple_choice', 'options': ['val1', 'val2']},
+                {'name': 'text', 'optional': False, 'type': 'text', 'options': None},
+                {'name': 'extra', 'optional': True, 'type': 'text', 'options': []},
+            ]
+        )
+        assert validator.validate({'choice': 'val1', 'text': 'anything'})
+        assert validator.validate({'choice': 'val2', 'text': '', 'extra': 'value'})
+        assert not validator.validate({'choice': 'val3', 'text': 'anything'})
+        assert not validator.validate({'text': 'anything'})
+        assert not validator.validate({'choice': 'val1', 'text': '', 'extra': '', 'unknown': ''})